@@ -75,6 +75,8 @@ mkdir -p "$INSTALL_DIR"
 # Create all directories
 mkdir -p "$INSTALL_DIR"/{research,management,shared,system,logs,inbox,queues,db}
 mkdir -p "$INSTALL_DIR"/research/{data,scripts,outputs}
+mkdir -p "$INSTALL_DIR"/research/outputs/.cache
+mkdir -p "$INSTALL_DIR"/db/archive
 mkdir -p "$INSTALL_DIR"/management/{config,escalations}
 mkdir -p "$INSTALL_DIR"/shared/{reports,templates}
 mkdir -p "$INSTALL_DIR"/system/{bin,heartbeat,alerts}
@@ -87,10 +89,15 @@ echo "  Created directory structure"
 echo ""
 echo "Step 3: Setting permissions..."
 
-# Set ownership and permissions for research directory (researcher only)
-chown -R researcher:researcher "$INSTALL_DIR"/research
-chmod 700 "$INSTALL_DIR"/research
-chmod 700 "$INSTALL_DIR"/research/{data,scripts,outputs}
+# Set ownership and permissions for research directory (researcher, plus the
+# task processor running as institute-system: it loads handlers from scripts/,
+# reads inputs from data/ and writes outputs/ and the result cache; setgid
+# keeps new files and directories in the institute-system group)
+chown -R researcher:institute-system "$INSTALL_DIR"/research
+chmod 750 "$INSTALL_DIR"/research
+chmod -R g+rX,o-rwx "$INSTALL_DIR"/research/{data,scripts}
+chmod 2750 "$INSTALL_DIR"/research/{data,scripts}
+chmod 2770 "$INSTALL_DIR"/research/outputs "$INSTALL_DIR"/research/outputs/.cache
 
 # Set ownership and permissions for management directory (director only)
 chown -R director:director "$INSTALL_DIR"/management
@@ -118,12 +125,15 @@ chown -R director:director "$INSTALL_DIR"/inbox/director
 chmod 700 "$INSTALL_DIR"/inbox/director
 
 # Set ownership and permissions for queues
-chown -R institute-system:institute-system "$INSTALL_DIR"/queues
-chmod -R 755 "$INSTALL_DIR"/queues
+# (group-writable: the CLI roles create, move and remove queue files too;
+# setgid keeps the shard directories created later in the group)
+chown -R institute-system:institute-shared "$INSTALL_DIR"/queues
+find "$INSTALL_DIR"/queues -type d -exec chmod 2775 {} +
 
 # Set ownership and permissions for db
+# (group-writable: WAL mode creates -wal/-shm files next to each database)
 chown -R institute-system:institute-shared "$INSTALL_DIR"/db
-chmod 755 "$INSTALL_DIR"/db
+chmod 2775 "$INSTALL_DIR"/db "$INSTALL_DIR"/db/archive
 
 echo "  Set directory permissions"
 
@@ -203,15 +213,17 @@ echo "Step 8: Enabling and starting services..."
 # Enable and start services
 systemctl enable institute-watchdog.service
 systemctl enable institute-escalation.service
-systemctl enable institute-task-processor.timer
+systemctl enable institute-task-processor-daemon.service
 systemctl enable institute-daily-report.timer
 systemctl enable institute-weekly-report.timer
+systemctl enable institute-task-archive.timer
 
 systemctl start institute-watchdog.service
 systemctl start institute-escalation.service
-systemctl start institute-task-processor.timer
+systemctl start institute-task-processor-daemon.service
 systemctl start institute-daily-report.timer
 systemctl start institute-weekly-report.timer
+systemctl start institute-task-archive.timer
 
 echo "  Services enabled and started"
 
@@ -234,10 +246,10 @@ else
     echo "    ✗ Escalation service not running"
 fi
 
-if systemctl is-active --quiet institute-task-processor.timer; then
-    echo "    ✓ Task processor timer active"
+if systemctl is-active --quiet institute-task-processor-daemon.service; then
+    echo "    ✓ Task processor daemon running"
 else
-    echo "    ✗ Task processor timer not active"
+    echo "    ✗ Task processor daemon not running"
 fi
 
 echo ""
@@ -253,9 +265,10 @@ echo ""
 echo "Services running:"
 echo "  - institute-watchdog.service"
 echo "  - institute-escalation.service"
-echo "  - institute-task-processor.timer"
+echo "  - institute-task-processor-daemon.service"
 echo "  - institute-daily-report.timer"
 echo "  - institute-weekly-report.timer"
+echo "  - institute-task-archive.timer"
 echo ""
 echo "CLI available at: /usr/local/bin/institute"
 echo ""
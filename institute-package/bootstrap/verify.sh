@@ -55,6 +55,26 @@ for dir in research management shared system logs inbox queues db; do
     fi
 done
 
+# The task processor (institute-system) reads handlers and inputs and writes outputs
+if sudo -u institute-system test -r "$INSTALL_DIR/research/scripts" -a -x "$INSTALL_DIR/research/scripts" \
+        -a -r "$INSTALL_DIR/research/data" -a -x "$INSTALL_DIR/research/data" \
+        -a -w "$INSTALL_DIR/research/outputs" -a -w "$INSTALL_DIR/research/outputs/.cache"; then
+    pass "Task processor can use research/scripts, data and outputs"
+else
+    fail "Task processor cannot use research/scripts, data and outputs"
+fi
+
+# Every role moves queue files (task create, queue migrate, archive tasks)
+for user in institute-system researcher director; do
+    if sudo -u "$user" test -w "$INSTALL_DIR/queues/research/pending" \
+            -a -w "$INSTALL_DIR/queues/research/completed" -a -w "$INSTALL_DIR/queues/research/failed" \
+            -a -g "$INSTALL_DIR/queues/research/pending"; then
+        pass "User '$user' can move queue files"
+    else
+        fail "User '$user' cannot move queue files"
+    fi
+done
+
 echo ""
 
 # Test 3: Check databases
@@ -93,10 +113,10 @@ else
     fail "Escalation service not running"
 fi
 
-if systemctl is-active --quiet institute-task-processor.timer; then
-    pass "Task processor timer active"
+if systemctl is-active --quiet institute-task-processor-daemon.service; then
+    pass "Task processor daemon running"
 else
-    fail "Task processor timer not active"
+    fail "Task processor daemon not running"
 fi
 
 echo ""
@@ -195,6 +215,12 @@ for db in system.db research.db management.db shared.db audit.db; do
     else
         fail "Database integrity failed: $db"
     fi
+    JOURNAL_MODE=$(sudo -u institute-system sqlite3 "$INSTALL_DIR/db/$db" "PRAGMA journal_mode" 2>/dev/null || echo "error")
+    if [[ "$JOURNAL_MODE" == "wal" ]]; then
+        pass "Journal mode WAL: $db"
+    else
+        fail "Journal mode is '$JOURNAL_MODE', expected wal: $db"
+    fi
 done
 
 echo ""
@@ -0,0 +1,55 @@
+-- Archive database schema (db/archive/research-YYYY-MM.db)
+-- Completed and failed tasks moved out of research.db, with the rows and
+-- queue files that belong to them. IDs are those the tasks had in research.db.
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    completed_at TEXT,
+    error_message TEXT,
+    claimed_by TEXT,
+    lease_expires_at TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    type TEXT NOT NULL DEFAULT 'noop',
+    params TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 1,
+    next_attempt_at TEXT,
+    waiting_on INTEGER NOT NULL DEFAULT 0,
+    cacheable INTEGER NOT NULL DEFAULT 0,
+    cache_hit INTEGER NOT NULL DEFAULT 0,
+    submitted_by TEXT,
+    archived_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    task_id INTEGER NOT NULL,
+    depends_on INTEGER NOT NULL,
+    PRIMARY KEY (task_id, depends_on)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS dead_letter (
+    task_id INTEGER PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    error_message TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+-- Contents of the task's JSON file from the queue directories, if it had one
+CREATE TABLE IF NOT EXISTS queue_files (
+    task_id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_findings_task ON findings(task_id);
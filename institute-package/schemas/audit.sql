@@ -6,7 +6,18 @@ CREATE TABLE IF NOT EXISTS log (
     action TEXT NOT NULL,
     target TEXT,
     details TEXT,
-    checksum TEXT NOT NULL
+    checksum TEXT NOT NULL,
+    prev_checksum TEXT
+);
+
+-- Last audit entry confirmed by verify_integrity (single row); scrub_id is
+-- the last entry behind it that incremental verification re-checked
+CREATE TABLE IF NOT EXISTS verification_checkpoint (
+    id INTEGER PRIMARY KEY CHECK(id = 1),
+    last_id INTEGER NOT NULL,
+    chain_head TEXT NOT NULL,
+    scrub_id INTEGER NOT NULL DEFAULT 0,
+    verified_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
 CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON log(timestamp DESC);
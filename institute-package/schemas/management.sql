@@ -28,7 +28,63 @@ INSERT OR IGNORE INTO config (key, value) VALUES
     ('disk_warning_threshold', '80'),
     ('disk_critical_threshold', '90'),
     ('heartbeat_stale_minutes', '30'),
-    ('auto_lockdown_enabled', 'true');
+    ('auto_lockdown_enabled', 'true'),
+    ('queue_file_mirror', 'false'),
+    ('max_workers', '1'),
+    ('task_pool_mode', 'process'),
+    ('task_lease_seconds', '900'),
+    ('task_aging_minutes', '60'),
+    ('task_aging_max_boost', '5'),
+    ('task_isolation', 'none'),
+    ('task_timeout_seconds', '3600'),
+    ('task_memory_limit_mb', '0'),
+    ('task_cpu_limit_seconds', '0'),
+    ('task_max_attempts', '3'),
+    ('task_retry_base_seconds', '60'),
+    ('task_retry_max_seconds', '3600'),
+    ('result_cache_max_mb', '1024'),
+    ('task_max_pending', '1000000'),
+    ('task_max_pending_per_user', '100000'),
+    ('task_submit_rate', '0'),
+    ('task_submit_burst', '1000');
 
 CREATE INDEX IF NOT EXISTS idx_escalations_state ON escalations(state);
 CREATE INDEX IF NOT EXISTS idx_escalations_created ON escalations(created_at DESC);
+
+-- Number of escalations in each state and level, kept current by the
+-- triggers below so status checks never need a scan of escalations
+CREATE TABLE IF NOT EXISTS escalation_counters (
+    state TEXT NOT NULL,
+    level TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (state, level)
+) WITHOUT ROWID;
+
+-- Seed from existing escalations once, in the same transaction that adds the triggers
+BEGIN IMMEDIATE;
+
+INSERT INTO escalation_counters (state, level, count)
+SELECT state, level, COUNT(*) FROM escalations
+WHERE NOT EXISTS (SELECT 1 FROM escalation_counters)
+GROUP BY state, level;
+
+CREATE TRIGGER IF NOT EXISTS trg_escalations_count_insert AFTER INSERT ON escalations
+BEGIN
+    INSERT INTO escalation_counters (state, level, count) VALUES (NEW.state, NEW.level, 1)
+    ON CONFLICT (state, level) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_escalations_count_update AFTER UPDATE OF state, level ON escalations
+WHEN NEW.state != OLD.state OR NEW.level != OLD.level
+BEGIN
+    UPDATE escalation_counters SET count = count - 1 WHERE state = OLD.state AND level = OLD.level;
+    INSERT INTO escalation_counters (state, level, count) VALUES (NEW.state, NEW.level, 1)
+    ON CONFLICT (state, level) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_escalations_count_delete AFTER DELETE ON escalations
+BEGIN
+    UPDATE escalation_counters SET count = count - 1 WHERE state = OLD.state AND level = OLD.level;
+END;
+
+COMMIT;
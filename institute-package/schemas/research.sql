@@ -7,9 +7,66 @@ CREATE TABLE IF NOT EXISTS tasks (
     created_at TEXT NOT NULL DEFAULT (datetime('now')),
     updated_at TEXT NOT NULL DEFAULT (datetime('now')),
     completed_at TEXT,
-    error_message TEXT
+    error_message TEXT,
+    claimed_by TEXT,
+    lease_expires_at TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    type TEXT NOT NULL DEFAULT 'noop',
+    params TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 1,
+    next_attempt_at TEXT,
+    waiting_on INTEGER NOT NULL DEFAULT 0,
+    cacheable INTEGER NOT NULL DEFAULT 0,
+    cache_hit INTEGER NOT NULL DEFAULT 0,
+    submitted_by TEXT
 );
 
+-- Edges of the task DAG: task_id runs after depends_on completes
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    task_id INTEGER NOT NULL,
+    depends_on INTEGER NOT NULL,
+    PRIMARY KEY (task_id, depends_on),
+    FOREIGN KEY (task_id) REFERENCES tasks(id),
+    FOREIGN KEY (depends_on) REFERENCES tasks(id)
+) WITHOUT ROWID;
+
+-- Tasks that failed on their last allowed attempt (status stays 'failed')
+CREATE TABLE IF NOT EXISTS dead_letter (
+    task_id INTEGER PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    error_message TEXT,
+    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+    FOREIGN KEY (task_id) REFERENCES tasks(id)
+);
+
+-- Outputs of cacheable tasks, stored in research/outputs/.cache/<key>/
+CREATE TABLE IF NOT EXISTS result_cache (
+    key TEXT PRIMARY KEY,
+    task_id INTEGER,
+    task_type TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    last_used_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- ID range of the tasks moved to each db/archive/research-YYYY-MM.db
+CREATE TABLE IF NOT EXISTS archive_index (
+    month TEXT PRIMARY KEY,
+    min_id INTEGER NOT NULL,
+    max_id INTEGER NOT NULL,
+    task_count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- SHA-256 of research/data files, valid while size and mtime are unchanged
+CREATE TABLE IF NOT EXISTS input_digests (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+) WITHOUT ROWID;
+
 CREATE TABLE IF NOT EXISTS hypotheses (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     title TEXT NOT NULL,
@@ -26,6 +83,90 @@ CREATE TABLE IF NOT EXISTS findings (
     FOREIGN KEY (task_id) REFERENCES tasks(id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
-CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at DESC);
+-- Replaced by the waiting_on-aware and listing indexes below
+DROP INDEX IF EXISTS idx_tasks_status;
+DROP INDEX IF EXISTS idx_tasks_priority;
+DROP INDEX IF EXISTS idx_tasks_created;
+
+-- (status, waiting_on, rowid): status filters and oldest ready task
+CREATE INDEX IF NOT EXISTS idx_tasks_state ON tasks(status, waiting_on);
+-- Keyset pages of task listings, newest first, with and without a status
+CREATE INDEX IF NOT EXISTS idx_tasks_listing ON tasks(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_listing ON tasks(status, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_findings_task ON findings(task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_schedule ON tasks(status, waiting_on, priority DESC, id);
+CREATE INDEX IF NOT EXISTS idx_task_dependencies_parent ON task_dependencies(depends_on);
+CREATE INDEX IF NOT EXISTS idx_result_cache_lru ON result_cache(last_used_at);
+-- Only failed tasks waiting for a retry have next_attempt_at set
+CREATE INDEX IF NOT EXISTS idx_tasks_retry ON tasks(next_attempt_at) WHERE next_attempt_at IS NOT NULL;
+
+-- Number of tasks in each status, kept current by the triggers below so
+-- queue depths never need a scan of tasks
+CREATE TABLE IF NOT EXISTS task_counters (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- Seed from existing tasks once, in the same transaction that adds the triggers
+BEGIN IMMEDIATE;
+
+INSERT INTO task_counters (status, count)
+SELECT status, COUNT(*) FROM tasks
+WHERE NOT EXISTS (SELECT 1 FROM task_counters)
+GROUP BY status;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_count_insert AFTER INSERT ON tasks
+BEGIN
+    INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+    ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_count_update AFTER UPDATE OF status ON tasks
+WHEN NEW.status != OLD.status
+BEGIN
+    UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+    INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+    ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_count_delete AFTER DELETE ON tasks
+BEGIN
+    UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+END;
+
+COMMIT;
+
+-- Pending tasks per submitter, for the admission limits checked on create
+CREATE TABLE IF NOT EXISTS user_task_counters (
+    submitted_by TEXT PRIMARY KEY,
+    pending INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_user_pending_insert AFTER INSERT ON tasks
+WHEN NEW.status = 'pending' AND NEW.submitted_by IS NOT NULL
+BEGIN
+    INSERT INTO user_task_counters (submitted_by, pending) VALUES (NEW.submitted_by, 1)
+    ON CONFLICT (submitted_by) DO UPDATE SET pending = pending + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_user_pending_update AFTER UPDATE OF status ON tasks
+WHEN (NEW.status = 'pending') != (OLD.status = 'pending') AND NEW.submitted_by IS NOT NULL
+BEGIN
+    INSERT INTO user_task_counters (submitted_by, pending)
+    VALUES (NEW.submitted_by, CASE WHEN NEW.status = 'pending' THEN 1 ELSE -1 END)
+    ON CONFLICT (submitted_by) DO UPDATE SET pending = pending + excluded.pending;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_user_pending_delete AFTER DELETE ON tasks
+WHEN OLD.status = 'pending' AND OLD.submitted_by IS NOT NULL
+BEGIN
+    UPDATE user_task_counters SET pending = pending - 1 WHERE submitted_by = OLD.submitted_by;
+END;
+
+-- Submission token bucket per submitter (task_submit_rate/task_submit_burst)
+CREATE TABLE IF NOT EXISTS submission_buckets (
+    submitted_by TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
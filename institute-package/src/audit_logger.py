@@ -1,7 +1,12 @@
 """Audit logging for the Institute system."""
+import atexit
 import sqlite3
+import sys
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
 try:
     from .config import Config
@@ -11,20 +16,194 @@ except ImportError:
     from utils import compute_checksum
 
 
+# prev_checksum of the first chained entry in an empty log
+GENESIS_CHECKSUM = '0' * 64
+
+
+# Group-commit loggers whose buffers are written out at process exit. Held
+# weakly so a logger (and its buffer) is not kept alive for the whole
+# process; one with entries buffered is referenced by its flush timer.
+_group_commit_loggers = weakref.WeakSet()
+
+
+def _flush_group_commit_loggers():
+    """Write out the buffers of all live group-commit loggers (atexit hook)."""
+    for logger in list(_group_commit_loggers):
+        try:
+            logger.flush()
+        except Exception as e:
+            print(f"Error writing buffered audit entries: {e}", file=sys.stderr)
+
+
+atexit.register(_flush_group_commit_loggers)
+
+
+def entry_checksum(prev_checksum: Optional[str], timestamp: str, role: str, action: str,
+                   target: Optional[str], details: Optional[str]) -> str:
+    """Compute the checksum of an audit entry.
+
+    Chained entries hash the previous entry's checksum together with their
+    own fields. Entries written before chaining (prev_checksum NULL) hash
+    their fields only.
+
+    Args:
+        prev_checksum: Checksum of the preceding entry, or None for legacy entries
+        timestamp: Entry timestamp
+        role: Entry role
+        action: Entry action
+        target: Entry target
+        details: Entry details
+
+    Returns:
+        Hex digest of SHA256 hash
+    """
+    checksum_data = f"{timestamp}|{role}|{action}|{target or ''}|{details or ''}"
+    if prev_checksum is not None:
+        checksum_data = f"{prev_checksum}|{checksum_data}"
+    return compute_checksum(checksum_data)
+
+
+def verify_chain(rows: Iterable[tuple], prev_checksum: Optional[str],
+                 chained: bool) -> Tuple[Optional[int], Optional[int], Optional[str], bool]:
+    """Verify a run of audit rows in id order.
+
+    Args:
+        rows: Iterable of (id, timestamp, role, action, target, details,
+            checksum, prev_checksum) tuples
+        prev_checksum: Checksum of the row preceding the run (None if none)
+        chained: Whether the row preceding the run is a chained entry
+
+    Returns:
+        Tuple of (first_invalid_id, last_id, last_checksum, chained);
+        first_invalid_id is None if every row is valid
+    """
+    last_id = None
+    for row in rows:
+        entry_id, timestamp, role, action, target, details, checksum, stored_prev = row
+
+        if stored_prev is None:
+            # Legacy entries may not appear once the chain has started
+            if chained:
+                return entry_id, last_id, prev_checksum, chained
+        else:
+            expected_prev = prev_checksum if prev_checksum is not None else GENESIS_CHECKSUM
+            if stored_prev != expected_prev:
+                return entry_id, last_id, prev_checksum, chained
+            chained = True
+
+        if entry_checksum(stored_prev, timestamp, role, action, target, details) != checksum:
+            return entry_id, last_id, prev_checksum, chained
+
+        last_id = entry_id
+        prev_checksum = checksum
+
+    return None, last_id, prev_checksum, chained
+
+
+def id_ranges(min_id: int, max_id: int, range_count: int) -> list:
+    """Split an id span into contiguous ranges for parallel verification.
+
+    Args:
+        min_id: First id of the span
+        max_id: Last id of the span
+        range_count: Maximum number of ranges
+
+    Returns:
+        List of (start_id, end_id) tuples, inclusive and in id order
+    """
+    span = (max_id - min_id + range_count) // range_count
+    return [(start, min(start + span - 1, max_id)) for start in range(min_id, max_id + 1, span)]
+
+
+def _verify_range(db_path: str, start_id: int, end_id: int) -> Optional[int]:
+    """Verify audit entries with ids in [start_id, end_id] (process pool worker).
+
+    Opens its own read-only connection and streams rows from the cursor.
+
+    Args:
+        db_path: Path to audit.db
+        start_id: First id of the range
+        end_id: Last id of the range
+
+    Returns:
+        First invalid id in the range, or None if all entries are valid
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        row = conn.execute(
+            "SELECT checksum, prev_checksum FROM log WHERE id < ? ORDER BY id DESC LIMIT 1",
+            (start_id,)
+        ).fetchone()
+        prev_checksum, chained = (row[0], row[1] is not None) if row else (None, False)
+
+        cursor = conn.execute(
+            """SELECT id, timestamp, role, action, target, details, checksum, prev_checksum
+               FROM log WHERE id BETWEEN ? AND ? ORDER BY id""",
+            (start_id, end_id)
+        )
+        invalid_id, _, _, _ = verify_chain(cursor, prev_checksum, chained)
+        return invalid_id
+    finally:
+        conn.close()
+
+
 class AuditLogger:
-    """Handles append-only audit logging."""
+    """Handles append-only, hash-chained audit logging.
+
+    Each entry's checksum covers the previous entry's checksum, so altering
+    any entry invalidates every entry after it. verify_integrity() records a
+    checkpoint (last verified id and chain head) and later calls walk the
+    entries appended since then plus the next SCRUB_BATCH entries behind the
+    checkpoint, so repeated calls keep re-reading the whole history.
+    """
+
+    # Actions that are always written synchronously, even in group-commit mode
+    CRITICAL_ACTIONS = {
+        'lockdown_triggered',
+        'lockdown_access_denied',
+        'role_violation',
+        'recovery_initiated',
+        'recovery_completed',
+    }
+
+    # Below this many entries a process pool costs more than it saves
+    PARALLEL_MIN_ENTRIES = 100000
 
-    def __init__(self, config: Config):
+    # Id ranges handed out per worker in parallel verification
+    RANGES_PER_WORKER = 4
+
+    # Entries behind the checkpoint re-verified per incremental verification
+    SCRUB_BATCH = 10000
+
+    def __init__(self, config: Config, group_commit: bool = False,
+                 flush_size: int = 100, flush_interval: float = 1.0):
         """Initialize audit logger.
 
         Args:
             config: System configuration
+            group_commit: Buffer entries and write them in batched transactions
+            flush_size: Buffered entries that trigger a flush (group-commit mode)
+            flush_interval: Max seconds an entry stays buffered (group-commit mode)
         """
         self.config = config
+        self.group_commit = group_commit
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._buffer = []
+        self._buffer_lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+
+        if group_commit:
+            _group_commit_loggers.add(self)
 
     def log(self, role: str, action: str, target: Optional[str] = None, details: Optional[str] = None):
         """Write an audit log entry.
 
+        In group-commit mode the entry is buffered and written with others in
+        one transaction once flush_size entries or flush_interval seconds have
+        accumulated. Entries in CRITICAL_ACTIONS flush the buffer immediately.
+
         Args:
             role: Role performing the action (researcher, director, system)
             action: Action being performed
@@ -32,20 +211,76 @@ class AuditLogger:
             details: Additional details (optional)
         """
         timestamp = datetime.now().isoformat()
+        entry = (timestamp, role, action, target, details)
 
-        # Compute checksum of entry
-        checksum_data = f"{timestamp}|{role}|{action}|{target or ''}|{details or ''}"
-        checksum = compute_checksum(checksum_data)
+        if not self.group_commit:
+            self._write_entries([entry])
+            return
 
-        # Write to audit log
-        conn = sqlite3.connect(str(self.config.audit_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO log (timestamp, role, action, target, details, checksum) VALUES (?, ?, ?, ?, ?, ?)",
-            (timestamp, role, action, target, details, checksum)
-        )
-        conn.commit()
-        conn.close()
+        with self._buffer_lock:
+            self._buffer.append(entry)
+            if action in self.CRITICAL_ACTIONS or len(self._buffer) >= self.flush_size:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Write all buffered entries in a single transaction.
+
+        On failure the entries are kept in the buffer and the error is raised.
+        """
+        with self._buffer_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            if not self._buffer:
+                return
+
+            entries = self._buffer
+            self._buffer = []
+            try:
+                self._write_entries(entries)
+            except Exception:
+                self._buffer = entries + self._buffer
+                raise
+
+    def _flush_from_timer(self):
+        """Flush triggered by the flush_interval timer."""
+        try:
+            self.flush()
+        except Exception:
+            # Entries stay buffered; the next log() or flush() retries them
+            pass
+
+    def _write_entries(self, entries: list):
+        """Append audit entries to the chain in one transaction.
+
+        The write lock is taken before reading the chain head so concurrent
+        writers cannot fork the chain.
+
+        Args:
+            entries: List of (timestamp, role, action, target, details)
+        """
+        with self.config.transaction(self.config.audit_db, immediate=True) as conn:
+            row = conn.execute("SELECT checksum FROM log ORDER BY id DESC LIMIT 1").fetchone()
+            prev_checksum = row[0] if row else GENESIS_CHECKSUM
+
+            chained_entries = []
+            for timestamp, role, action, target, details in entries:
+                checksum = entry_checksum(prev_checksum, timestamp, role, action, target, details)
+                chained_entries.append(
+                    (timestamp, role, action, target, details, checksum, prev_checksum)
+                )
+                prev_checksum = checksum
+
+            conn.executemany(
+                """INSERT INTO log (timestamp, role, action, target, details, checksum, prev_checksum)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                chained_entries
+            )
 
     def get_recent_logs(self, limit: int = 50) -> list:
         """Get recent audit log entries.
@@ -56,34 +291,160 @@ class AuditLogger:
         Returns:
             List of audit log entries as tuples
         """
-        conn = sqlite3.connect(str(self.config.audit_db))
-        cursor = conn.cursor()
-        cursor.execute(
+        self.flush()
+        conn = self.config.connection(self.config.audit_db)
+        return conn.execute(
             "SELECT timestamp, role, action, target, details FROM log ORDER BY id DESC LIMIT ?",
             (limit,)
-        )
-        rows = cursor.fetchall()
-        conn.close()
-        return rows
+        ).fetchall()
+
+    def verify_integrity(self, full: bool = False, workers: int = 1) -> bool:
+        """Verify integrity of the audit log.
 
-    def verify_integrity(self) -> bool:
-        """Verify integrity of all audit log entries.
+        Incremental verification recomputes the checksum of the checkpointed
+        entry, walks the entries appended after it, and re-verifies the next
+        SCRUB_BATCH entries behind it, resuming where the previous call
+        stopped and wrapping around at the checkpoint. Rewriting an older
+        entry without breaking the chain means recomputing every later
+        checksum, which moves the checkpointed head; editing one in place is
+        found once the scrub reaches it. Full verification walks the whole
+        log.
+
+        Args:
+            full: Ignore the checkpoint and verify every entry
+            workers: Processes to use for full verification (see find_first_invalid)
 
         Returns:
-            True if all checksums are valid
+            True if all checked entries are valid
         """
-        conn = sqlite3.connect(str(self.config.audit_db))
-        cursor = conn.cursor()
-        cursor.execute("SELECT timestamp, role, action, target, details, checksum FROM log")
+        if full:
+            return self.find_first_invalid(workers) is None
+
+        self.flush()
+        conn = self.config.connection(self.config.audit_db)
 
-        for row in cursor.fetchall():
-            timestamp, role, action, target, details, stored_checksum = row
-            checksum_data = f"{timestamp}|{role}|{action}|{target or ''}|{details or ''}"
-            computed_checksum = compute_checksum(checksum_data)
+        start_id, prev_checksum, chained = 0, None, False
+        scrub_id = None
+        checkpoint = conn.execute(
+            "SELECT last_id, chain_head, scrub_id FROM verification_checkpoint WHERE id = 1"
+        ).fetchone()
 
-            if computed_checksum != stored_checksum:
-                conn.close()
+        if checkpoint:
+            start_id, chain_head, scrub_id = checkpoint
+            row = conn.execute(
+                """SELECT timestamp, role, action, target, details, checksum, prev_checksum
+                   FROM log WHERE id = ?""",
+                (start_id,)
+            ).fetchone()
+            if row is None or row[5] != chain_head or entry_checksum(row[6], *row[:5]) != chain_head:
                 return False
+            prev_checksum, chained = chain_head, row[6] is not None
+
+            scrub_id = self._scrub(conn, scrub_id, start_id)
+            if scrub_id is None:
+                return False
+
+        cursor = conn.execute(
+            """SELECT id, timestamp, role, action, target, details, checksum, prev_checksum
+               FROM log WHERE id > ? ORDER BY id""",
+            (start_id,)
+        )
+        invalid_id, last_id, last_checksum, _ = verify_chain(cursor, prev_checksum, chained)
+
+        if invalid_id is not None:
+            return False
+
+        if last_id is not None:
+            self._save_checkpoint(last_id, last_checksum, scrub_id or 0)
+        elif scrub_id is not None:
+            self._save_checkpoint(start_id, prev_checksum, scrub_id)
 
-        conn.close()
         return True
+
+    def _scrub(self, conn, scrub_id: int, last_id: int) -> Optional[int]:
+        """Re-verify the next SCRUB_BATCH entries up to the checkpoint.
+
+        Args:
+            conn: audit.db connection
+            scrub_id: Last entry re-verified by the previous scrub (0 = start over)
+            last_id: Checkpointed entry id
+
+        Returns:
+            Position for the next scrub (0 once the checkpoint is reached),
+            or None if an invalid entry was found
+        """
+        row = conn.execute(
+            "SELECT checksum, prev_checksum FROM log WHERE id <= ? ORDER BY id DESC LIMIT 1",
+            (scrub_id,)
+        ).fetchone()
+        prev_checksum, chained = (row[0], row[1] is not None) if row else (None, False)
+
+        cursor = conn.execute(
+            """SELECT id, timestamp, role, action, target, details, checksum, prev_checksum
+               FROM log WHERE id > ? AND id <= ? ORDER BY id LIMIT ?""",
+            (scrub_id, last_id, self.SCRUB_BATCH)
+        )
+        invalid_id, scrubbed_id, _, _ = verify_chain(cursor, prev_checksum, chained)
+
+        if invalid_id is not None:
+            return None
+        if scrubbed_id is None or scrubbed_id >= last_id:
+            return 0
+        return scrubbed_id
+
+    def find_first_invalid(self, workers: int = 1) -> Optional[int]:
+        """Verify the whole audit chain and locate the first invalid entry.
+
+        With workers > 1 and a large enough log, the id space is split into
+        ranges that are verified concurrently in a process pool. Each worker
+        streams its range through its own read-only connection and seeds the
+        chain from the entry just before the range, so the table is never
+        loaded into memory.
+
+        Args:
+            workers: Number of worker processes (1 = verify in this process)
+
+        Returns:
+            ID of the first invalid entry, or None if the chain is valid
+        """
+        self.flush()
+        conn = self.config.connection(self.config.audit_db)
+
+        min_id, max_id = conn.execute("SELECT MIN(id), MAX(id) FROM log").fetchone()
+        if min_id is None:
+            return None
+
+        if workers <= 1 or max_id - min_id + 1 < self.PARALLEL_MIN_ENTRIES:
+            cursor = conn.execute(
+                """SELECT id, timestamp, role, action, target, details, checksum, prev_checksum
+                   FROM log WHERE id <= ? ORDER BY id""",
+                (max_id,)
+            )
+            invalid_id, _, _, _ = verify_chain(cursor, None, False)
+        else:
+            starts, ends = zip(*id_ranges(min_id, max_id, workers * self.RANGES_PER_WORKER))
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_verify_range, [str(self.config.audit_db)] * len(starts), starts, ends)
+                invalid_id = min((r for r in results if r is not None), default=None)
+
+        if invalid_id is None:
+            chain_head = conn.execute("SELECT checksum FROM log WHERE id = ?", (max_id,)).fetchone()[0]
+            self._save_checkpoint(max_id, chain_head)
+
+        return invalid_id
+
+    def _save_checkpoint(self, last_id: int, chain_head: str, scrub_id: int = 0):
+        """Record the last verified entry.
+
+        Args:
+            last_id: ID of the last verified entry
+            chain_head: Checksum of that entry
+            scrub_id: Where the next scrub behind the checkpoint starts
+        """
+        with self.config.transaction(self.config.audit_db) as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO verification_checkpoint (id, last_id, chain_head, scrub_id, verified_at)
+                   VALUES (1, ?, ?, ?, datetime('now'))""",
+                (last_id, chain_head, scrub_id)
+            )
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Command-line interface for the Institute system."""
 import argparse
-import sqlite3
+import json
+import os
 import sys
 from pathlib import Path
 
@@ -9,18 +10,25 @@ try:
     from .audit_logger import AuditLogger
     from .config import Config
     from .lockdown import LockdownManager
-    from .queue_manager import QueueManager
+    from .queue_manager import QueueFullError, QueueManager
     from .report_generator import ReportGenerator
     from .state_manager import StateManager
-    from .utils import get_current_user
+    from .task_archiver import TaskArchiver
+    from .utils import get_current_user, iter_jsonl, parse_duration, sqlite_utc_timestamp
 except ImportError:
     from audit_logger import AuditLogger
     from config import Config
     from lockdown import LockdownManager
-    from queue_manager import QueueManager
+    from queue_manager import QueueFullError, QueueManager
     from report_generator import ReportGenerator
     from state_manager import StateManager
-    from utils import get_current_user
+    from task_archiver import TaskArchiver
+    from utils import get_current_user, iter_jsonl, parse_duration, sqlite_utc_timestamp
+
+
+# Exit status when admission control refuses tasks (EX_TEMPFAIL), so
+# scripts can tell "back off and retry" apart from a bad request
+EXIT_QUEUE_FULL = 75
 
 
 class InstituteCLI:
@@ -43,6 +51,7 @@ class InstituteCLI:
         self.queue_manager = QueueManager(self.config)
         self.lockdown_manager = LockdownManager(self.config)
         self.report_generator = ReportGenerator(self.config)
+        self.task_archiver = TaskArchiver(self.config)
 
     def enforce_role(self, required_role: str):
         """Enforce role-based access control.
@@ -92,7 +101,18 @@ class InstituteCLI:
         self.enforce_role('researcher')
         self.check_lockdown()
 
-        task_id = self.queue_manager.create_task(args.name, args.description)
+        try:
+            params = json.loads(args.params) if args.params else None
+            task_id = self.queue_manager.create_task(
+                args.name, args.description, args.priority, args.type, params, args.max_attempts,
+                args.depends_on, args.cache
+            )
+        except QueueFullError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(EXIT_QUEUE_FULL)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
 
         self.audit_logger.log(
             self.role,
@@ -105,23 +125,72 @@ class InstituteCLI:
         print(f"Name: {args.name}")
         if args.description:
             print(f"Description: {args.description}")
+        if args.priority:
+            print(f"Priority: {args.priority}")
+        print(f"Type: {args.type}")
+        if args.depends_on:
+            print(f"Depends on: {', '.join(map(str, args.depends_on))}")
+
+    def task_import(self, args):
+        """Create research tasks in bulk from a JSON Lines file."""
+        self.enforce_role('researcher')
+        self.check_lockdown()
+
+        try:
+            task_ids = self.queue_manager.create_tasks(iter_jsonl(args.file))
+        except QueueFullError as e:
+            print(f"Error: Import failed, no tasks created: {e}", file=sys.stderr)
+            sys.exit(EXIT_QUEUE_FULL)
+        except (OSError, ValueError) as e:
+            print(f"Error: Import failed, no tasks created: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if not task_ids:
+            print("No tasks found in input.")
+            return
+
+        self.audit_logger.log(
+            self.role,
+            'tasks_imported',
+            target=f"task_{task_ids[0]}..task_{task_ids[-1]}",
+            details=f"{len(task_ids)} task(s) from {args.file}"
+        )
+
+        print(f"Imported {len(task_ids)} task(s): {task_ids[0]}-{task_ids[-1]}")
 
     def task_list(self, args):
         """List research tasks."""
         self.enforce_role('researcher')
         self.check_lockdown()
 
-        tasks = self.queue_manager.list_tasks(args.status)
+        since = None
+        if args.since:
+            try:
+                since = sqlite_utc_timestamp(args.since)
+            except ValueError:
+                print(f"Error: --since must be a date or timestamp (YYYY-MM-DD[ HH:MM:SS]): {args.since}",
+                      file=sys.stderr)
+                sys.exit(1)
+
+        # Rows are printed as they are read rather than collected first
+        tasks = self.queue_manager.list_tasks(args.status, args.limit, args.after_id, since)
+        shown = 0
+        try:
+            for task in tasks:
+                if not shown:
+                    print(f"{'ID':<6} {'Status':<12} {'Created':<20} {'Name'}")
+                    print("-" * 80)
+                print(f"{task['id']:<6} {task['status']:<12} {task['created_at'][:19]:<20} {task['name']}")
+                shown += 1
+                last_id = task['id']
+        except LookupError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
 
-        if not tasks:
+        if not shown:
             print("No tasks found.")
-            return
-
-        print(f"{'ID':<6} {'Status':<12} {'Created':<20} {'Name'}")
-        print("-" * 80)
-
-        for task in tasks:
-            print(f"{task['id']:<6} {task['status']:<12} {task['created_at'][:19]:<20} {task['name']}")
+        elif shown == args.limit:
+            print(f"... more with --after-id {last_id}")
 
     def task_status(self, args):
         """Show task status."""
@@ -139,13 +208,93 @@ class InstituteCLI:
         if task['description']:
             print(f"Description: {task['description']}")
         print(f"Status: {task['status']}")
+        print(f"Priority: {task['priority']}")
+        print(f"Type: {task['type']}")
+        if task['params']:
+            print(f"Params: {json.dumps(task['params'], sort_keys=True)}")
+        print(f"Attempts: {task['attempts']}/{task['max_attempts']}")
+        if task['submitted_by']:
+            print(f"Submitted by: {task['submitted_by']}")
+        if task['depends_on']:
+            print(f"Depends on: {', '.join(map(str, task['depends_on']))}")
+            if task['status'] == 'pending' and task['waiting_on']:
+                print(f"Waiting on: {task['waiting_on']} unfinished dependency(ies)")
+        if task['next_attempt_at']:
+            print(f"Next attempt: {task['next_attempt_at']}")
+        if task['dead_lettered'] and task['archived']:
+            print("Dead-lettered: retries exhausted")
+        elif task['dead_lettered']:
+            print("Dead-lettered: retries exhausted (requeue with 'task retry')")
         print(f"Created: {task['created_at']}")
         print(f"Updated: {task['updated_at']}")
         if task['completed_at']:
             print(f"Completed: {task['completed_at']}")
+        if task['archived']:
+            print(f"Archived: {self.config.archive_db(task['created_at'][:7])}")
+        if task['cache_hit']:
+            print("Result: served from the result cache")
         if task['error_message']:
             print(f"Error: {task['error_message']}")
 
+        total = self.queue_manager.count_findings(task['id'])
+        if total and args.findings > 0:
+            # One extra row tells whether there is another page
+            findings = self.queue_manager.get_findings(task['id'], args.findings + 1, args.findings_after)
+            print(f"\nFindings ({total}):")
+            for finding in findings[:args.findings]:
+                print(f"  [{finding['id']}] {finding['content']}")
+            if len(findings) > args.findings:
+                print(f"  ... more with --findings-after {findings[args.findings - 1]['id']}")
+
+    def task_dead_letter(self, args):
+        """List tasks that exhausted their retries."""
+        self.enforce_role('researcher')
+        self.check_lockdown()
+
+        entries = self.queue_manager.list_dead_letters()
+
+        if not entries:
+            print("No dead-lettered tasks.")
+            return
+
+        print(f"{'ID':<6} {'Attempts':<9} {'Dead since':<20} {'Name'}")
+        print("-" * 80)
+
+        for entry in entries:
+            print(f"{entry['task_id']:<6} {entry['attempts']:<9} {entry['created_at'][:19]:<20} {entry['name']}")
+            print(f"       {entry['error_message']}")
+
+    def task_retry(self, args):
+        """Requeue a dead-lettered task."""
+        self.enforce_role('researcher')
+        self.check_lockdown()
+
+        try:
+            task_ids = self.queue_manager.requeue_task(args.task_id)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if not task_ids:
+            print(f"Task is not dead-lettered: {args.task_id}")
+            return
+
+        if self.queue_manager.file_mirror_enabled():
+            for task_id in task_ids:
+                self.queue_manager.move_task(task_id, 'failed', 'pending')
+
+        dependents = task_ids[1:]
+        self.audit_logger.log(
+            self.role,
+            'task_requeued',
+            target=f"task_{args.task_id}",
+            details=f"With dependents: {', '.join(map(str, dependents))}" if dependents else None
+        )
+
+        print(f"Task requeued: {args.task_id}")
+        if dependents:
+            print(f"Dependents requeued: {', '.join(map(str, dependents))}")
+
     def inbox_list(self, args):
         """List inbox messages."""
         self.enforce_role('researcher')
@@ -202,6 +351,11 @@ class InstituteCLI:
             print(f"  {state}: {count}")
         print()
 
+        print("Tasks:")
+        for task_status, count in status['task_counts'].items():
+            print(f"  {task_status}: {count}")
+        print()
+
         if status['mode'] == 'LOCKDOWN':
             print("Recovery Status:")
             if status['can_recover']:
@@ -215,17 +369,12 @@ class InstituteCLI:
         """List escalations."""
         self.enforce_role('director')
 
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-
-        cursor.execute(
+        conn = self.config.connection(self.config.management_db)
+        rows = conn.execute(
             """SELECT id, code, level, state, message, created_at, acknowledged_at
                FROM escalations
                ORDER BY created_at DESC"""
-        )
-
-        rows = cursor.fetchall()
-        conn.close()
+        ).fetchall()
 
         if not rows:
             print("No escalations.")
@@ -242,22 +391,16 @@ class InstituteCLI:
         """Acknowledge an escalation."""
         self.enforce_role('director')
 
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "UPDATE escalations SET state = 'ACKNOWLEDGED', acknowledged_at = datetime('now') WHERE id = ?",
-            (args.escalation_id,)
-        )
+        with self.config.transaction(self.config.management_db) as conn:
+            cursor = conn.execute(
+                "UPDATE escalations SET state = 'ACKNOWLEDGED', acknowledged_at = datetime('now') WHERE id = ?",
+                (args.escalation_id,)
+            )
 
         if cursor.rowcount == 0:
-            conn.close()
             print(f"Escalation not found: {args.escalation_id}")
             return
 
-        conn.commit()
-        conn.close()
-
         self.audit_logger.log(
             self.role,
             'escalation_acknowledged',
@@ -270,24 +413,18 @@ class InstituteCLI:
         """Resolve an escalation."""
         self.enforce_role('director')
 
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """UPDATE escalations
-               SET state = 'RESOLVED', resolved_at = datetime('now'), resolution_note = ?
-               WHERE id = ?""",
-            (args.note, args.escalation_id)
-        )
+        with self.config.transaction(self.config.management_db) as conn:
+            cursor = conn.execute(
+                """UPDATE escalations
+                   SET state = 'RESOLVED', resolved_at = datetime('now'), resolution_note = ?
+                   WHERE id = ?""",
+                (args.note, args.escalation_id)
+            )
 
         if cursor.rowcount == 0:
-            conn.close()
             print(f"Escalation not found: {args.escalation_id}")
             return
 
-        conn.commit()
-        conn.close()
-
         self.audit_logger.log(
             self.role,
             'escalation_resolved',
@@ -331,11 +468,8 @@ class InstituteCLI:
         """Show configuration."""
         self.enforce_role('director')
 
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-        cursor.execute("SELECT key, value, updated_at FROM config ORDER BY key")
-        rows = cursor.fetchall()
-        conn.close()
+        conn = self.config.connection(self.config.management_db)
+        rows = conn.execute("SELECT key, value, updated_at FROM config ORDER BY key").fetchall()
 
         print(f"{'Key':<35} {'Value':<20} {'Updated'}")
         print("-" * 80)
@@ -347,7 +481,11 @@ class InstituteCLI:
         """Set configuration value."""
         self.enforce_role('director')
 
-        self.config.set_config_value(args.key, args.value)
+        try:
+            self.config.set_config_value(args.key, args.value)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
 
         self.audit_logger.log(
             self.role,
@@ -411,6 +549,60 @@ class InstituteCLI:
             details_str = details[:40] if details else ""
             print(f"{timestamp[:19]:<20} {role:<12} {action:<25} {target_str:<20} {details_str}")
 
+    def audit_verify(self, args):
+        """Verify audit log integrity."""
+        self.enforce_role('director')
+
+        if not args.full:
+            if self.audit_logger.verify_integrity():
+                print("✓ Audit log verified (entries since last checkpoint).")
+            else:
+                print("✗ Audit log integrity check failed. Run 'audit verify --full' to locate the entry.")
+                sys.exit(1)
+            return
+
+        invalid_id = self.audit_logger.find_first_invalid(workers=args.workers)
+
+        if invalid_id is None:
+            print("✓ Audit log verified (full chain).")
+        else:
+            print(f"✗ Audit log integrity check failed at entry {invalid_id}.")
+            sys.exit(1)
+
+    def queue_migrate(self, args):
+        """Move queue files from the flat layout into ID shards."""
+        self.enforce_role('director')
+
+        moved = self.queue_manager.migrate_queue_layout()
+
+        self.audit_logger.log(
+            self.role,
+            'queue_layout_migrated',
+            details=f"{moved} file(s) moved"
+        )
+
+        print(f"Moved {moved} queue file(s) into shard directories.")
+
+    def archive_tasks(self, args):
+        """Move old completed and failed tasks into the archive databases."""
+        self.enforce_role('director')
+
+        try:
+            older_than = parse_duration(args.older_than)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        archived = self.task_archiver.archive_tasks(older_than)
+
+        if not archived:
+            print("No tasks to archive.")
+            return
+
+        for month, count in sorted(archived.items()):
+            print(f"  {self.config.archive_db(month)}: {count} task(s)")
+        print(f"Archived {sum(archived.values())} task(s)")
+
 
 def main():
     """Main entry point for the CLI."""
@@ -442,12 +634,40 @@ def main():
     create_parser = task_subparsers.add_parser('create', help='Create a task')
     create_parser.add_argument('--name', required=True, help='Task name')
     create_parser.add_argument('--description', help='Task description')
+    create_parser.add_argument('--priority', type=int, default=0,
+                               help='Task priority; higher runs first (default: 0)')
+    create_parser.add_argument('--type', default='noop',
+                               help='Task type, i.e. the handler that runs it (default: noop)')
+    create_parser.add_argument('--params', help='Handler parameters as a JSON object')
+    create_parser.add_argument('--max-attempts', type=int,
+                               help='Attempts before the task is dead-lettered (default: task_max_attempts)')
+    create_parser.add_argument('--depends-on', type=int, nargs='+', default=[], metavar='TASK_ID',
+                               help='Tasks that must complete before this one runs')
+    create_parser.add_argument('--cache', action='store_true',
+                               help='Reuse the outputs of an identical earlier run (same type, params and inputs)')
+
+    import_parser = task_subparsers.add_parser('import', help='Create tasks from a JSON Lines file')
+    import_parser.add_argument('file', help='File with one {"name": ..., "description": ...} object per line (- for stdin); '
+                                            '"depends_on" may name the "key" of another task in the file')
 
     list_parser = task_subparsers.add_parser('list', help='List tasks')
     list_parser.add_argument('--status', choices=['pending', 'processing', 'completed', 'failed'], help='Filter by status')
+    list_parser.add_argument('--limit', type=int, metavar='N', help='Show at most N tasks')
+    list_parser.add_argument('--after-id', type=int, metavar='TASK_ID',
+                             help='Continue a listing after this task (tasks are listed newest first)')
+    list_parser.add_argument('--since', metavar='TIMESTAMP', help='Only list tasks created at or after this UTC time')
 
     status_parser = task_subparsers.add_parser('status', help='Show task status')
     status_parser.add_argument('task_id', type=int, help='Task ID')
+    status_parser.add_argument('--findings', type=int, default=10, metavar='N',
+                               help='Findings to show per page (default: 10, 0 for none)')
+    status_parser.add_argument('--findings-after', type=int, default=0, metavar='FINDING_ID',
+                               help='Show findings after this finding ID')
+
+    task_subparsers.add_parser('dead-letter', help='List tasks that exhausted their retries')
+
+    retry_parser = task_subparsers.add_parser('retry', help='Requeue a dead-lettered task')
+    retry_parser.add_argument('task_id', type=int, help='Task ID')
 
     # inbox
     inbox_parser = subparsers.add_parser('inbox', help='Inbox management')
@@ -516,6 +736,28 @@ def main():
     tail_parser = audit_subparsers.add_parser('tail', help='Show recent audit log entries')
     tail_parser.add_argument('n', type=int, nargs='?', help='Number of entries')
 
+    verify_parser = audit_subparsers.add_parser('verify', help='Verify audit log integrity')
+    verify_parser.add_argument('--full', action='store_true', help='Verify the whole chain instead of new entries only')
+    verify_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes for --full')
+
+    # queue
+    queue_parser = subparsers.add_parser('queue', help='Queue directory maintenance')
+    queue_subparsers = queue_parser.add_subparsers(dest='queue_command')
+
+    queue_subparsers.add_parser(
+        'migrate', help='Move task files from queues/research/<status>/ into <status>/<task_id // 1000>/'
+    )
+
+    # archive
+    archive_parser = subparsers.add_parser('archive', help='Archive management')
+    archive_subparsers = archive_parser.add_subparsers(dest='archive_command')
+
+    archive_tasks_parser = archive_subparsers.add_parser(
+        'tasks', help='Move completed and failed tasks into db/archive/research-YYYY-MM.db'
+    )
+    archive_tasks_parser.add_argument('--older-than', default='30d', metavar='AGE',
+                                      help='Only tasks not updated for this long, e.g. 30d, 12h, 2w (default: 30d)')
+
     # Parse arguments
     args = parser.parse_args()
 
@@ -531,10 +773,16 @@ def main():
         if args.command == 'task':
             if args.task_command == 'create':
                 cli.task_create(args)
+            elif args.task_command == 'import':
+                cli.task_import(args)
             elif args.task_command == 'list':
                 cli.task_list(args)
             elif args.task_command == 'status':
                 cli.task_status(args)
+            elif args.task_command == 'dead-letter':
+                cli.task_dead_letter(args)
+            elif args.task_command == 'retry':
+                cli.task_retry(args)
 
         elif args.command == 'inbox':
             if args.inbox_command == 'list':
@@ -578,6 +826,16 @@ def main():
         elif args.command == 'audit':
             if args.audit_command == 'tail':
                 cli.audit_tail(args)
+            elif args.audit_command == 'verify':
+                cli.audit_verify(args)
+
+        elif args.command == 'queue':
+            if args.queue_command == 'migrate':
+                cli.queue_migrate(args)
+
+        elif args.command == 'archive':
+            if args.archive_command == 'tasks':
+                cli.archive_tasks(args)
 
     except PermissionError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1,13 +1,40 @@
 """Configuration management for the Institute system."""
 import os
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
 
 
 class Config:
     """Manages system configuration and paths."""
 
+    # SQLite performance profile. journal_mode is persisted in the database
+    # file by DatabaseInitializer; the other pragmas are per-connection and
+    # are applied whenever connection() opens a database. An install
+    # overrides a pragma with the 'sqlite_<pragma>' key of the management.db
+    # config table (see sqlite_profile_in_effect()).
+    SQLITE_PROFILE = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -16000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    }
+
+    # Pragma values are interpolated into PRAGMA statements
+    SQLITE_PRAGMA_VALUE = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+    # Databases each role may read in a read_session(); other roles
+    # (including the system daemons) get all of them.
+    ROLE_DATABASES = {
+        'researcher': ('system', 'research', 'shared'),
+        'director': ('system', 'research', 'management', 'shared', 'audit'),
+    }
+
     def __init__(self, base_path: Optional[str] = None):
         """Initialize configuration.
 
@@ -32,11 +59,13 @@ class Config:
         self.management_db = self.db_dir / "management.db"
         self.shared_db = self.db_dir / "shared.db"
         self.audit_db = self.db_dir / "audit.db"
+        self.archive_db_dir = self.db_dir / "archive"
 
         # Specific subdirectories
         self.research_data_dir = self.research_dir / "data"
         self.research_scripts_dir = self.research_dir / "scripts"
         self.research_outputs_dir = self.research_dir / "outputs"
+        self.result_cache_dir = self.research_outputs_dir / ".cache"
 
         self.management_config_dir = self.management_dir / "config"
         self.management_escalations_dir = self.management_dir / "escalations"
@@ -68,6 +97,10 @@ class Config:
         self.current_role: Optional[str] = None
         self.current_user: Optional[str] = None
 
+        # Per-thread connection registry (see connection())
+        self._local = threading.local()
+        self.sqlite_profile = dict(self.SQLITE_PROFILE)
+
     def ensure_directories(self):
         """Create all required directories if they don't exist."""
         directories = [
@@ -75,6 +108,7 @@ class Config:
             self.research_data_dir,
             self.research_scripts_dir,
             self.research_outputs_dir,
+            self.result_cache_dir,
             self.management_dir,
             self.management_config_dir,
             self.management_escalations_dir,
@@ -99,14 +133,221 @@ class Config:
             self.queues_management_pending,
             self.queues_management_escalations,
             self.db_dir,
+            self.archive_db_dir,
         ]
 
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
 
+    def _connection_state(self) -> dict:
+        """Get the connection registry for the current thread.
+
+        The registry is discarded after a fork so that a child process never
+        reuses a connection opened by its parent.
+
+        Returns:
+            Dict mapping database path to a connection entry
+        """
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.pid = os.getpid()
+            local.connections = {}
+        return local.connections
+
+    def connection(self, db_path: Path) -> sqlite3.Connection:
+        """Get the cached connection to a database for the current thread.
+
+        Connections are opened on first use and reused for the lifetime of
+        the thread, so callers must not close them.
+
+        Args:
+            db_path: Path to database file
+
+        Returns:
+            Open SQLite connection
+        """
+        connections = self._connection_state()
+        key = str(db_path)
+        entry = connections.get(key)
+        if entry is None:
+            conn = sqlite3.connect(key)
+            # Registered first: applying the profile reads management.db,
+            # through this very connection when it is the management.db one
+            entry = {'conn': conn, 'depth': 0, 'cache': {}, 'data_version': None}
+            connections[key] = entry
+            try:
+                self.apply_connection_pragmas(conn)
+            except BaseException:
+                del connections[key]
+                conn.close()
+                raise
+        return entry['conn']
+
+    def sqlite_profile_in_effect(self) -> dict:
+        """Get the SQLite profile with the install's overrides applied.
+
+        Overrides are stored in management.db as 'sqlite_<pragma>' config
+        keys, so every process (daemons, CLI, watchdog) uses them for the
+        connections it opens. Values that are not a plain word or number
+        are ignored.
+
+        Returns:
+            Dict mapping pragma name to value
+        """
+        profile = dict(self.sqlite_profile)
+        for pragma in profile:
+            value = self.get_config_value(f"sqlite_{pragma}")
+            if value is not None and self.SQLITE_PRAGMA_VALUE.match(value):
+                profile[pragma] = value
+        return profile
+
+    def apply_connection_pragmas(self, conn: sqlite3.Connection):
+        """Apply the per-connection part of the SQLite profile.
+
+        Args:
+            conn: Open SQLite connection
+        """
+        for pragma, value in self.sqlite_profile_in_effect().items():
+            if pragma != 'journal_mode':
+                conn.execute(f"PRAGMA {pragma} = {value}")
+
+    @contextmanager
+    def transaction(self, db_path: Path, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Run a block of statements in a single transaction.
+
+        Commits when the block exits normally and rolls back on error.
+        Nested transactions on the same database join the outermost one.
+
+        Args:
+            db_path: Path to database file
+            immediate: Take the write lock up front (BEGIN IMMEDIATE), for
+                read-then-write blocks that must not interleave with other
+                writers
+
+        Yields:
+            Open SQLite connection
+        """
+        conn = self.connection(db_path)
+        entry = self._connection_state()[str(db_path)]
+        entry['depth'] += 1
+        try:
+            if immediate and entry['depth'] == 1:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            if entry['depth'] == 1:
+                conn.commit()
+        except BaseException:
+            if entry['depth'] == 1:
+                conn.rollback()
+            raise
+        finally:
+            entry['depth'] -= 1
+            # PRAGMA data_version ignores this connection's own commits
+            entry['cache'].clear()
+
+    def cached_read(self, db_path: Path, key: str,
+                    loader: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Return a cached query result, reloading it when the database changes.
+
+        Changes committed by other connections are detected with
+        PRAGMA data_version; commits made through transaction() on this
+        thread clear the cache directly.
+
+        Args:
+            db_path: Path to database file
+            key: Cache key for the result
+            loader: Function that runs the query on the given connection
+
+        Returns:
+            Cached or freshly loaded result
+        """
+        conn = self.connection(db_path)
+        entry = self._connection_state()[str(db_path)]
+
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != entry['data_version']:
+            entry['cache'].clear()
+            entry['data_version'] = data_version
+
+        if key not in entry['cache']:
+            entry['cache'][key] = loader(conn)
+        return entry['cache'][key]
+
+    def close_connections(self):
+        """Close all cached connections held by the current thread."""
+        connections = self._connection_state()
+        for entry in connections.values():
+            entry['conn'].close()
+        connections.clear()
+
+    def database_paths(self) -> dict:
+        """Get the path of every database by name.
+
+        Returns:
+            Dict mapping database name to path
+        """
+        return {
+            'system': self.system_db,
+            'research': self.research_db,
+            'management': self.management_db,
+            'shared': self.shared_db,
+            'audit': self.audit_db,
+        }
+
+    def archive_db(self, month: str) -> Path:
+        """Get the path of the archive database for a month.
+
+        Args:
+            month: Month the archived tasks were created in (YYYY-MM)
+
+        Returns:
+            Path to db/archive/research-YYYY-MM.db
+        """
+        return self.archive_db_dir / f"research-{month}.db"
+
+    @contextmanager
+    def read_session(self, role: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+        """Open one read-only connection with the databases ATTACHed by name.
+
+        Every attached database is read inside a single transaction, so all
+        queries in the session see one consistent snapshot and can join
+        across databases (e.g. research.tasks with audit.log).
+
+        Args:
+            role: Role whose readable databases are attached (default: current_role)
+
+        Yields:
+            SQLite connection with the databases attached as system, research,
+            management, shared and audit
+        """
+        role = role or self.current_role
+        paths = self.database_paths()
+        names = self.ROLE_DATABASES.get(role, tuple(paths))
+
+        conn = sqlite3.connect(':memory:', uri=True, isolation_level=None)
+        try:
+            self.apply_connection_pragmas(conn)
+            for name in names:
+                conn.execute(f"ATTACH DATABASE ? AS {name}", (f"file:{paths[name]}?mode=ro",))
+
+            # Pin the snapshot of every attached database up front
+            conn.execute("BEGIN")
+            for name in names:
+                conn.execute(f"SELECT 1 FROM {name}.sqlite_master LIMIT 1").fetchall()
+
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.close()
+
     def get_config_value(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get a configuration value from management.db.
 
+        The whole config table is held as an in-memory snapshot that is
+        reloaded only after management.db changes, so daemons can call this
+        every cycle and still pick up 'config set' without restarting.
+
         Args:
             key: Configuration key
             default: Default value if key not found
@@ -115,13 +356,14 @@ class Config:
             Configuration value or default
         """
         try:
-            conn = sqlite3.connect(str(self.management_db))
-            cursor = conn.cursor()
-            cursor.execute("SELECT value FROM config WHERE key = ?", (key,))
-            row = cursor.fetchone()
-            conn.close()
-            return row[0] if row else default
-        except Exception:
+            snapshot = self.cached_read(
+                self.management_db,
+                'config',
+                lambda conn: dict(conn.execute("SELECT key, value FROM config").fetchall())
+            )
+            return snapshot.get(key, default)
+        except sqlite3.OperationalError:
+            # management.db not initialized yet
             return default
 
     def set_config_value(self, key: str, value: str):
@@ -130,12 +372,17 @@ class Config:
         Args:
             key: Configuration key
             value: Configuration value
+
+        Raises:
+            ValueError: If an SQLite profile override is not a plain word or
+                number
         """
-        conn = sqlite3.connect(str(self.management_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR REPLACE INTO config (key, value, updated_at) VALUES (?, ?, datetime('now'))",
-            (key, value)
-        )
-        conn.commit()
-        conn.close()
+        if key.startswith('sqlite_') and key[len('sqlite_'):] in self.SQLITE_PROFILE \
+                and not self.SQLITE_PRAGMA_VALUE.match(value):
+            raise ValueError(f"Invalid value for {key}: {value!r}")
+
+        with self.transaction(self.management_db) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO config (key, value, updated_at) VALUES (?, ?, datetime('now'))",
+                (key, value)
+            )
@@ -12,14 +12,49 @@ except ImportError:
 class DatabaseInitializer:
     """Handles database initialization and schema setup."""
 
-    def __init__(self, config: Config, schema_dir: Optional[Path] = None):
+    # Columns added after a table's first release: (table, column, definition).
+    # Applied to existing databases before the schema script runs.
+    COLUMN_MIGRATIONS = {
+        'audit.sql': [
+            ('log', 'prev_checksum', 'TEXT'),
+            ('verification_checkpoint', 'scrub_id', 'INTEGER NOT NULL DEFAULT 0'),
+        ],
+        'research.sql': [
+            ('tasks', 'claimed_by', 'TEXT'),
+            ('tasks', 'lease_expires_at', 'TEXT'),
+            ('tasks', 'priority', 'INTEGER NOT NULL DEFAULT 0'),
+            ('tasks', 'type', "TEXT NOT NULL DEFAULT 'noop'"),
+            ('tasks', 'params', 'TEXT'),
+            ('tasks', 'attempts', 'INTEGER NOT NULL DEFAULT 0'),
+            ('tasks', 'max_attempts', 'INTEGER NOT NULL DEFAULT 1'),
+            ('tasks', 'next_attempt_at', 'TEXT'),
+            ('tasks', 'waiting_on', 'INTEGER NOT NULL DEFAULT 0'),
+            ('tasks', 'cacheable', 'INTEGER NOT NULL DEFAULT 0'),
+            ('tasks', 'cache_hit', 'INTEGER NOT NULL DEFAULT 0'),
+            ('result_cache', 'task_id', 'INTEGER'),
+            ('tasks', 'submitted_by', 'TEXT'),
+        ],
+        'archive.sql': [
+            ('tasks', 'submitted_by', 'TEXT'),
+        ],
+    }
+
+    PROFILE_PRAGMAS = ['journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size', 'temp_store']
+
+    def __init__(self, config: Config, schema_dir: Optional[Path] = None,
+                 profile: Optional[dict] = None):
         """Initialize database initializer.
 
         Args:
             config: System configuration
             schema_dir: Path to schema files (default: relative to module)
+            profile: SQLite pragma overrides; initialize_all() stores them in
+                management.db, so every later Config uses them too
         """
         self.config = config
+        self.profile = profile or {}
+        if profile:
+            self.config.sqlite_profile.update(profile)
         if schema_dir is None:
             # Default to ../schemas relative to this module
             module_dir = Path(__file__).parent
@@ -29,6 +64,11 @@ class DatabaseInitializer:
 
     def initialize_all(self):
         """Initialize all databases with their schemas."""
+        if self.profile:
+            # Store the overrides first so every database is set up with them
+            self.initialize_database(self.config.management_db, "management.sql")
+            self.save_profile(self.profile)
+
         databases = [
             (self.config.system_db, "system.sql"),
             (self.config.research_db, "research.sql"),
@@ -61,11 +101,79 @@ class DatabaseInitializer:
         # Execute schema
         conn = sqlite3.connect(str(db_path))
         try:
+            self.apply_profile(conn)
+            self.apply_column_migrations(conn, schema_file)
             conn.executescript(schema_sql)
             conn.commit()
         finally:
             conn.close()
 
+    def apply_column_migrations(self, conn: sqlite3.Connection, schema_file: str):
+        """Add columns introduced after a table was first created.
+
+        Tables that do not exist yet are skipped; the schema script creates
+        them with every column.
+
+        Args:
+            conn: Open SQLite connection
+            schema_file: Name of schema SQL file
+        """
+        for table, column, definition in self.COLUMN_MIGRATIONS.get(schema_file, []):
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if existing and column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        conn.commit()
+
+    def apply_profile(self, conn: sqlite3.Connection):
+        """Apply the SQLite performance profile to a database.
+
+        journal_mode is stored in the database file, so every later
+        connection inherits it; the remaining pragmas are applied to this
+        connection and again by Config.connection() on every open.
+
+        Args:
+            conn: Open SQLite connection
+        """
+        journal_mode = self.config.sqlite_profile_in_effect().get('journal_mode')
+        if journal_mode:
+            conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        self.config.apply_connection_pragmas(conn)
+
+    def save_profile(self, profile: dict):
+        """Store SQLite pragma overrides for the whole install.
+
+        They are written to the management.db config table as
+        'sqlite_<pragma>' keys and apply to connections opened from then on,
+        by this and every other process; running daemons pick them up when
+        restarted.
+
+        Args:
+            profile: Dict mapping pragma name to value
+
+        Raises:
+            ValueError: If a pragma is not part of Config.SQLITE_PROFILE or a
+                value is not a plain word or number
+        """
+        for pragma, value in profile.items():
+            if pragma not in self.config.SQLITE_PROFILE:
+                raise ValueError(f"Unknown SQLite profile pragma: {pragma}")
+            self.config.set_config_value(f"sqlite_{pragma}", str(value))
+
+    def get_profile(self, db_path: Path) -> dict:
+        """Get the active pragma values for a database.
+
+        Args:
+            db_path: Path to database
+
+        Returns:
+            Dict mapping pragma name to its current value
+        """
+        conn = self.config.connection(db_path)
+        return {
+            pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in self.PROFILE_PRAGMAS
+        }
+
     def verify_integrity(self, db_path: Path) -> bool:
         """Verify database integrity.
 
@@ -76,28 +184,23 @@ class DatabaseInitializer:
             True if integrity check passes
         """
         try:
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            cursor.execute("PRAGMA integrity_check")
-            result = cursor.fetchone()
-            conn.close()
+            conn = self.config.connection(db_path)
+            result = conn.execute("PRAGMA integrity_check").fetchone()
             return result[0] == 'ok'
         except Exception:
             return False
 
-    def verify_all(self) -> dict:
+    def verify_all(self, include_profile: bool = False) -> dict:
         """Verify integrity of all databases.
 
+        Args:
+            include_profile: Also report the active pragma profile
+
         Returns:
-            Dict mapping database name to integrity status
+            Dict mapping database name to integrity status, or to a dict with
+            'integrity' and 'profile' keys if include_profile is set
         """
-        databases = {
-            'system': self.config.system_db,
-            'research': self.config.research_db,
-            'management': self.config.management_db,
-            'shared': self.config.shared_db,
-            'audit': self.config.audit_db,
-        }
+        databases = self.config.database_paths()
 
         results = {}
         for name, db_path in databases.items():
@@ -106,4 +209,10 @@ class DatabaseInitializer:
             else:
                 results[name] = False
 
+            if include_profile:
+                results[name] = {
+                    'integrity': results[name],
+                    'profile': self.get_profile(db_path) if db_path.exists() else {},
+                }
+
         return results
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Escalation engine for the Institute system."""
 import json
-import sqlite3
 import sys
 import time
 from datetime import datetime, timedelta
@@ -75,40 +74,37 @@ class EscalationEngine:
             message: Escalation message
             initial_level: Initial severity level
         """
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-
-        # Check if escalation already exists
-        cursor.execute("SELECT id, level, state FROM escalations WHERE code = ?", (code,))
-        existing = cursor.fetchone()
-
-        if existing:
-            # Update existing escalation if not already resolved
-            esc_id, level, state = existing
-            if state not in ('ACKNOWLEDGED', 'RESOLVED'):
+        with self.config.transaction(self.config.management_db) as conn:
+            cursor = conn.cursor()
+
+            # Check if escalation already exists
+            cursor.execute("SELECT id, level, state FROM escalations WHERE code = ?", (code,))
+            existing = cursor.fetchone()
+
+            if existing:
+                # Update existing escalation if not already resolved
+                esc_id, level, state = existing
+                if state not in ('ACKNOWLEDGED', 'RESOLVED'):
+                    cursor.execute(
+                        "UPDATE escalations SET message = ? WHERE id = ?",
+                        (message, esc_id)
+                    )
+            else:
+                # Create new escalation at L1
                 cursor.execute(
-                    "UPDATE escalations SET message = ? WHERE id = ?",
-                    (message, esc_id)
+                    """INSERT INTO escalations (code, level, state, message, created_at)
+                       VALUES (?, 'L1', 'DETECTED', ?, datetime('now'))""",
+                    (code, message)
                 )
-        else:
-            # Create new escalation at L1
-            cursor.execute(
-                """INSERT INTO escalations (code, level, state, message, created_at)
-                   VALUES (?, 'L1', 'DETECTED', ?, datetime('now'))""",
-                (code, message)
-            )
-            esc_id = cursor.lastrowid
-
-            # Send notification to director
-            self.send_notification(esc_id, 'L1', message)
+                esc_id = cursor.lastrowid
 
-            cursor.execute(
-                "UPDATE escalations SET state = 'NOTIFIED', notified_at = datetime('now') WHERE id = ?",
-                (esc_id,)
-            )
+                # Send notification to director
+                self.send_notification(esc_id, 'L1', message)
 
-        conn.commit()
-        conn.close()
+                cursor.execute(
+                    "UPDATE escalations SET state = 'NOTIFIED', notified_at = datetime('now') WHERE id = ?",
+                    (esc_id,)
+                )
 
         self.audit_logger.log(
             'system',
@@ -119,17 +115,16 @@ class EscalationEngine:
 
     def check_escalations(self):
         """Check all escalations and escalate if needed."""
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
+        conn = self.config.connection(self.config.management_db)
 
         # Get all active escalations (not resolved)
-        cursor.execute(
+        rows = conn.execute(
             """SELECT id, code, level, state, message, created_at, notified_at, reminded_at
                FROM escalations
                WHERE state NOT IN ('RESOLVED', 'EXPIRED')"""
-        )
+        ).fetchall()
 
-        for row in cursor.fetchall():
+        for row in rows:
             esc_id, code, level, state, message, created_at, notified_at, reminded_at = row
 
             try:
@@ -145,8 +140,6 @@ class EscalationEngine:
                     details=str(e)
                 )
 
-        conn.close()
-
     def process_escalation(self, esc_id: int, code: str, level: str, state: str,
                           message: str, created_at: str, notified_at: str,
                           reminded_at: str):
@@ -195,17 +188,13 @@ class EscalationEngine:
             level: New escalation level
             message: Escalation message
         """
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """UPDATE escalations
-               SET level = ?, state = 'NOTIFIED', notified_at = datetime('now')
-               WHERE id = ?""",
-            (level, esc_id)
-        )
-        conn.commit()
-        conn.close()
+        with self.config.transaction(self.config.management_db) as conn:
+            conn.execute(
+                """UPDATE escalations
+                   SET level = ?, state = 'NOTIFIED', notified_at = datetime('now')
+                   WHERE id = ?""",
+                (level, esc_id)
+            )
 
         # Send notification
         self.send_notification(esc_id, level, message)
@@ -0,0 +1,81 @@
+"""Batched writer for the findings table of research.db."""
+import json
+from typing import Any, Iterable
+
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
+
+class FindingsWriter:
+    """Buffers findings of one task and inserts them in batches.
+
+    Each batch is a single executemany in one transaction, so a task can
+    record thousands of findings without a commit per finding. Use as a
+    context manager (buffered findings are written if the block succeeds and
+    discarded if it raises), or call flush() when done; unflushed findings
+    are lost.
+    """
+
+    def __init__(self, config: Config, task_id: int, batch_size: int = 1000):
+        """Initialize findings writer.
+
+        Args:
+            config: System configuration
+            task_id: Task the findings belong to
+            batch_size: Findings buffered before they are written
+        """
+        self.config = config
+        self.task_id = task_id
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+    def add(self, content: Any):
+        """Record a finding.
+
+        Args:
+            content: Finding text; other values are stored as JSON
+        """
+        if content is None:
+            raise ValueError("Finding content is required")
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True)
+
+        self._buffer.append((self.task_id, content))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def extend(self, contents: Iterable[Any]):
+        """Record many findings.
+
+        Args:
+            contents: Iterable of findings (see add)
+        """
+        for content in contents:
+            self.add(content)
+
+    def flush(self):
+        """Write buffered findings in one transaction."""
+        if not self._buffer:
+            return
+
+        with self.config.transaction(self.config.research_db) as conn:
+            conn.executemany("INSERT INTO findings (task_id, content) VALUES (?, ?)", self._buffer)
+
+        self.written += len(self._buffer)
+        self._buffer = []
+
+    def discard(self):
+        """Drop buffered findings without writing them."""
+        self._buffer = []
@@ -1,16 +1,18 @@
 """Lockdown manager for the Institute system."""
-import sqlite3
+import os
 from typing import Tuple
 
 try:
     from .audit_logger import AuditLogger
     from .config import Config
     from .db_init import DatabaseInitializer
+    from .queue_manager import QueueManager
     from .state_manager import StateManager
 except ImportError:
     from audit_logger import AuditLogger
     from config import Config
     from db_init import DatabaseInitializer
+    from queue_manager import QueueManager
     from state_manager import StateManager
 
 
@@ -25,6 +27,7 @@ class LockdownManager:
         """
         self.config = config
         self.state_manager = StateManager(config)
+        self.queue_manager = QueueManager(config)
         self.audit_logger = AuditLogger(config)
         self.db_initializer = DatabaseInitializer(config)
 
@@ -48,9 +51,13 @@ class LockdownManager:
             details=reason
         )
 
-    def verify_recovery_conditions(self) -> Tuple[bool, list]:
+    def verify_recovery_conditions(self, full_audit: bool = True) -> Tuple[bool, list]:
         """Verify conditions for recovery from lockdown.
 
+        Args:
+            full_audit: Re-verify the whole audit chain instead of only the
+                entries appended since the last checkpoint
+
         Returns:
             Tuple of (can_recover, list_of_issues)
         """
@@ -62,13 +69,10 @@ class LockdownManager:
             issues.append(f"System is not in LOCKDOWN mode (current: {mode})")
 
         # Check all escalations are acknowledged or resolved
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT COUNT(*) FROM escalations WHERE state NOT IN ('ACKNOWLEDGED', 'RESOLVED', 'EXPIRED')"
-        )
-        unacked_count = cursor.fetchone()[0]
-        conn.close()
+        conn = self.config.connection(self.config.management_db)
+        unacked_count = conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM escalation_counters WHERE state NOT IN ('ACKNOWLEDGED', 'RESOLVED', 'EXPIRED')"
+        ).fetchone()[0]
 
         if unacked_count > 0:
             issues.append(f"{unacked_count} escalation(s) not acknowledged")
@@ -80,7 +84,8 @@ class LockdownManager:
                 issues.append(f"Database integrity check failed: {db_name}.db")
 
         # Check audit log integrity
-        if not self.audit_logger.verify_integrity():
+        workers = (os.cpu_count() or 1) if full_audit else 1
+        if not self.audit_logger.verify_integrity(full=full_audit, workers=workers):
             issues.append("Audit log integrity check failed")
 
         return len(issues) == 0, issues
@@ -123,19 +128,19 @@ class LockdownManager:
         Returns:
             Dictionary with lockdown status details
         """
-        mode, updated_at, reason = self.state_manager.get_mode()
-        can_recover, issues = self.verify_recovery_conditions()
+        can_recover, issues = self.verify_recovery_conditions(full_audit=False)
 
-        # Get escalation counts
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
+        # Mode, escalation and task counts from one snapshot
+        with self.config.read_session() as conn:
+            mode, updated_at, reason = conn.execute(
+                "SELECT mode, updated_at, reason FROM system.system_mode ORDER BY id DESC LIMIT 1"
+            ).fetchone()
 
-        cursor.execute(
-            "SELECT state, COUNT(*) FROM escalations GROUP BY state"
-        )
-        escalation_counts = dict(cursor.fetchall())
+            escalation_counts = dict(conn.execute(
+                "SELECT state, SUM(count) FROM management.escalation_counters WHERE count > 0 GROUP BY state"
+            ).fetchall())
 
-        conn.close()
+            task_counts = self.queue_manager.get_queue_depths(conn)
 
         return {
             'mode': mode,
@@ -143,5 +148,6 @@ class LockdownManager:
             'reason': reason,
             'can_recover': can_recover,
             'recovery_issues': issues,
-            'escalation_counts': escalation_counts
+            'escalation_counts': escalation_counts,
+            'task_counts': task_counts
         }
@@ -1,22 +1,53 @@
 """Queue management for the Institute system."""
+import itertools
 import json
+import math
+import os
 import sqlite3
+import stat
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 try:
     from .config import Config
-    from .utils import ensure_parent_dir
+    from .task_handlers import DEFAULT_TASK_TYPE, validate_task_type
+    from .utils import get_current_user
 except ImportError:
     from config import Config
-    from utils import ensure_parent_dir
+    from task_handlers import DEFAULT_TASK_TYPE, validate_task_type
+    from utils import get_current_user
+
+
+class QueueFullError(RuntimeError):
+    """Raised when admission limits refuse new tasks."""
+
+    def __init__(self, reason: str, retry_after: int):
+        """Initialize queue-full error.
+
+        Args:
+            reason: Which limit was hit
+            retry_after: Seconds after which a retry may be admitted
+        """
+        super().__init__(f"queue full, retry after {retry_after} seconds ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
 
 
 class QueueManager:
     """Manages task queues and transitions."""
 
+    TASK_STATUSES = ('pending', 'processing', 'completed', 'failed')
+
+    # Task files live in queues/research/<status>/<task_id // QUEUE_SHARD_SIZE>/
+    QUEUE_SHARD_SIZE = 1000
+
+    # Suggested wait when a pending-task limit is hit; the queue drains at
+    # the speed of the processors, which admission control cannot predict
+    PENDING_LIMIT_RETRY_SECONDS = 60
+
     def __init__(self, config: Config):
         """Initialize queue manager.
 
@@ -25,61 +56,987 @@ class QueueManager:
         """
         self.config = config
 
-    def create_task(self, name: str, description: Optional[str] = None) -> int:
+    def file_mirror_enabled(self) -> bool:
+        """Check whether task JSON files are mirrored into the queue directories.
+
+        The queue itself lives in research.db; the pending/processing/
+        completed/failed directories are only kept up to date for tools that
+        still read them (config key 'queue_file_mirror').
+
+        Returns:
+            True if the file mirror is enabled
+        """
+        return self.config.get_config_value('queue_file_mirror', 'false').lower() == 'true'
+
+    def create_task(self, name: str, description: Optional[str] = None, priority: int = 0,
+                    task_type: str = DEFAULT_TASK_TYPE, params: Optional[dict] = None,
+                    max_attempts: Optional[int] = None, depends_on: Iterable[int] = (),
+                    cacheable: bool = False) -> int:
         """Create a new research task.
 
         Args:
             name: Task name
             description: Task description (optional)
+            priority: Scheduling priority; higher runs first (default 0)
+            task_type: Handler type that executes the task (default 'noop')
+            params: JSON-serializable parameters passed to the handler
+            max_attempts: Attempts before the task is dead-lettered
+                (default: 'task_max_attempts' config value)
+            depends_on: IDs of tasks that must complete before this one runs
+            cacheable: Reuse the outputs of an identical earlier task (same
+                type, params and input files) instead of running
 
         Returns:
             Task ID
+
+        Raises:
+            ValueError: If the task type, params or max_attempts is invalid,
+                or a dependency is unknown or dead-lettered
+            QueueFullError: If an admission limit refuses the task
+        """
+        validate_task_type(task_type)
+        params_json = self._encode_params(params)
+        if max_attempts is None:
+            max_attempts = self.default_max_attempts()
+        elif max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        submitted_by = self.submitter()
+
+        # Insert into database; the write lock keeps the admission check exact
+        with self.config.transaction(self.config.research_db, immediate=True) as conn:
+            self._check_pending_limits(conn, submitted_by, 1)
+            self._take_submission_tokens(conn, submitted_by, 1)
+            cursor = conn.execute(
+                """INSERT INTO tasks (name, description, status, priority, type, params, max_attempts, cacheable,
+                                      submitted_by)
+                   VALUES (?, ?, 'pending', ?, ?, ?, ?, ?, ?)""",
+                (name, description, priority, task_type, params_json, max_attempts, int(cacheable), submitted_by)
+            )
+            task_id = cursor.lastrowid
+            self._add_dependencies(conn, [(task_id, parent) for parent in depends_on], task_id, task_id)
+
+        if self.file_mirror_enabled():
+            self.write_task_file(task_id, {
+                'id': task_id,
+                'name': name,
+                'description': description,
+                'priority': priority,
+                'type': task_type,
+                'params': params,
+                'depends_on': list(depends_on),
+                'created_at': datetime.now().isoformat()
+            })
+
+        return task_id
+
+    def create_tasks(self, tasks: Iterable[dict]) -> range:
+        """Create many research tasks in a single transaction.
+
+        Rows are streamed from the iterable into executemany, so the input
+        is never held in memory (unless the file mirror is enabled). Either
+        every task is created or, on a validation error, none is.
+
+        'depends_on' lists existing task IDs and/or the 'key' strings of
+        other tasks in the same batch, so a whole pipeline can be submitted
+        at once; dependency cycles are rejected.
+
+        Args:
+            tasks: Iterable of dicts with 'name' and optional 'description',
+                'priority', 'type', 'params', 'max_attempts', 'cache', 'key'
+                and 'depends_on'
+
+        Returns:
+            Range of the created task IDs (IDs are contiguous)
+
+        Raises:
+            ValueError: If a task has no name or an invalid field
+            QueueFullError: If an admission limit refuses the batch
+        """
+        mirror = self.file_mirror_enabled()
+        submitted_by = self.submitter()
+        max_attempts = self.default_max_attempts()
+        keys = {}
+        references = []
+
+        def task_rows():
+            for index, task in enumerate(tasks, 1):
+                row = self._task_row(index, task, max_attempts)
+                key = task.get('key')
+                if key is not None:
+                    if not isinstance(key, str) or key in keys:
+                        raise ValueError(f"Task #{index}: 'key' must be a unique string")
+                    keys[key] = index
+                references.extend((index, parent) for parent in self._dependency_refs(index, task))
+                yield row + (submitted_by,)
+
+        rows = task_rows()
+        if mirror:
+            rows = list(rows)
+
+        # The write lock keeps the AUTOINCREMENT ids of this batch contiguous
+        with self.config.transaction(self.config.research_db, immediate=True) as conn:
+            # Refuse up front if the queue is already full; the batch size is
+            # only known once the rows have been streamed in
+            self._check_pending_limits(conn, submitted_by, 1)
+            first_id = self._last_task_id(conn) + 1
+            conn.executemany(
+                """INSERT INTO tasks (name, description, status, priority, type, params, max_attempts, cacheable,
+                                      submitted_by)
+                   VALUES (?, ?, 'pending', ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            task_ids = range(first_id, self._last_task_id(conn) + 1)
+            self._check_pending_limits(conn, submitted_by, 0)
+            self._take_submission_tokens(conn, submitted_by, len(task_ids))
+
+            edges = []
+            for index, parent in references:
+                if isinstance(parent, str):
+                    if parent not in keys:
+                        raise ValueError(f"Task #{index}: depends on unknown key {parent!r}")
+                    parent = first_id + keys[parent] - 1
+                edges.append((first_id + index - 1, parent))
+            self._add_dependencies(conn, edges, first_id, task_ids.stop - 1)
+
+        if mirror:
+            created_at = datetime.now().isoformat()
+            for task_id, (name, description, priority, task_type, params_json, *_) in zip(task_ids, rows):
+                self.write_task_file(task_id, {
+                    'id': task_id,
+                    'name': name,
+                    'description': description,
+                    'priority': priority,
+                    'type': task_type,
+                    'params': self._decode_params(params_json),
+                    'created_at': created_at
+                })
+
+        return task_ids
+
+    def _task_row(self, index: int, task: dict, default_max_attempts: int) -> tuple:
+        """Validate a task dict and convert it to an INSERT row.
+
+        Args:
+            index: 1-based position of the task in its batch
+            task: Task dict
+            default_max_attempts: max_attempts for tasks that do not set it
+
+        Returns:
+            Tuple of (name, description, priority, type, params JSON,
+            max_attempts, cacheable)
+
+        Raises:
+            ValueError: If the task has no name or an invalid field
         """
-        # Insert into database
-        conn = sqlite3.connect(str(self.config.research_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO tasks (name, description, status) VALUES (?, ?, 'pending')",
-            (name, description)
+        if not isinstance(task, dict) or not task.get('name'):
+            raise ValueError(f"Task #{index}: 'name' is required")
+        priority = task.get('priority', 0)
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            raise ValueError(f"Task #{index}: 'priority' must be an integer")
+        max_attempts = task.get('max_attempts', default_max_attempts)
+        if not isinstance(max_attempts, int) or isinstance(max_attempts, bool) or max_attempts < 1:
+            raise ValueError(f"Task #{index}: 'max_attempts' must be a positive integer")
+        cacheable = task.get('cache', False)
+        if not isinstance(cacheable, bool):
+            raise ValueError(f"Task #{index}: 'cache' must be true or false")
+        try:
+            task_type = validate_task_type(task.get('type', DEFAULT_TASK_TYPE))
+            params_json = self._encode_params(task.get('params'))
+        except ValueError as e:
+            raise ValueError(f"Task #{index}: {e}")
+        return task['name'], task.get('description'), priority, task_type, params_json, max_attempts, int(cacheable)
+
+    def _dependency_refs(self, index: int, task: dict) -> list:
+        """Validate a task dict's 'depends_on' list.
+
+        Args:
+            index: 1-based position of the task in its batch
+            task: Task dict
+
+        Returns:
+            List of task IDs and batch keys
+
+        Raises:
+            ValueError: If depends_on is not a list of IDs and keys
+        """
+        refs = task.get('depends_on', [])
+        if not isinstance(refs, list) or not all(
+                isinstance(ref, str) or (isinstance(ref, int) and not isinstance(ref, bool)) for ref in refs):
+            raise ValueError(f"Task #{index}: 'depends_on' must be a list of task IDs or keys")
+        return refs
+
+    def _add_dependencies(self, conn, edges: list, first_id: int, last_id: int):
+        """Record dependency edges for newly inserted tasks and validate them.
+
+        Sets waiting_on of each new task to its number of unfinished parents.
+        Parents no longer in research.db are looked up in the archives: a
+        completed one is satisfied, a failed one failed for good. Raising
+        rolls back the enclosing transaction, tasks included.
+
+        Args:
+            conn: Connection to research.db inside a write transaction
+            edges: List of (task_id, depends_on) pairs
+            first_id: First ID of the new tasks
+            last_id: Last ID of the new tasks
+
+        Raises:
+            ValueError: If a parent does not exist, is dead-lettered or
+                failed before it was archived, or the edges form a cycle
+        """
+        if not edges:
+            return
+
+        conn.executemany("INSERT OR IGNORE INTO task_dependencies (task_id, depends_on) VALUES (?, ?)", edges)
+
+        def position(task_id):
+            return task_id - first_id + 1
+
+        rows = conn.execute(
+            """SELECT d.task_id, d.depends_on, t.id IS NULL
+               FROM task_dependencies d
+               LEFT JOIN tasks t ON t.id = d.depends_on
+               LEFT JOIN dead_letter dl ON dl.task_id = d.depends_on
+               WHERE d.task_id BETWEEN ? AND ? AND (t.id IS NULL OR dl.task_id IS NOT NULL)
+               ORDER BY d.task_id, d.depends_on""",
+            (first_id, last_id)
+        ).fetchall()
+        archived = {}
+        for task_id, parent, missing in rows:
+            if missing:
+                if parent not in archived:
+                    archived[parent] = self.get_task_status(parent)
+                if archived[parent] is None:
+                    raise ValueError(f"Task #{position(task_id)}: depends on unknown task {parent}")
+                if archived[parent]['status'] == 'completed':
+                    # Not counted in waiting_on below, which joins live tasks only
+                    continue
+                raise ValueError(f"Task #{position(task_id)}: depends on failed task {parent}")
+            raise ValueError(f"Task #{position(task_id)}: depends on dead-lettered task {parent}")
+
+        # Existing tasks never gain edges, so any cycle runs through a new task
+        row = conn.execute(
+            """WITH RECURSIVE ancestors(start, id) AS (
+                   SELECT task_id, depends_on FROM task_dependencies
+                   WHERE task_id BETWEEN ? AND ?
+                   UNION
+                   SELECT ancestors.start, d.depends_on
+                   FROM ancestors JOIN task_dependencies d ON d.task_id = ancestors.id
+               )
+               SELECT start FROM ancestors WHERE start = id LIMIT 1""",
+            (first_id, last_id)
+        ).fetchone()
+        if row:
+            raise ValueError(f"Task #{position(row[0])}: dependency cycle")
+
+        conn.execute(
+            """UPDATE tasks SET waiting_on = (
+                   SELECT COUNT(*) FROM task_dependencies d JOIN tasks p ON p.id = d.depends_on
+                   WHERE d.task_id = tasks.id AND p.status != 'completed'
+               )
+               WHERE id IN (SELECT task_id FROM task_dependencies WHERE task_id BETWEEN ? AND ?)""",
+            (first_id, last_id)
         )
-        task_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-
-        # Create task file in pending queue
-        task_file = self.config.queues_research_pending / f"{task_id}.json"
-        task_data = {
-            'id': task_id,
-            'name': name,
-            'description': description,
-            'created_at': datetime.now().isoformat()
+
+    def submitter(self) -> str:
+        """Get the user that new tasks are submitted as.
+
+        Returns:
+            The CLI's current user, else the Unix user running this process
+        """
+        return self.config.current_user or get_current_user()
+
+    def _check_pending_limits(self, conn: sqlite3.Connection, submitted_by: str, incoming: int):
+        """Enforce the global and per-user limits on pending tasks.
+
+        Reads the trigger-maintained counters, so the check costs two
+        primary-key lookups however long the queue is.
+
+        Args:
+            conn: research.db connection inside the creating transaction
+            submitted_by: Submitting user
+            incoming: Tasks about to be inserted (0 if they already are)
+
+        Raises:
+            QueueFullError: If 'task_max_pending' or
+                'task_max_pending_per_user' would be exceeded (0 disables
+                either limit)
+        """
+        max_pending = int(self.config.get_config_value('task_max_pending', '0'))
+        if max_pending:
+            row = conn.execute("SELECT count FROM task_counters WHERE status = 'pending'").fetchone()
+            pending = row[0] if row else 0
+            if pending + incoming > max_pending:
+                raise QueueFullError(f"{max_pending} pending tasks allowed", self.PENDING_LIMIT_RETRY_SECONDS)
+
+        max_per_user = int(self.config.get_config_value('task_max_pending_per_user', '0'))
+        if max_per_user:
+            row = conn.execute(
+                "SELECT pending FROM user_task_counters WHERE submitted_by = ?", (submitted_by,)
+            ).fetchone()
+            pending = row[0] if row else 0
+            if pending + incoming > max_per_user:
+                raise QueueFullError(
+                    f"{max_per_user} pending tasks allowed per user", self.PENDING_LIMIT_RETRY_SECONDS
+                )
+
+    def _take_submission_tokens(self, conn: sqlite3.Connection, submitted_by: str, count: int):
+        """Charge new tasks to the submitter's token bucket.
+
+        The bucket holds up to 'task_submit_burst' tokens and refills at
+        'task_submit_rate' tokens per second; each task costs one. Its
+        state is kept in research.db so limits hold across processes.
+
+        Args:
+            conn: research.db connection inside the creating transaction
+            submitted_by: Submitting user
+            count: Number of tasks submitted
+
+        Raises:
+            ValueError: If count is more than a full bucket holds
+            QueueFullError: If the bucket has too few tokens left
+        """
+        rate = float(self.config.get_config_value('task_submit_rate', '0'))
+        if rate <= 0:
+            return
+        burst = int(self.config.get_config_value('task_submit_burst', '1000'))
+        if count > burst:
+            raise ValueError(f"{count} tasks exceed the submission burst limit ({burst}); split the batch")
+
+        now = time.time()
+        row = conn.execute(
+            "SELECT tokens, updated_at FROM submission_buckets WHERE submitted_by = ?", (submitted_by,)
+        ).fetchone()
+        tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+        if tokens < count:
+            raise QueueFullError(
+                f"{rate:g} submissions per second allowed", math.ceil((count - tokens) / rate)
+            )
+
+        conn.execute(
+            """INSERT INTO submission_buckets (submitted_by, tokens, updated_at) VALUES (?, ?, ?)
+               ON CONFLICT (submitted_by) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at""",
+            (submitted_by, tokens - count, now)
+        )
+
+    def default_max_attempts(self) -> int:
+        """Get the max_attempts given to new tasks.
+
+        Returns:
+            'task_max_attempts' config value (at least 1)
+        """
+        return max(1, int(self.config.get_config_value('task_max_attempts', '3')))
+
+    def _encode_params(self, params: Optional[dict]) -> Optional[str]:
+        """Serialize task parameters for the params column.
+
+        Args:
+            params: Parameter dict or None
+
+        Returns:
+            JSON text, or None if there are no parameters
+
+        Raises:
+            ValueError: If params is not a JSON-serializable dict
+        """
+        if params is None:
+            return None
+        if not isinstance(params, dict):
+            raise ValueError("'params' must be a JSON object")
+        try:
+            return json.dumps(params, sort_keys=True)
+        except TypeError as e:
+            raise ValueError(f"'params' is not JSON-serializable: {e}")
+
+    def _decode_params(self, params_json: Optional[str]) -> dict:
+        """Deserialize the params column.
+
+        Args:
+            params_json: JSON text or None
+
+        Returns:
+            Parameter dict (empty if the task has none)
+        """
+        return json.loads(params_json) if params_json else {}
+
+    def _last_task_id(self, conn) -> int:
+        """Get the last AUTOINCREMENT id handed out for tasks.
+
+        Args:
+            conn: Connection to research.db
+
+        Returns:
+            Last task ID, or 0 if no task was ever created
+        """
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()
+        return row[0] if row else 0
+
+    def queue_dir(self, status: str) -> Path:
+        """Get the queue directory for a status.
+
+        Args:
+            status: Queue (pending, processing, completed, failed)
+
+        Returns:
+            Path to queues/research/<status>/
+        """
+        status_to_dir = {
+            'pending': self.config.queues_research_pending,
+            'processing': self.config.queues_research_processing,
+            'completed': self.config.queues_research_completed,
+            'failed': self.config.queues_research_failed
         }
+        return status_to_dir[status]
+
+    def task_file(self, task_id: int, status: str) -> Path:
+        """Get the path of a task's JSON file in a queue directory.
+
+        Files are sharded into subdirectories of QUEUE_SHARD_SIZE task IDs
+        so that no directory grows past a few thousand entries.
+
+        Args:
+            task_id: Task ID
+            status: Queue (pending, processing, completed, failed)
+
+        Returns:
+            Path to queues/research/<status>/<task_id // 1000>/<task_id>.json
+        """
+        return self.queue_dir(status) / str(task_id // self.QUEUE_SHARD_SIZE) / f"{task_id}.json"
+
+    def find_task_file(self, task_id: int, status: str) -> Optional[Path]:
+        """Find a task's JSON file, in its shard or the pre-shard flat layout.
+
+        Args:
+            task_id: Task ID
+            status: Queue (pending, processing, completed, failed)
+
+        Returns:
+            Path to the file, or None if the task has no file in this queue
+        """
+        for task_file in (self.task_file(task_id, status), self.queue_dir(status) / f"{task_id}.json"):
+            if task_file.exists():
+                return task_file
+        return None
+
+    def _scan_task_files(self, directory: Path) -> Iterator[tuple]:
+        """Scan one directory for task files.
+
+        Args:
+            directory: Queue directory or shard
+
+        Yields:
+            (task_id, path) for each <task_id>.json file
+        """
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    stem, _, suffix = entry.name.partition('.')
+                    if suffix == 'json' and stem.isdigit() and entry.is_file(follow_symlinks=False):
+                        yield int(stem), Path(entry.path)
+        except FileNotFoundError:
+            return
+
+    def migrate_queue_layout(self, batch_size: int = 1000) -> int:
+        """Move task files from the flat queue layout into shards.
+
+        Each round scans at most batch_size files, closes the scan and then
+        moves them, so the migration runs in bounded memory on directories
+        of any size and can be interrupted and rerun.
+
+        Args:
+            batch_size: Files moved per round
+
+        Returns:
+            Number of files moved
+        """
+        moved = 0
+        for status in self.TASK_STATUSES:
+            while True:
+                scan = self._scan_task_files(self.queue_dir(status))
+                batch = list(itertools.islice(scan, batch_size))
+                scan.close()
+                if not batch:
+                    break
+
+                for task_id, path in batch:
+                    dest = self.task_file(task_id, status)
+                    self._ensure_shard(dest)
+                    os.replace(path, dest)
+                moved += len(batch)
+
+        return moved
+
+    def _ensure_shard(self, task_file: Path):
+        """Create the shard directory of a queue file if it is missing.
+
+        New shards are made group-writable like the queue directories (whose
+        setgid bit gives them the shared group), so every role can move
+        files in and out of a shard whoever created it.
 
-        ensure_parent_dir(task_file)
+        Args:
+            task_file: Path from task_file()
+        """
+        shard = task_file.parent
+        try:
+            shard.mkdir(parents=True)
+        except FileExistsError:
+            return
+        os.chmod(shard, shard.stat().st_mode | stat.S_IWGRP)
+
+    def write_task_file(self, task_id: int, task_data: dict):
+        """Write a task's JSON file into the pending queue directory.
+
+        Args:
+            task_id: Task ID
+            task_data: Task data to serialize
+        """
+        task_file = self.task_file(task_id, 'pending')
+        self._ensure_shard(task_file)
         with open(task_file, 'w') as f:
             json.dump(task_data, f, indent=2)
 
-        return task_id
+    def claim_next_task(self, worker_id: str, lease_seconds: int) -> Optional[dict]:
+        """Atomically claim a task under a lease.
+
+        Failed tasks whose retry is due are first moved back to 'pending'.
+        Tasks whose lease has expired (their worker died mid-task) are
+        reclaimed next, or dead-lettered if that was their last attempt;
+        every claim counts as an attempt, and the findings of earlier
+        attempts are deleted so the new one starts clean. Otherwise the ready
+        task (pending, with every dependency completed) with the highest
+        effective priority is taken, oldest first within a priority (see
+        _next_ready_task): waiting raises a task's priority, so a steady
+        stream of urgent work cannot starve it, but only by a bounded amount,
+        so urgent work still overtakes an aged backlog. The task is switched
+        to 'processing' by a single UPDATE ... RETURNING inside a write
+        transaction, so concurrent workers never receive the same task.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            lease_seconds: How long the claim is valid without renewal
+
+        Returns:
+            Task data dictionary (with 'reclaimed_from' set to the previous
+            worker for reclaimed tasks), or None if no task is available
+        """
+        aging_minutes = float(self.config.get_config_value('task_aging_minutes', '60'))
+        max_boost = int(self.config.get_config_value('task_aging_max_boost', '5'))
+
+        with self.config.transaction(self.config.research_db, immediate=True) as conn:
+            # Seeks the partial idx_tasks_retry, which holds only waiting retries
+            conn.execute(
+                """UPDATE tasks SET status = 'pending', next_attempt_at = NULL, updated_at = datetime('now')
+                   WHERE next_attempt_at <= datetime('now')"""
+            )
+
+            while True:
+                expired = conn.execute(
+                    """SELECT id, claimed_by, attempts, max_attempts FROM tasks
+                       WHERE status = 'processing' AND lease_expires_at < datetime('now')
+                       ORDER BY lease_expires_at LIMIT 1"""
+                ).fetchone()
+                if expired is None or expired[2] < expired[3]:
+                    break
+                self._dead_letter(conn, expired[0], f"Lease of {expired[1]} expired on the last attempt")
+
+            if expired:
+                task_id, reclaimed_from = expired[:2]
+            else:
+                task_id = self._next_ready_task(conn, aging_minutes, max_boost)
+                if task_id is None:
+                    return None
+                reclaimed_from = None
+
+            row = conn.execute(
+                """UPDATE tasks
+                   SET status = 'processing', claimed_by = ?, attempts = attempts + 1,
+                       lease_expires_at = datetime('now', ?), updated_at = datetime('now')
+                   WHERE id = ?
+                   RETURNING id, name, description, created_at, priority, type, params,
+                             attempts, max_attempts, cacheable""",
+                (worker_id, f"+{int(lease_seconds)} seconds", task_id)
+            ).fetchone()
+            # Findings batches written before an earlier attempt failed
+            conn.execute("DELETE FROM findings WHERE task_id = ?", (task_id,))
+
+        return {
+            'id': row[0],
+            'name': row[1],
+            'description': row[2],
+            'created_at': row[3],
+            'priority': row[4],
+            'type': row[5],
+            'params': self._decode_params(row[6]),
+            'attempts': row[7],
+            'max_attempts': row[8],
+            'cacheable': bool(row[9]),
+            'reclaimed_from': reclaimed_from
+        }
+
+    def _next_ready_task(self, conn, aging_minutes: float, max_boost: int) -> Optional[int]:
+        """Find the ready task with the highest effective priority.
+
+        A task's effective priority is its priority plus one for every
+        'task_aging_minutes' it has been pending, up to 'task_aging_max_boost'.
+        Within a priority the oldest task has the largest boost, so only the
+        oldest task of each priority is a candidate, and priorities more than
+        max_boost below the best candidate cannot win. The search therefore
+        makes at most max_boost + 1 seeks of idx_tasks_schedule, however
+        long the queue is.
+
+        Args:
+            conn: Connection to research.db inside the claiming transaction
+            aging_minutes: Minutes of waiting per priority step (0 disables aging)
+            max_boost: Largest priority increase from waiting
+
+        Returns:
+            Task ID, or None if no task is ready
+        """
+        if aging_minutes > 0 and max_boost > 0:
+            effective = "priority + MIN(?, (julianday('now') - julianday(created_at)) * 1440 / ?)"
+            boost_params = [max_boost, aging_minutes]
+        else:
+            effective, boost_params, max_boost = "priority", [], 0
+
+        best_id, best = None, None
+        below = []
+        while True:
+            row = conn.execute(
+                f"""SELECT id, priority, {effective} FROM tasks
+                    WHERE status = 'pending' AND waiting_on = 0 {'AND priority < ?' if below else ''}
+                    ORDER BY priority DESC, id LIMIT 1""",
+                boost_params + below
+            ).fetchone()
+            if row is None:
+                return best_id
+
+            # Ties go to the higher base priority, which is seen first
+            if best is None or row[2] > best:
+                best_id, best = row[0], row[2]
+            if row[1] + max_boost <= best:
+                return best_id
+            below = [row[1]]
+
+    def fail_task(self, task_id: int, error_message: str, worker_id: str) -> Optional[dict]:
+        """Record a failed attempt and schedule a retry or dead-letter the task.
+
+        A task with attempts left stays 'failed' with next_attempt_at set,
+        after an exponential backoff of 'task_retry_base_seconds' doubled per
+        attempt and capped at 'task_retry_max_seconds'; claim_next_task moves
+        it back to 'pending' once that time has passed. A task that failed its
+        last attempt is added to the dead_letter table instead.
+
+        Args:
+            task_id: Task ID
+            error_message: Why the attempt failed
+            worker_id: Only record the failure if this worker holds the lease
+
+        Returns:
+            Dict with 'attempts', 'max_attempts', 'next_attempt_at',
+            'dead_lettered' and 'dependents_failed' (IDs of tasks failed
+            because they depend on this one), or None if the lease was lost
+        """
+        base_seconds = float(self.config.get_config_value('task_retry_base_seconds', '60'))
+        max_seconds = float(self.config.get_config_value('task_retry_max_seconds', '3600'))
+
+        with self.config.transaction(self.config.research_db, immediate=True) as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM tasks WHERE id = ? AND claimed_by = ? AND status = 'processing'",
+                (task_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+
+            attempts, max_attempts = row
+            if attempts >= max_attempts:
+                dependents = self._dead_letter(conn, task_id, error_message)
+                return {
+                    'attempts': attempts,
+                    'max_attempts': max_attempts,
+                    'next_attempt_at': None,
+                    'dead_lettered': True,
+                    'dependents_failed': dependents
+                }
+
+            delay = min(base_seconds * 2 ** (attempts - 1), max_seconds)
+            next_attempt_at = conn.execute(
+                """UPDATE tasks
+                   SET status = 'failed', error_message = ?, lease_expires_at = NULL,
+                       next_attempt_at = datetime('now', ?), updated_at = datetime('now')
+                   WHERE id = ?
+                   RETURNING next_attempt_at""",
+                (error_message, f"+{int(delay)} seconds", task_id)
+            ).fetchone()[0]
+
+        return {
+            'attempts': attempts,
+            'max_attempts': max_attempts,
+            'next_attempt_at': next_attempt_at,
+            'dead_lettered': False,
+            'dependents_failed': []
+        }
+
+    def release_task(self, task_id: int, worker_id: str) -> bool:
+        """Return a claimed task to 'pending' without charging an attempt.
+
+        Args:
+            task_id: Task ID
+            worker_id: Only release the task if this worker holds the lease
+
+        Returns:
+            True if the task was released, False if the lease was lost
+        """
+        with self.config.transaction(self.config.research_db) as conn:
+            cursor = conn.execute(
+                """UPDATE tasks
+                   SET status = 'pending', attempts = attempts - 1, claimed_by = NULL,
+                       lease_expires_at = NULL, updated_at = datetime('now')
+                   WHERE id = ? AND claimed_by = ? AND status = 'processing'""",
+                (task_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def _dead_letter(self, conn, task_id: int, error_message: str) -> list:
+        """Fail a task for good and add it to the dead_letter table.
+
+        Every task that depends on it, directly or transitively, can never
+        run and is dead-lettered with it.
+
+        Args:
+            conn: Connection to research.db inside a write transaction
+            task_id: Task ID
+            error_message: Why the last attempt failed
+
+        Returns:
+            IDs of the dependent tasks that were failed
+        """
+        attempts = conn.execute(
+            """UPDATE tasks
+               SET status = 'failed', error_message = ?, lease_expires_at = NULL,
+                   next_attempt_at = NULL, updated_at = datetime('now')
+               WHERE id = ?
+               RETURNING attempts""",
+            (error_message, task_id)
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT OR REPLACE INTO dead_letter (task_id, attempts, error_message) VALUES (?, ?, ?)",
+            (task_id, attempts, error_message)
+        )
+
+        dependents = [row[0] for row in conn.execute(
+            """WITH RECURSIVE dependents(id) AS (
+                   SELECT task_id FROM task_dependencies WHERE depends_on = ?
+                   UNION
+                   SELECT d.task_id FROM task_dependencies d JOIN dependents ON d.depends_on = dependents.id
+               )
+               SELECT id FROM dependents WHERE id NOT IN (SELECT task_id FROM dead_letter)""",
+            (task_id,)
+        )]
+        dependency_error = f"Dependency task {task_id} failed"
+        conn.executemany(
+            """UPDATE tasks
+               SET status = 'failed', error_message = ?, next_attempt_at = NULL, updated_at = datetime('now')
+               WHERE id = ?""",
+            ((dependency_error, dependent) for dependent in dependents)
+        )
+        conn.executemany(
+            """INSERT INTO dead_letter (task_id, attempts, error_message)
+               SELECT id, attempts, error_message FROM tasks WHERE id = ?""",
+            ((dependent,) for dependent in dependents)
+        )
+        return dependents
+
+    def list_dead_letters(self) -> list:
+        """List tasks that exhausted their retries.
+
+        Returns:
+            List of dicts with task_id, name, attempts, error_message and
+            created_at (when the task was dead-lettered), newest first
+        """
+        conn = self.config.connection(self.config.research_db)
+        rows = conn.execute(
+            """SELECT d.task_id, t.name, d.attempts, d.error_message, d.created_at
+               FROM dead_letter d JOIN tasks t ON t.id = d.task_id
+               ORDER BY d.created_at DESC, d.task_id DESC"""
+        ).fetchall()
+
+        return [
+            {
+                'task_id': row[0],
+                'name': row[1],
+                'attempts': row[2],
+                'error_message': row[3],
+                'created_at': row[4]
+            }
+            for row in rows
+        ]
+
+    def requeue_task(self, task_id: int) -> list:
+        """Give a dead-lettered task a fresh set of attempts.
+
+        The tasks that were dead-lettered with it because they depend on it
+        are requeued too, except those that also depend on another task
+        that failed for good. Every requeued task's waiting_on is recomputed
+        from task_dependencies, so dependents wait for their parents again.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            IDs of the requeued tasks, task_id first, or an empty list if the
+            task is not dead-lettered
+
+        Raises:
+            ValueError: If the task depends on a task that failed for good;
+                that task has to be requeued instead
+        """
+        with self.config.transaction(self.config.research_db, immediate=True) as conn:
+            if conn.execute("SELECT 1 FROM dead_letter WHERE task_id = ?", (task_id,)).fetchone() is None:
+                return []
+
+            parent = self._failed_parent(conn, task_id, ())
+            if parent is not None:
+                raise ValueError(f"Task {task_id} depends on failed task {parent}; requeue that task instead")
+
+            requeued = {task_id}
+            requeued.update(row[0] for row in conn.execute(
+                """WITH RECURSIVE dependents(id) AS (
+                       SELECT task_id FROM task_dependencies
+                       WHERE depends_on = ? AND task_id IN (SELECT task_id FROM dead_letter)
+                       UNION
+                       SELECT d.task_id FROM task_dependencies d JOIN dependents ON d.depends_on = dependents.id
+                       WHERE d.task_id IN (SELECT task_id FROM dead_letter)
+                   )
+                   SELECT id FROM dependents""",
+                (task_id,)
+            ))
+
+            # Leave out dependents that still wait on another failed task,
+            # and with them everything downstream of them
+            while True:
+                blocked = {dependent for dependent in requeued - {task_id}
+                           if self._failed_parent(conn, dependent, requeued) is not None}
+                if not blocked:
+                    break
+                requeued -= blocked
+
+            task_ids = [task_id] + sorted(requeued - {task_id})
+            conn.executemany("DELETE FROM dead_letter WHERE task_id = ?", ((i,) for i in task_ids))
+            conn.executemany(
+                """UPDATE tasks
+                   SET status = 'pending', attempts = 0, error_message = NULL, claimed_by = NULL,
+                       lease_expires_at = NULL, next_attempt_at = NULL, updated_at = datetime('now')
+                   WHERE id = ?""",
+                ((i,) for i in task_ids)
+            )
+            conn.executemany(
+                """UPDATE tasks SET waiting_on = (
+                       SELECT COUNT(*) FROM task_dependencies d JOIN tasks p ON p.id = d.depends_on
+                       WHERE d.task_id = tasks.id AND p.status != 'completed'
+                   )
+                   WHERE id = ?""",
+                ((i,) for i in task_ids)
+            )
+
+        return task_ids
+
+    def _failed_parent(self, conn, task_id: int, excluded: Iterable[int]) -> Optional[int]:
+        """Find a parent of a task that failed with no retry left.
+
+        Args:
+            conn: Connection to research.db inside a write transaction
+            task_id: Task ID
+            excluded: Parents to ignore (tasks being requeued together)
+
+        Returns:
+            ID of such a parent, or None
+        """
+        rows = conn.execute(
+            """SELECT d.depends_on, p.status, p.next_attempt_at
+               FROM task_dependencies d LEFT JOIN tasks p ON p.id = d.depends_on
+               WHERE d.task_id = ?""",
+            (task_id,)
+        ).fetchall()
+
+        for parent, status, next_attempt_at in rows:
+            if parent in excluded:
+                continue
+            if status is None:
+                # Only finished tasks are archived
+                archived = self.get_task_status(parent)
+                if archived is None or archived['status'] != 'completed':
+                    return parent
+            elif status == 'failed' and next_attempt_at is None:
+                return parent
+        return None
+
+    def seconds_until_next_retry(self) -> Optional[float]:
+        """Get the time until the earliest scheduled retry is due.
+
+        Returns:
+            Seconds (0 if one is already due), or None if no retry is scheduled
+        """
+        conn = self.config.connection(self.config.research_db)
+        row = conn.execute(
+            """SELECT (julianday(MIN(next_attempt_at)) - julianday('now')) * 86400
+               FROM tasks WHERE next_attempt_at IS NOT NULL"""
+        ).fetchone()
+        return None if row[0] is None else max(0.0, row[0])
+
+    def mark_cache_hit(self, task_id: int):
+        """Record that a task's outputs were served from the result cache.
+
+        Args:
+            task_id: Task ID
+        """
+        with self.config.transaction(self.config.research_db) as conn:
+            conn.execute("UPDATE tasks SET cache_hit = 1 WHERE id = ?", (task_id,))
+
+    def renew_leases(self, worker_id: str, task_ids: Iterable[int], lease_seconds: int):
+        """Extend the leases a worker holds on its running tasks.
+
+        Args:
+            worker_id: Identifier of the worker holding the leases
+            task_ids: IDs of the tasks to renew
+            lease_seconds: New lease duration from now
+        """
+        with self.config.transaction(self.config.research_db) as conn:
+            conn.executemany(
+                """UPDATE tasks SET lease_expires_at = datetime('now', ?)
+                   WHERE id = ? AND claimed_by = ? AND status = 'processing'""",
+                ((f"+{int(lease_seconds)} seconds", task_id, worker_id) for task_id in task_ids)
+            )
 
     def get_task_status(self, task_id: int) -> Optional[dict]:
         """Get status of a task.
 
+        Tasks moved to an archive database are looked up there, and have
+        'archived' set.
+
         Args:
             task_id: Task ID
 
         Returns:
             Dict with task details or None if not found
         """
-        conn = sqlite3.connect(str(self.config.research_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, name, description, status, created_at, updated_at, completed_at, error_message FROM tasks WHERE id = ?",
+        conn, archived = self._task_connection(task_id)
+        if conn is None:
+            return None
+
+        row = conn.execute(
+            """SELECT id, name, description, status, created_at, updated_at, completed_at,
+                      error_message, priority, type, params, attempts, max_attempts,
+                      next_attempt_at,
+                      EXISTS (SELECT 1 FROM dead_letter WHERE task_id = tasks.id), waiting_on,
+                      cacheable, cache_hit, submitted_by
+               FROM tasks WHERE id = ?""",
             (task_id,)
-        )
-        row = cursor.fetchone()
-        conn.close()
+        ).fetchone()
 
         if row:
+            depends_on = [parent for (parent,) in conn.execute(
+                "SELECT depends_on FROM task_dependencies WHERE task_id = ? ORDER BY depends_on",
+                (task_id,)
+            )]
             return {
                 'id': row[0],
                 'name': row[1],
@@ -88,76 +1045,236 @@ class QueueManager:
                 'created_at': row[4],
                 'updated_at': row[5],
                 'completed_at': row[6],
-                'error_message': row[7]
+                'error_message': row[7],
+                'priority': row[8],
+                'type': row[9],
+                'params': self._decode_params(row[10]),
+                'attempts': row[11],
+                'max_attempts': row[12],
+                'next_attempt_at': row[13],
+                'dead_lettered': bool(row[14]),
+                'waiting_on': row[15],
+                'cacheable': bool(row[16]),
+                'cache_hit': bool(row[17]),
+                'submitted_by': row[18],
+                'depends_on': depends_on,
+                'archived': archived
             }
         return None
 
-    def list_tasks(self, status: Optional[str] = None) -> list:
-        """List tasks, optionally filtered by status.
+    def _task_connection(self, task_id: int) -> tuple:
+        """Find the database holding a task.
 
         Args:
-            status: Filter by status (optional)
+            task_id: Task ID
 
         Returns:
-            List of task dictionaries
+            Tuple of (connection, archived): research.db if the task is
+            there, else the archive database whose ID range covers it, or
+            (None, False) if neither has it
         """
-        conn = sqlite3.connect(str(self.config.research_db))
-        cursor = conn.cursor()
+        conn = self.config.connection(self.config.research_db)
+        if conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone():
+            return conn, False
+
+        months = conn.execute(
+            "SELECT month FROM archive_index WHERE ? BETWEEN min_id AND max_id ORDER BY month DESC",
+            (task_id,)
+        ).fetchall()
+        for (month,) in months:
+            archive_db = self.config.archive_db(month)
+            if not archive_db.exists():
+                continue
+            archive_conn = self.config.connection(archive_db)
+            if archive_conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone():
+                return archive_conn, True
+
+        return None, False
+
+    def get_findings(self, task_id: int, limit: int = 20, after_id: int = 0) -> list:
+        """Get one page of a task's findings, oldest first.
+
+        Pages are keyed on the finding ID (pass the last ID of the previous
+        page as after_id), so each page is an index range scan however many
+        findings the task has.
+
+        Args:
+            task_id: Task ID
+            limit: Maximum number of findings to return
+            after_id: Only return findings with a higher ID
 
+        Returns:
+            List of dicts with id, content and created_at
+        """
+        conn, _ = self._task_connection(task_id)
+        if conn is None:
+            return []
+
+        rows = conn.execute(
+            """SELECT id, content, created_at FROM findings
+               WHERE task_id = ? AND id > ?
+               ORDER BY id LIMIT ?""",
+            (task_id, after_id, limit)
+        ).fetchall()
+
+        return [{'id': row[0], 'content': row[1], 'created_at': row[2]} for row in rows]
+
+    def count_findings(self, task_id: int) -> int:
+        """Count a task's findings.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Number of findings
+        """
+        conn, _ = self._task_connection(task_id)
+        if conn is None:
+            return 0
+        return conn.execute("SELECT COUNT(*) FROM findings WHERE task_id = ?", (task_id,)).fetchone()[0]
+
+    def list_tasks(self, status: Optional[str] = None, limit: Optional[int] = None,
+                   after_id: Optional[int] = None, since: Optional[str] = None,
+                   page_size: int = 500) -> Iterator[dict]:
+        """List tasks, newest first, optionally filtered by status.
+
+        Tasks are read a page at a time, each page continuing from the
+        (created_at, id) of the last task of the previous one, so listing
+        stays an index range scan and memory use stays flat however large
+        the table is.
+
+        Args:
+            status: Filter by status (optional)
+            limit: Maximum number of tasks to yield (optional)
+            after_id: Continue a listing after this task (optional)
+            since: Only list tasks created at or after this timestamp
+                (optional)
+            page_size: Tasks fetched per query
+
+        Yields:
+            Task dictionaries
+
+        Raises:
+            LookupError: If after_id is not a known task
+        """
+        conn = self.config.connection(self.config.research_db)
+
+        conditions = []
+        params = []
         if status:
-            cursor.execute(
-                "SELECT id, name, description, status, created_at, updated_at FROM tasks WHERE status = ? ORDER BY created_at DESC",
-                (status,)
-            )
-        else:
-            cursor.execute(
-                "SELECT id, name, description, status, created_at, updated_at FROM tasks ORDER BY created_at DESC"
-            )
+            conditions.append("status = ?")
+            params.append(status)
+        if since:
+            conditions.append("created_at >= datetime(?)")
+            params.append(since)
 
-        rows = cursor.fetchall()
-        conn.close()
+        position = None
+        if after_id is not None:
+            position = conn.execute("SELECT created_at, id FROM tasks WHERE id = ?", (after_id,)).fetchone()
+            if position is None:
+                raise LookupError(f"Task not found: {after_id}")
 
-        return [
-            {
-                'id': row[0],
-                'name': row[1],
-                'description': row[2],
-                'status': row[3],
-                'created_at': row[4],
-                'updated_at': row[5]
-            }
-            for row in rows
-        ]
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_limit = page_size if remaining is None else min(page_size, remaining)
+            where = conditions + ["(created_at, id) < (?, ?)"] if position else conditions
+            rows = conn.execute(
+                f"""SELECT id, name, description, status, created_at, updated_at FROM tasks
+                    {'WHERE ' + ' AND '.join(where) if where else ''}
+                    ORDER BY created_at DESC, id DESC LIMIT ?""",
+                params + list(position or ()) + [page_limit]
+            ).fetchall()
+
+            for row in rows:
+                yield {
+                    'id': row[0],
+                    'name': row[1],
+                    'description': row[2],
+                    'status': row[3],
+                    'created_at': row[4],
+                    'updated_at': row[5]
+                }
+
+            if len(rows) < page_limit:
+                return
+            position = (rows[-1][4], rows[-1][0])
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def get_queue_depths(self, conn: Optional[sqlite3.Connection] = None) -> dict:
+        """Get the number of tasks in each status.
+
+        Counts come from task_counters, which triggers keep in step with
+        tasks, so this is constant-time however many tasks there are.
+
+        Args:
+            conn: Connection to read through, e.g. a Config.read_session()
+                with research attached (default: research.db)
+
+        Returns:
+            Dictionary of status -> count, with every status present
+        """
+        if conn is None:
+            conn = self.config.connection(self.config.research_db)
+
+        depths = dict.fromkeys(self.TASK_STATUSES, 0)
+        depths.update(conn.execute("SELECT status, count FROM task_counters").fetchall())
+        return depths
 
-    def update_task_status(self, task_id: int, status: str, error_message: Optional[str] = None):
+    def update_task_status(self, task_id: int, status: str, error_message: Optional[str] = None,
+                           worker_id: Optional[str] = None) -> bool:
         """Update task status in database.
 
         Args:
             task_id: Task ID
             status: New status
             error_message: Error message if status is 'failed'
+            worker_id: Only update if this worker still holds the task's lease
+
+        Completing a task releases the tasks that depend on it: their
+        waiting_on count drops, and at zero they become claimable.
+
+        Returns:
+            True if the task was updated, False if it does not exist, is
+            already completed, or the lease was lost to another worker
         """
-        conn = sqlite3.connect(str(self.config.research_db))
-        cursor = conn.cursor()
+        assignments = ["status = ?", "updated_at = datetime('now')"]
+        params = [status]
 
         if status == 'completed':
-            cursor.execute(
-                "UPDATE tasks SET status = ?, updated_at = datetime('now'), completed_at = datetime('now') WHERE id = ?",
-                (status, task_id)
-            )
+            # Drop the error of an earlier failed attempt
+            assignments.append("completed_at = datetime('now')")
+            assignments.append("error_message = NULL")
         elif status == 'failed':
-            cursor.execute(
-                "UPDATE tasks SET status = ?, updated_at = datetime('now'), error_message = ? WHERE id = ?",
-                (status, error_message, task_id)
-            )
-        else:
-            cursor.execute(
-                "UPDATE tasks SET status = ?, updated_at = datetime('now') WHERE id = ?",
-                (status, task_id)
-            )
+            assignments.append("error_message = ?")
+            params.append(error_message)
+
+        if status != 'processing':
+            assignments.append("lease_expires_at = NULL")
+
+        query = f"UPDATE tasks SET {', '.join(assignments)} WHERE id = ?"
+        params.append(task_id)
+
+        if status == 'completed':
+            # Completing twice would release dependents twice
+            query += " AND status != 'completed'"
 
-        conn.commit()
-        conn.close()
+        if worker_id is not None:
+            query += " AND claimed_by = ? AND status = 'processing'"
+            params.append(worker_id)
+
+        with self.config.transaction(self.config.research_db) as conn:
+            cursor = conn.execute(query, params)
+            updated = cursor.rowcount > 0
+
+            if updated and status == 'completed':
+                conn.execute(
+                    """UPDATE tasks SET waiting_on = waiting_on - 1
+                       WHERE id IN (SELECT task_id FROM task_dependencies WHERE depends_on = ?)""",
+                    (task_id,)
+                )
+
+        return updated
 
     def move_task(self, task_id: int, from_status: str, to_status: str) -> bool:
         """Move task file between queue directories.
@@ -170,22 +1287,15 @@ class QueueManager:
         Returns:
             True if successful, False otherwise
         """
-        status_to_dir = {
-            'pending': self.config.queues_research_pending,
-            'processing': self.config.queues_research_processing,
-            'completed': self.config.queues_research_completed,
-            'failed': self.config.queues_research_failed
-        }
-
-        if from_status not in status_to_dir or to_status not in status_to_dir:
+        if from_status not in self.TASK_STATUSES or to_status not in self.TASK_STATUSES:
             return False
 
-        source = status_to_dir[from_status] / f"{task_id}.json"
-        dest = status_to_dir[to_status] / f"{task_id}.json"
+        source = self.find_task_file(task_id, from_status)
+        dest = self.task_file(task_id, to_status)
 
         try:
-            if source.exists():
-                ensure_parent_dir(dest)
+            if source:
+                self._ensure_shard(dest)
                 source.rename(dest)
             return True
         except Exception:
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 """Report generator for the Institute system."""
-import sqlite3
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -10,10 +9,12 @@ from jinja2 import Environment, FileSystemLoader
 try:
     from .audit_logger import AuditLogger
     from .config import Config
+    from .queue_manager import QueueManager
     from .state_manager import StateManager
 except ImportError:
     from audit_logger import AuditLogger
     from config import Config
+    from queue_manager import QueueManager
     from state_manager import StateManager
 
 
@@ -29,6 +30,7 @@ class ReportGenerator:
         """
         self.config = config
         self.state_manager = StateManager(config)
+        self.queue_manager = QueueManager(config)
         self.audit_logger = AuditLogger(config)
 
         # Setup Jinja2 environment
@@ -118,43 +120,37 @@ class ReportGenerator:
         Returns:
             Dictionary of report data
         """
-        # System mode
-        mode, mode_updated, mode_reason = self.state_manager.get_mode()
+        # All statistics come from one snapshot across the databases
+        with self.config.read_session() as conn:
+            cursor = conn.cursor()
 
-        # Task statistics for today
-        conn = sqlite3.connect(str(self.config.research_db))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT status, COUNT(*) FROM tasks WHERE date(created_at) = date('now') GROUP BY status"
-        )
-        task_stats = dict(cursor.fetchall())
-
-        cursor.execute(
-            "SELECT COUNT(*) FROM tasks WHERE status = 'pending'"
-        )
-        pending_tasks = cursor.fetchone()[0]
+            # System mode
+            mode, mode_updated, mode_reason = cursor.execute(
+                "SELECT mode, updated_at, reason FROM system.system_mode ORDER BY id DESC LIMIT 1"
+            ).fetchone()
 
-        conn.close()
-
-        # Escalation statistics
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT COUNT(*) FROM escalations WHERE state NOT IN ('RESOLVED', 'EXPIRED')"
-        )
-        active_escalations = cursor.fetchone()[0]
+            # Task statistics for today (a range on created_at, answered from an index)
+            cursor.execute(
+                "SELECT status, COUNT(*) FROM research.tasks WHERE created_at >= date('now') GROUP BY status"
+            )
+            task_stats = dict(cursor.fetchall())
 
-        cursor.execute(
-            "SELECT level, COUNT(*) FROM escalations WHERE state NOT IN ('RESOLVED', 'EXPIRED') GROUP BY level"
-        )
-        escalation_by_level = dict(cursor.fetchall())
+            pending_tasks = self.queue_manager.get_queue_depths(conn)['pending']
 
-        conn.close()
+            # Escalation statistics, from the trigger-maintained counters
+            cursor.execute(
+                """SELECT level, SUM(count) FROM management.escalation_counters
+                   WHERE state NOT IN ('RESOLVED', 'EXPIRED') AND count > 0
+                   GROUP BY level"""
+            )
+            escalation_by_level = dict(cursor.fetchall())
+            active_escalations = sum(escalation_by_level.values())
 
-        # Recent audit events
-        recent_events = self.audit_logger.get_recent_logs(limit=20)
+            # Recent audit events
+            cursor.execute(
+                "SELECT timestamp, role, action, target, details FROM audit.log ORDER BY id DESC LIMIT 20"
+            )
+            recent_events = cursor.fetchall()
 
         return {
             'date': date.strftime('%Y-%m-%d'),
@@ -180,46 +176,42 @@ class ReportGenerator:
         """
         start_date = end_date - timedelta(days=7)
 
-        # System mode
-        mode, mode_updated, mode_reason = self.state_manager.get_mode()
-
-        # Task statistics for the week
-        conn = sqlite3.connect(str(self.config.research_db))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """SELECT status, COUNT(*)
-               FROM tasks
-               WHERE created_at >= datetime(?)
-               GROUP BY status""",
-            (start_date.isoformat(),)
-        )
-        task_stats = dict(cursor.fetchall())
+        # All statistics come from one snapshot across the databases
+        with self.config.read_session() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT COUNT(*) FROM tasks WHERE status = 'completed' AND completed_at >= datetime(?)",
-            (start_date.isoformat(),)
-        )
-        completed_this_week = cursor.fetchone()[0]
+            # System mode
+            mode = cursor.execute(
+                "SELECT mode FROM system.system_mode ORDER BY id DESC LIMIT 1"
+            ).fetchone()[0]
 
-        conn.close()
-
-        # Escalations resolved this week
-        conn = sqlite3.connect(str(self.config.management_db))
-        cursor = conn.cursor()
+            # Task statistics for the week
+            cursor.execute(
+                """SELECT status, COUNT(*)
+                   FROM research.tasks
+                   WHERE created_at >= datetime(?)
+                   GROUP BY status""",
+                (start_date.isoformat(),)
+            )
+            task_stats = dict(cursor.fetchall())
 
-        cursor.execute(
-            "SELECT COUNT(*) FROM escalations WHERE resolved_at >= datetime(?)",
-            (start_date.isoformat(),)
-        )
-        resolved_escalations = cursor.fetchone()[0]
+            cursor.execute(
+                "SELECT COUNT(*) FROM research.tasks WHERE status = 'completed' AND completed_at >= datetime(?)",
+                (start_date.isoformat(),)
+            )
+            completed_this_week = cursor.fetchone()[0]
 
-        cursor.execute(
-            "SELECT COUNT(*) FROM escalations WHERE state NOT IN ('RESOLVED', 'EXPIRED')"
-        )
-        active_escalations = cursor.fetchone()[0]
+            # Escalations resolved this week
+            cursor.execute(
+                "SELECT COUNT(*) FROM management.escalations WHERE resolved_at >= datetime(?)",
+                (start_date.isoformat(),)
+            )
+            resolved_escalations = cursor.fetchone()[0]
 
-        conn.close()
+            cursor.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM management.escalation_counters WHERE state NOT IN ('RESOLVED', 'EXPIRED')"
+            )
+            active_escalations = cursor.fetchone()[0]
 
         return {
             'start_date': start_date.strftime('%Y-%m-%d'),
@@ -239,14 +231,11 @@ class ReportGenerator:
             report_type: Type of report (daily, weekly)
             file_path: Path to generated report
         """
-        conn = sqlite3.connect(str(self.config.shared_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO reports (type, path) VALUES (?, ?)",
-            (report_type, file_path)
-        )
-        conn.commit()
-        conn.close()
+        with self.config.transaction(self.config.shared_db) as conn:
+            conn.execute(
+                "INSERT INTO reports (type, path) VALUES (?, ?)",
+                (report_type, file_path)
+            )
 
     def list_reports(self, report_type: str = None) -> list:
         """List generated reports.
@@ -257,7 +246,7 @@ class ReportGenerator:
         Returns:
             List of report records
         """
-        conn = sqlite3.connect(str(self.config.shared_db))
+        conn = self.config.connection(self.config.shared_db)
         cursor = conn.cursor()
 
         if report_type:
@@ -271,7 +260,6 @@ class ReportGenerator:
             )
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
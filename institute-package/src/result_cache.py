@@ -0,0 +1,218 @@
+"""Content-addressed task result cache for the Institute system.
+
+A cache key is the SHA-256 of a task's type, its params and the digests of
+the input files it names in params['inputs'] (paths relative to
+research/data). Outputs of a successful cacheable task are copied to
+research/outputs/.cache/<key>/; a later task with the same key gets a copy
+of them, and of the original task's findings, instead of running.
+"""
+import hashlib
+import json
+import shutil
+import uuid
+from pathlib import Path
+
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
+
+class ResultCache:
+    """Stores and looks up task outputs by content hash."""
+
+    # Bytes read at a time when hashing an input file
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, config: Config):
+        """Initialize result cache.
+
+        Args:
+            config: System configuration
+        """
+        self.config = config
+
+    def max_bytes(self) -> int:
+        """Get the cache size limit.
+
+        Returns:
+            'result_cache_max_mb' in bytes; 0 means the cache is disabled
+        """
+        return int(self.config.get_config_value('result_cache_max_mb', '1024')) * 1024 * 1024
+
+    def key(self, task_data: dict) -> str:
+        """Compute the cache key of a task.
+
+        Args:
+            task_data: Task data dictionary with 'type' and 'params'
+
+        Returns:
+            Hex SHA-256 digest
+
+        Raises:
+            ValueError: If an input is malformed, outside research/data or
+                missing
+        """
+        params = task_data['params']
+        inputs = params.get('inputs', [])
+        if not isinstance(inputs, list) or not all(isinstance(name, str) for name in inputs):
+            raise ValueError("params 'inputs' must be a list of paths under research/data")
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps([task_data['type'], params], sort_keys=True).encode())
+
+        for name in sorted(inputs):
+            digest.update(f"\0{name}\0{self.file_digest(name)}".encode())
+
+        return digest.hexdigest()
+
+    def file_digest(self, name: str) -> str:
+        """Get the SHA-256 of an input file under research/data.
+
+        Digests are remembered in research.db by path, size and mtime, so
+        an unchanged file is hashed only once.
+
+        Args:
+            name: Path relative to research/data
+
+        Returns:
+            Hex SHA-256 digest of the file contents
+
+        Raises:
+            ValueError: If the path is outside research/data or not a file
+        """
+        data_dir = self.config.research_data_dir.resolve()
+        path = (data_dir / name).resolve()
+        if not path.is_relative_to(data_dir) or not path.is_file():
+            raise ValueError(f"Input is not a file under {self.config.research_data_dir}: {name}")
+
+        stat = path.stat()
+        conn = self.config.connection(self.config.research_db)
+        row = conn.execute(
+            "SELECT sha256 FROM input_digests WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (str(path), stat.st_size, stat.st_mtime_ns)
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(self.HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+
+        with self.config.transaction(self.config.research_db) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO input_digests (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                (str(path), stat.st_size, stat.st_mtime_ns, sha256)
+            )
+        return sha256
+
+    def fetch(self, key: str, task_id: int, output_dir: Path) -> bool:
+        """Copy cached outputs and findings to a task.
+
+        Args:
+            key: Cache key
+            task_id: Task served from the cache
+            output_dir: Task output directory
+
+        Returns:
+            True on a cache hit, False on a miss
+        """
+        with self.config.transaction(self.config.research_db) as conn:
+            hit = conn.execute(
+                """UPDATE result_cache
+                   SET last_used_at = strftime('%Y-%m-%d %H:%M:%f', 'now'), hits = hits + 1
+                   WHERE key = ?
+                   RETURNING task_id""",
+                (key,)
+            ).fetchone()
+        if not hit:
+            return False
+
+        entry_dir = self.config.result_cache_dir / key
+        try:
+            shutil.copytree(entry_dir, output_dir, dirs_exist_ok=True)
+        except FileNotFoundError:
+            # Entry removed from disk behind our back; treat as a miss
+            self.remove(key)
+            return False
+
+        with self.config.transaction(self.config.research_db) as conn:
+            conn.execute(
+                "INSERT INTO findings (task_id, content) SELECT ?, content FROM findings WHERE task_id = ? ORDER BY id",
+                (task_id, hit[0])
+            )
+        return True
+
+    def store(self, key: str, task_id: int, task_type: str, output_dir: Path):
+        """Add a task's outputs to the cache and evict to the size limit.
+
+        Args:
+            key: Cache key
+            task_id: Task that produced the outputs (its findings are
+                copied on a hit)
+            task_type: Task type (informational)
+            output_dir: Task output directory (may not exist if the task
+                wrote nothing)
+        """
+        entry_dir = self.config.result_cache_dir / key
+        if entry_dir.exists():
+            return
+
+        # Copy under a temporary name so readers never see a partial entry
+        staging_dir = self.config.result_cache_dir / f".{key}.{uuid.uuid4().hex}"
+        if output_dir.exists():
+            shutil.copytree(output_dir, staging_dir)
+        else:
+            staging_dir.mkdir(parents=True)
+        size_bytes = sum(f.stat().st_size for f in staging_dir.rglob('*') if f.is_file())
+
+        try:
+            staging_dir.rename(entry_dir)
+        except OSError:
+            # Another worker stored the same result first
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return
+
+        with self.config.transaction(self.config.research_db) as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO result_cache (key, task_id, task_type, size_bytes, created_at, last_used_at)
+                   VALUES (?, ?, ?, ?, strftime('%Y-%m-%d %H:%M:%f', 'now'), strftime('%Y-%m-%d %H:%M:%f', 'now'))""",
+                (key, task_id, task_type, size_bytes)
+            )
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its limit."""
+        max_bytes = self.max_bytes()
+
+        with self.config.transaction(self.config.research_db, immediate=True) as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM result_cache").fetchone()[0]
+            if total <= max_bytes:
+                return
+
+            evicted = []
+            for key, size_bytes in conn.execute(
+                "SELECT key, size_bytes FROM result_cache ORDER BY last_used_at"
+            ):
+                if total <= max_bytes:
+                    break
+                evicted.append(key)
+                total -= size_bytes
+
+            conn.executemany("DELETE FROM result_cache WHERE key = ?", ((key,) for key in evicted))
+
+        for key in evicted:
+            shutil.rmtree(self.config.result_cache_dir / key, ignore_errors=True)
+
+    def remove(self, key: str):
+        """Drop a cache entry.
+
+        Args:
+            key: Cache key
+        """
+        with self.config.transaction(self.config.research_db) as conn:
+            conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+        shutil.rmtree(self.config.result_cache_dir / key, ignore_errors=True)
@@ -1,5 +1,4 @@
 """System state management for the Institute system."""
-import sqlite3
 from datetime import datetime
 from typing import Optional, Tuple
 
@@ -25,16 +24,19 @@ class StateManager:
     def get_mode(self) -> Tuple[str, Optional[str], Optional[str]]:
         """Get current system mode.
 
+        The result is cached until system.db changes (see Config.cached_read),
+        so mode checks are cheap enough to run per task.
+
         Returns:
             Tuple of (mode, updated_at, reason)
         """
-        conn = sqlite3.connect(str(self.config.system_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT mode, updated_at, reason FROM system_mode ORDER BY id DESC LIMIT 1"
+        row = self.config.cached_read(
+            self.config.system_db,
+            'system_mode',
+            lambda conn: conn.execute(
+                "SELECT mode, updated_at, reason FROM system_mode ORDER BY id DESC LIMIT 1"
+            ).fetchone()
         )
-        row = cursor.fetchone()
-        conn.close()
 
         if row:
             return row[0], row[1], row[2]
@@ -55,14 +57,11 @@ class StateManager:
         if mode not in self.VALID_MODES:
             raise ValueError(f"Invalid mode: {mode}. Must be one of {self.VALID_MODES}")
 
-        conn = sqlite3.connect(str(self.config.system_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO system_mode (mode, reason) VALUES (?, ?)",
-            (mode, reason)
-        )
-        conn.commit()
-        conn.close()
+        with self.config.transaction(self.config.system_db) as conn:
+            conn.execute(
+                "INSERT INTO system_mode (mode, reason) VALUES (?, ?)",
+                (mode, reason)
+            )
 
     def is_lockdown(self) -> bool:
         """Check if system is in lockdown mode.
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Task archiver for the Institute system.
+
+Completed and failed tasks that have not changed for a while are moved out
+of research.db into one archive database per month of creation
+(db/archive/research-YYYY-MM.db), together with their findings, dependency
+edges, dead-letter entries and queue files. research.db keeps the ID range
+of every archive in archive_index, so QueueManager.get_task_status() still
+finds archived tasks while the hot tasks table stays small.
+"""
+import sys
+from datetime import timedelta
+
+try:
+    from .audit_logger import AuditLogger
+    from .config import Config
+    from .db_init import DatabaseInitializer
+    from .queue_manager import QueueManager
+    from .utils import parse_duration
+except ImportError:
+    from audit_logger import AuditLogger
+    from config import Config
+    from db_init import DatabaseInitializer
+    from queue_manager import QueueManager
+    from utils import parse_duration
+
+
+class TaskArchiver:
+    """Moves finished tasks from research.db into monthly archive databases."""
+
+    TASK_COLUMNS = (
+        'id', 'name', 'description', 'status', 'created_at', 'updated_at', 'completed_at',
+        'error_message', 'claimed_by', 'lease_expires_at', 'priority', 'type', 'params',
+        'attempts', 'max_attempts', 'next_attempt_at', 'waiting_on', 'cacheable', 'cache_hit',
+        'submitted_by'
+    )
+
+    def __init__(self, config: Config):
+        """Initialize task archiver.
+
+        Args:
+            config: System configuration
+        """
+        self.config = config
+        self.queue_manager = QueueManager(config)
+        self.audit_logger = AuditLogger(config)
+        self.db_initializer = DatabaseInitializer(config)
+
+    def archive_tasks(self, older_than: timedelta, batch_size: int = 500) -> dict:
+        """Archive completed and failed tasks not updated within a period.
+
+        A task stays in research.db while a dependent of it is still to
+        run or dead-lettered, while it waits for a retry, or while the
+        result cache serves its outputs (cache hits copy its findings). A
+        dead-lettered task also stays while a parent of it is dead-lettered,
+        so 'task retry' on the parent can still requeue it. Each batch is written
+        to the archives before it is deleted from research.db, under the
+        research.db write lock, so an interrupted run only leaves copies
+        that the next run overwrites.
+
+        Args:
+            older_than: Minimum time since the task was last updated
+            batch_size: Tasks moved per research.db transaction
+
+        Returns:
+            Dict mapping archive month (YYYY-MM) to the number of tasks moved
+        """
+        age = f"-{int(older_than.total_seconds())} seconds"
+        columns = ', '.join(f"t.{column}" for column in self.TASK_COLUMNS)
+        archived = {}
+        initialized = set()
+        leftover_files = []
+        last_id = 0
+
+        while True:
+            with self.config.transaction(self.config.research_db, immediate=True) as conn:
+                rows = conn.execute(
+                    f"""SELECT {columns} FROM tasks t
+                        WHERE t.id > ?
+                          AND t.status IN ('completed', 'failed') AND t.next_attempt_at IS NULL
+                          AND t.updated_at < datetime('now', ?)
+                          AND NOT EXISTS (
+                              SELECT 1 FROM task_dependencies d JOIN tasks c ON c.id = d.task_id
+                              WHERE d.depends_on = t.id
+                                AND (c.status IN ('pending', 'processing') OR c.next_attempt_at IS NOT NULL
+                                     OR EXISTS (SELECT 1 FROM dead_letter dl WHERE dl.task_id = c.id))
+                          )
+                          AND NOT (
+                              EXISTS (SELECT 1 FROM dead_letter dl WHERE dl.task_id = t.id)
+                              AND EXISTS (
+                                  SELECT 1 FROM task_dependencies d JOIN dead_letter dl ON dl.task_id = d.depends_on
+                                  WHERE d.task_id = t.id
+                              )
+                          )
+                          AND NOT EXISTS (SELECT 1 FROM result_cache r WHERE r.task_id = t.id)
+                        ORDER BY t.id LIMIT ?""",
+                    (last_id, age, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+
+                by_month = {}
+                for row in rows:
+                    by_month.setdefault(row[4][:7], []).append(row)
+
+                queue_files = []
+                for month, month_rows in by_month.items():
+                    if month not in initialized:
+                        self.db_initializer.initialize_database(self.config.archive_db(month), 'archive.sql')
+                        initialized.add(month)
+                    queue_files += self._copy_to_archive(conn, month, month_rows)
+
+                task_ids = [(row[0],) for row in rows]
+                conn.executemany("DELETE FROM findings WHERE task_id = ?", task_ids)
+                conn.executemany("DELETE FROM task_dependencies WHERE task_id = ?", task_ids)
+                conn.executemany("DELETE FROM dead_letter WHERE task_id = ?", task_ids)
+                conn.executemany("DELETE FROM tasks WHERE id = ?", task_ids)
+
+                conn.executemany(
+                    """INSERT INTO archive_index (month, min_id, max_id, task_count) VALUES (?, ?, ?, ?)
+                       ON CONFLICT (month) DO UPDATE SET
+                           min_id = MIN(min_id, excluded.min_id),
+                           max_id = MAX(max_id, excluded.max_id),
+                           task_count = task_count + excluded.task_count""",
+                    [(month, month_rows[0][0], month_rows[-1][0], len(month_rows))
+                     for month, month_rows in by_month.items()]
+                )
+
+            # The archive holds their contents now; a file that cannot be
+            # removed is reported, not allowed to stop the committed run
+            for task_file in queue_files:
+                try:
+                    task_file.unlink(missing_ok=True)
+                except OSError as e:
+                    leftover_files.append((task_file, e))
+
+            for month, month_rows in by_month.items():
+                archived[month] = archived.get(month, 0) + len(month_rows)
+
+        if archived:
+            self.audit_logger.log(
+                'system',
+                'tasks_archived',
+                details=', '.join(f"{month}: {count}" for month, count in sorted(archived.items()))
+            )
+
+        if leftover_files:
+            task_file, error = leftover_files[0]
+            self.audit_logger.log(
+                'system',
+                'archive_queue_files_left',
+                details=f"{len(leftover_files)} queue file(s) of archived tasks not removed, e.g. {task_file}: {error}"
+            )
+
+        return archived
+
+    def _copy_to_archive(self, conn, month: str, rows: list) -> list:
+        """Copy tasks and everything that belongs to them into an archive.
+
+        Args:
+            conn: research.db connection (inside the archiving transaction)
+            month: Archive month (YYYY-MM)
+            rows: Task rows in TASK_COLUMNS order
+
+        Returns:
+            Paths of the queue files that were copied
+        """
+        placeholders = ', '.join('?' for _ in self.TASK_COLUMNS)
+        queue_files = []
+
+        with self.config.transaction(self.config.archive_db(month)) as archive:
+            archive.executemany(
+                f"INSERT OR REPLACE INTO tasks ({', '.join(self.TASK_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+
+            for row in rows:
+                task_id, status = row[0], row[3]
+                # Findings are streamed, not loaded, however many a task has
+                archive.executemany(
+                    "INSERT OR REPLACE INTO findings (id, task_id, content, created_at) VALUES (?, ?, ?, ?)",
+                    conn.execute("SELECT id, task_id, content, created_at FROM findings WHERE task_id = ?", (task_id,))
+                )
+                archive.executemany(
+                    "INSERT OR REPLACE INTO task_dependencies (task_id, depends_on) VALUES (?, ?)",
+                    conn.execute("SELECT task_id, depends_on FROM task_dependencies WHERE task_id = ?", (task_id,))
+                )
+                archive.executemany(
+                    "INSERT OR REPLACE INTO dead_letter (task_id, attempts, error_message, created_at) VALUES (?, ?, ?, ?)",
+                    conn.execute("SELECT task_id, attempts, error_message, created_at FROM dead_letter WHERE task_id = ?",
+                                 (task_id,))
+                )
+
+                task_file = self.queue_manager.find_task_file(task_id, status)
+                if task_file:
+                    archive.execute(
+                        "INSERT OR REPLACE INTO queue_files (task_id, status, content) VALUES (?, ?, ?)",
+                        (task_id, status, task_file.read_text())
+                    )
+                    queue_files.append(task_file)
+
+        return queue_files
+
+
+def main():
+    """Main entry point for the task archiver."""
+    # Parse command-line arguments
+    base_path = None
+    older_than = '30d'
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--base-path='):
+            base_path = arg.split('=', 1)[1]
+        elif arg.startswith('--older-than='):
+            older_than = arg.split('=', 1)[1]
+
+    # Initialize and run
+    config = Config(base_path)
+    archiver = TaskArchiver(config)
+
+    try:
+        archived = archiver.archive_tasks(parse_duration(older_than))
+        print(f"Archived {sum(archived.values())} task(s)")
+        sys.exit(0)
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
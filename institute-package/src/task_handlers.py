@@ -0,0 +1,187 @@
+"""Task-type handler registry for the Institute system.
+
+A handler is a callable ``handler(task_data, context)`` that runs one task.
+It returns False to mark the task failed; any other return value counts as
+success, and an exception fails the task with its message.
+
+Handlers for a task type are found, in order:
+
+1. Built in: 'noop', which succeeds without doing anything
+2. The 'institute.task_handlers' entry point group, by entry point name
+3. research/scripts/<type>.py, by its handle() function
+
+Nothing is imported until a task of that type is executed, and each handler
+is cached for the lifetime of the process.
+"""
+import importlib.util
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+try:
+    from .config import Config
+    from .findings import FindingsWriter
+except ImportError:
+    from config import Config
+    from findings import FindingsWriter
+
+
+ENTRY_POINT_GROUP = 'institute.task_handlers'
+DEFAULT_TASK_TYPE = 'noop'
+
+# Type names double as script file names, so keep them to identifiers
+TASK_TYPE_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def validate_task_type(task_type: str) -> str:
+    """Check that a task type name is well formed.
+
+    Args:
+        task_type: Task type name
+
+    Returns:
+        The task type name
+
+    Raises:
+        ValueError: If the name is not a Python identifier
+    """
+    if not isinstance(task_type, str) or not TASK_TYPE_PATTERN.match(task_type):
+        raise ValueError(f"Invalid task type: {task_type!r}")
+    return task_type
+
+
+def noop(task_data: dict, context: 'TaskContext') -> bool:
+    """Built-in handler for tasks that only track work done elsewhere."""
+    return True
+
+
+class TaskContext:
+    """What a handler needs to know about the task it runs."""
+
+    def __init__(self, config: Config, task_id: int, params: Optional[dict] = None):
+        """Initialize task context.
+
+        Args:
+            config: System configuration
+            task_id: ID of the task being executed
+            params: Task parameters (decoded from the task's params JSON)
+        """
+        self.config = config
+        self.task_id = task_id
+        self.params = params or {}
+        self.output_dir = config.research_outputs_dir / str(task_id)
+        self._findings = None
+
+    @property
+    def findings(self) -> FindingsWriter:
+        """Batched writer for the task's findings (written by close())."""
+        if self._findings is None:
+            self._findings = FindingsWriter(self.config, self.task_id)
+        return self._findings
+
+    def close(self, success: bool = True):
+        """Write out or drop findings still buffered when the handler returns.
+
+        Args:
+            success: Whether the handler succeeded; a failed attempt's
+                buffered findings are dropped so a retry does not repeat them
+        """
+        if self._findings is not None:
+            if success:
+                self._findings.flush()
+            else:
+                self._findings.discard()
+
+    def make_output_dir(self) -> Path:
+        """Create the task's output directory.
+
+        Returns:
+            Path to research/outputs/<task_id>/
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir
+
+
+class HandlerRegistry:
+    """Lazily loads and caches task-type handlers."""
+
+    BUILTIN_HANDLERS = {
+        DEFAULT_TASK_TYPE: noop
+    }
+
+    def __init__(self, config: Config):
+        """Initialize handler registry.
+
+        Args:
+            config: System configuration
+        """
+        self.config = config
+        self._handlers = dict(self.BUILTIN_HANDLERS)
+
+    def get(self, task_type: str) -> Callable[[dict, TaskContext], Any]:
+        """Get the handler for a task type, loading it on first use.
+
+        Args:
+            task_type: Task type name
+
+        Returns:
+            Handler callable
+
+        Raises:
+            ValueError: If the type name is invalid
+            LookupError: If no handler is registered for the type
+        """
+        handler = self._handlers.get(task_type)
+        if handler is None:
+            validate_task_type(task_type)
+            handler = self._load_entry_point(task_type) or self._load_script(task_type)
+            if handler is None:
+                raise LookupError(f"No handler for task type: {task_type}")
+            self._handlers[task_type] = handler
+        return handler
+
+    def _load_entry_point(self, task_type: str) -> Optional[Callable]:
+        """Load a handler from an installed package's entry point.
+
+        Args:
+            task_type: Task type name
+
+        Returns:
+            Handler callable, or None if no entry point has this name
+        """
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP, name=task_type):
+            target = entry_point.load()
+            # Entry points may name the handler or a module exposing handle()
+            return target if callable(target) else target.handle
+        return None
+
+    def _load_script(self, task_type: str) -> Optional[Callable]:
+        """Load a handler from research/scripts/<type>.py.
+
+        Args:
+            task_type: Task type name
+
+        Returns:
+            The module's handle() function, or None if there is no script
+        """
+        script = self.config.research_scripts_dir / f"{task_type}.py"
+        if not script.is_file():
+            return None
+
+        module_name = f"institute_task_handlers.{task_type}"
+        spec = importlib.util.spec_from_file_location(module_name, script)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+
+        handler = getattr(module, 'handle', None)
+        if not callable(handler):
+            raise LookupError(f"{script} does not define handle(task_data, context)")
+        return handler
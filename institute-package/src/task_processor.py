@@ -1,7 +1,18 @@
 #!/usr/bin/env python3
 """Task processor for the Institute system."""
 import json
+import os
+import resource
+import signal
+import socket
+import subprocess
 import sys
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 
@@ -9,18 +20,92 @@ try:
     from .audit_logger import AuditLogger
     from .config import Config
     from .queue_manager import QueueManager
+    from .result_cache import ResultCache
     from .state_manager import StateManager
-    from .utils import acquire_lock, release_lock
+    from .task_handlers import HandlerRegistry, TaskContext
 except ImportError:
     from audit_logger import AuditLogger
     from config import Config
     from queue_manager import QueueManager
+    from result_cache import ResultCache
     from state_manager import StateManager
-    from utils import acquire_lock, release_lock
+    from task_handlers import HandlerRegistry, TaskContext
+
+
+# Exit codes of an isolated task child (see run_isolated_task)
+CHILD_SUCCESS = 0
+CHILD_TASK_FAILED = 1
+CHILD_HANDLER_ERROR = 2
+
+
+class TaskExecutionError(RuntimeError):
+    """An isolated task failed, timed out or hit a resource limit."""
+
+
+class LeaseKeeper:
+    """Background thread that renews the leases of running tasks."""
+
+    def __init__(self, queue_manager: QueueManager, worker_id: str, lease_seconds: int):
+        """Initialize lease keeper.
+
+        Args:
+            queue_manager: Queue manager used to renew leases
+            worker_id: Identifier of the worker holding the leases
+            lease_seconds: Lease duration; leases are renewed every third of it
+        """
+        self.queue_manager = queue_manager
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.task_ids = set()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+    def add(self, task_id: int):
+        """Start renewing a task's lease."""
+        with self._lock:
+            self.task_ids.add(task_id)
+
+    def discard(self, task_id: int):
+        """Stop renewing a task's lease."""
+        with self._lock:
+            self.task_ids.discard(task_id)
+
+    def _run(self):
+        """Renew held leases until stopped."""
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                task_ids = list(self.task_ids)
+            if task_ids:
+                try:
+                    self.queue_manager.renew_leases(self.worker_id, task_ids, self.lease_seconds)
+                except Exception:
+                    # Retried on the next tick; the lease outlives several ticks
+                    pass
 
 
 class TaskProcessor:
-    """Processes research tasks from the queue."""
+    """Processes research tasks from the queue.
+
+    Any number of processors may drain the queue at once: each task is
+    claimed under a lease held by this processor's worker_id and renewed
+    while the task runs. A task whose processor dies is reclaimed by another
+    processor once its lease expires.
+    """
+
+    # Daemon mode: rescan and write the heartbeat at least this often when idle
+    IDLE_RESCAN_SECONDS = 60
+    # Minimum spacing of heartbeat writes while draining the queue
+    HEARTBEAT_INTERVAL_SECONDS = 30
 
     def __init__(self, config: Config):
         """Initialize task processor.
@@ -31,17 +116,37 @@ class TaskProcessor:
         self.config = config
         self.state_manager = StateManager(config)
         self.queue_manager = QueueManager(config)
-        self.audit_logger = AuditLogger(config)
+        self.audit_logger = AuditLogger(config, group_commit=True)
+        self.handlers = HandlerRegistry(config)
+        self.result_cache = ResultCache(config)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_keeper: LeaseKeeper = None
+        self.stopping = threading.Event()
+        self._last_heartbeat = 0.0
 
     def update_heartbeat(self):
         """Update task processor heartbeat."""
         heartbeat_file = self.config.system_heartbeat_dir / "task_processor"
         heartbeat_file.parent.mkdir(parents=True, exist_ok=True)
         heartbeat_file.write_text(datetime.now().isoformat())
+        self._last_heartbeat = time.monotonic()
+
+    def keep_heartbeat(self):
+        """Update the heartbeat if it has not been written recently.
+
+        Called between tasks so a long drain in daemon mode does not look
+        stale to the watchdog.
+        """
+        if time.monotonic() - self._last_heartbeat >= self.HEARTBEAT_INTERVAL_SECONDS:
+            self.update_heartbeat()
 
     def process_pending_tasks(self) -> int:
         """Process all pending tasks in the queue.
 
+        With max_workers > 1 (management.db config) tasks run concurrently in
+        a worker pool; this process stays the coordinator that claims tasks
+        and records status and audit entries.
+
         Returns:
             Number of tasks processed
         """
@@ -55,112 +160,722 @@ class TaskProcessor:
             )
             return 0
 
-        # Acquire lock to prevent concurrent processing
-        if not acquire_lock(self.config.task_processor_lock):
-            self.audit_logger.log('system', 'task_processor_lock_failed')
-            return 0
+        lease_seconds = int(self.config.get_config_value('task_lease_seconds', '900'))
+        self.lease_keeper = LeaseKeeper(self.queue_manager, self.worker_id, lease_seconds)
 
         try:
-            processed_count = 0
+            mirror = self.queue_manager.file_mirror_enabled()
+            max_workers = int(self.config.get_config_value('max_workers', '1'))
 
-            # Get all pending task files
-            pending_files = sorted(self.config.queues_research_pending.glob("*.json"))
+            with self.lease_keeper:
+                if max_workers > 1:
+                    processed_count = self.process_with_pool(max_workers, mirror)
+                else:
+                    processed_count = self.process_inline(mirror)
 
-            for task_file in pending_files:
-                try:
-                    # Read task data
-                    with open(task_file, 'r') as f:
-                        task_data = json.load(f)
+            # Update heartbeat
+            self.update_heartbeat()
 
-                    task_id = task_data['id']
+            return processed_count
 
-                    # Move to processing
-                    self.queue_manager.move_task(task_id, 'pending', 'processing')
-                    self.queue_manager.update_task_status(task_id, 'processing')
+        finally:
+            # Always write out buffered audit entries
+            self.audit_logger.flush()
 
-                    self.audit_logger.log(
-                        'system',
-                        'task_started',
-                        target=f"task_{task_id}",
-                        details=task_data.get('name')
-                    )
+    def claim_task(self) -> dict:
+        """Claim the next task under this processor's lease.
 
-                    # Process the task (placeholder - actual processing logic would go here)
-                    success = self.execute_task(task_data)
-
-                    # Move to completed or failed
-                    if success:
-                        self.queue_manager.move_task(task_id, 'processing', 'completed')
-                        self.queue_manager.update_task_status(task_id, 'completed')
-                        self.audit_logger.log(
-                            'system',
-                            'task_completed',
-                            target=f"task_{task_id}"
-                        )
-                    else:
-                        self.queue_manager.move_task(task_id, 'processing', 'failed')
-                        self.queue_manager.update_task_status(
-                            task_id,
-                            'failed',
-                            error_message='Task execution failed'
-                        )
-                        self.audit_logger.log(
-                            'system',
-                            'task_failed',
-                            target=f"task_{task_id}"
-                        )
-
-                    processed_count += 1
+        Returns:
+            Task data dictionary, or None if no task is available
+        """
+        task_data = self.queue_manager.claim_next_task(self.worker_id, self.lease_keeper.lease_seconds)
+        if task_data is None:
+            return None
 
-                except Exception as e:
-                    # Log error and continue
+        if task_data['reclaimed_from']:
+            self.audit_logger.log(
+                'system',
+                'task_lease_reclaimed',
+                target=f"task_{task_data['id']}",
+                details=f"Lease of {task_data['reclaimed_from']} expired"
+            )
+
+        self.lease_keeper.add(task_data['id'])
+        return task_data
+
+    def process_inline(self, mirror: bool) -> int:
+        """Claim and execute tasks one at a time in this process.
+
+        Args:
+            mirror: Whether to keep the queue directory mirror in step
+
+        Returns:
+            Number of tasks processed
+        """
+        processed_count = 0
+
+        # Stop mid-run if the system entered lockdown or the daemon is stopping
+        while not self.stopping.is_set() and self.state_manager.can_process_tasks():
+            # Atomically move the next pending task to 'processing'
+            task_data = self.claim_task()
+            if task_data is None:
+                break
+
+            try:
+                self.start_task(task_data, mirror)
+                success = self.execute_task(task_data)
+                self.finish_task(task_data, success, mirror)
+                processed_count += 1
+            except Exception as e:
+                self.record_task_error(task_data, e, mirror)
+
+            self.keep_heartbeat()
+
+        return processed_count
+
+    def process_with_pool(self, max_workers: int, mirror: bool) -> int:
+        """Claim tasks and execute them concurrently in a worker pool.
+
+        The pool is process-based or thread-based depending on the
+        'task_pool_mode' config key ('process' for CPU-bound analysis,
+        'thread' for I/O-bound work). At most max_workers tasks are claimed
+        at a time, so tasks are not held in 'processing' while they wait.
+
+        A worker process that dies breaks the whole pool, so the pool is
+        rebuilt. If one task was running, it caused the crash and the
+        failed attempt is recorded against it; if several were, they are
+        rerun one at a time under their existing claims until the crash
+        happens again, so only the task that caused it loses an attempt.
+
+        Args:
+            max_workers: Number of concurrent tasks
+            mirror: Whether to keep the queue directory mirror in step
+
+        Returns:
+            Number of tasks processed
+        """
+        processed_count = 0
+        in_flight = {}
+        # Tasks that were running when a worker died, rerun one at a time;
+        # nothing else is claimed while one of them runs
+        suspects = []
+        suspect_future = None
+        pool_broken = False
+        pool_mode = self.config.get_config_value('task_pool_mode', 'process')
+        executor, execute = self._start_pool(pool_mode, max_workers)
+
+        try:
+            while True:
+                # Fill free worker slots, unless the system entered lockdown
+                # or the daemon is stopping; running tasks are waited for
+                while not self.stopping.is_set() and self.state_manager.can_process_tasks():
+                    if suspect_future is not None:
+                        break
+                    suspect = bool(suspects)
+                    if suspect:
+                        if in_flight:
+                            break
+                        task_data = suspects.pop(0)
+                    elif len(in_flight) < max_workers:
+                        task_data = self.claim_task()
+                        if task_data is None:
+                            break
+                        try:
+                            self.start_task(task_data, mirror)
+                        except Exception as e:
+                            self.record_task_error(task_data, e, mirror)
+                            continue
+                    else:
+                        break
+
+                    try:
+                        future = executor.submit(execute, task_data)
+                    except BrokenProcessPool:
+                        # A worker died since the last wait; this task never ran
+                        self.release_task(task_data, mirror)
+                        pool_broken = True
+                        break
+                    in_flight[future] = task_data
+                    if suspect:
+                        suspect_future = future
+
+                if not in_flight and not pool_broken:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # Every other running task fails with the pool
+                    done, _ = wait(in_flight)
+
+                if suspect_future in done:
+                    suspect_future = None
+
+                crashed = []
+                # In claim order, so suspects are rerun in the order they started
+                for future in [future for future in in_flight if future in done]:
+                    task_data = in_flight.pop(future)
+                    try:
+                        self.finish_task(task_data, future.result(), mirror)
+                        processed_count += 1
+                    except BrokenProcessPool:
+                        crashed.append(task_data)
+                    except Exception as e:
+                        self.record_task_error(task_data, e, mirror)
+
+                if crashed or pool_broken:
+                    executor.shutdown()
                     self.audit_logger.log(
                         'system',
-                        'task_processing_error',
-                        target=str(task_file),
-                        details=str(e)
+                        'task_pool_restarted',
+                        details=f"Worker process died with {len(crashed)} task(s) running"
                     )
+                    if len(crashed) == 1:
+                        self.record_failure(crashed[0], 'Worker process died', 'task_processing_error', mirror)
+                    else:
+                        suspects.extend(crashed)
+                    executor, execute = self._start_pool(pool_mode, max_workers)
+                    pool_broken = False
 
-            # Update heartbeat
-            self.update_heartbeat()
-
-            return processed_count
+                self.keep_heartbeat()
 
         finally:
-            # Always release lock
-            release_lock(self.config.task_processor_lock)
+            executor.shutdown()
+
+        # Stopped before every suspect was rerun
+        for task_data in suspects:
+            self.release_task(task_data, mirror)
+
+        return processed_count
+
+    def _start_pool(self, pool_mode: str, max_workers: int) -> tuple:
+        """Start the worker pool used by process_with_pool.
+
+        Args:
+            pool_mode: 'thread' or 'process'
+            max_workers: Number of workers
+
+        Returns:
+            Tuple of (executor, function that executes a task in it)
+        """
+        if pool_mode == 'thread':
+            return ThreadPoolExecutor(max_workers=max_workers), self.execute_task
+
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(str(self.config.base_path),)
+        )
+        return executor, _execute_in_worker
+
+    def start_task(self, task_data: dict, mirror: bool):
+        """Record that a claimed task is starting.
+
+        Args:
+            task_data: Task data dictionary
+            mirror: Whether to keep the queue directory mirror in step
+        """
+        task_id = task_data['id']
+
+        if mirror:
+            self.queue_manager.move_task(task_id, 'pending', 'processing')
+
+        self.audit_logger.log(
+            'system',
+            'task_started',
+            target=f"task_{task_id}",
+            details=task_data.get('name')
+        )
+
+    def finish_task(self, task_data: dict, success: bool, mirror: bool):
+        """Record the outcome of an executed task.
+
+        Args:
+            task_data: Task data dictionary
+            success: Whether execution succeeded
+            mirror: Whether to keep the queue directory mirror in step
+        """
+        if not success:
+            self.record_failure(task_data, 'Task execution failed', 'task_failed', mirror)
+            return
+
+        task_id = task_data['id']
+        self.lease_keeper.discard(task_id)
+
+        if not self.queue_manager.update_task_status(task_id, 'completed', worker_id=self.worker_id):
+            self.record_lease_lost(task_id)
+            return
+
+        if mirror:
+            self.queue_manager.move_task(task_id, 'processing', 'completed')
+
+        self.audit_logger.log(
+            'system',
+            'task_completed',
+            target=f"task_{task_id}"
+        )
+
+    def release_task(self, task_data: dict, mirror: bool):
+        """Return a claimed task that did not run to the queue.
+
+        No attempt is charged for it.
+
+        Args:
+            task_data: Task data dictionary
+            mirror: Whether to keep the queue directory mirror in step
+        """
+        task_id = task_data['id']
+        self.lease_keeper.discard(task_id)
+
+        if not self.queue_manager.release_task(task_id, self.worker_id):
+            self.record_lease_lost(task_id)
+            return
+
+        if mirror:
+            self.queue_manager.move_task(task_id, 'processing', 'pending')
+
+        self.audit_logger.log(
+            'system',
+            'task_released',
+            target=f"task_{task_id}"
+        )
+
+    def record_task_error(self, task_data: dict, error: Exception, mirror: bool = False):
+        """Record a failed attempt after an unexpected error.
+
+        Args:
+            task_data: Task data dictionary
+            error: The exception raised while processing the task
+            mirror: Whether to keep the queue directory mirror in step
+        """
+        self.record_failure(task_data, str(error), 'task_processing_error', mirror)
+
+    def record_failure(self, task_data: dict, error_message: str, action: str, mirror: bool):
+        """Record a failed attempt; the task is retried later or dead-lettered.
+
+        Args:
+            task_data: Task data dictionary
+            error_message: Why the attempt failed
+            action: Audit action for a task that has no attempts left
+            mirror: Whether to keep the queue directory mirror in step
+        """
+        task_id = task_data['id']
+        self.lease_keeper.discard(task_id)
+
+        outcome = self.queue_manager.fail_task(task_id, error_message, self.worker_id)
+        if outcome is None:
+            self.record_lease_lost(task_id)
+            return
+
+        if not outcome['dead_lettered']:
+            # Waiting retries keep their file in pending
+            if mirror:
+                self.queue_manager.move_task(task_id, 'processing', 'pending')
+            self.audit_logger.log(
+                'system',
+                'task_retry_scheduled',
+                target=f"task_{task_id}",
+                details=(f"Attempt {outcome['attempts']}/{outcome['max_attempts']} failed: {error_message}; "
+                         f"next attempt at {outcome['next_attempt_at']}")
+            )
+            return
+
+        if mirror:
+            self.queue_manager.move_task(task_id, 'processing', 'failed')
+
+        self.audit_logger.log(
+            'system',
+            action,
+            target=f"task_{task_id}",
+            details=f"Dead-lettered after {outcome['attempts']} attempt(s): {error_message}"
+        )
+
+        # Tasks that depend on it can never run
+        dependents = outcome['dependents_failed']
+        if dependents:
+            if mirror:
+                for dependent in dependents:
+                    self.queue_manager.move_task(dependent, 'pending', 'failed')
+            self.audit_logger.log(
+                'system',
+                'task_dependents_failed',
+                target=f"task_{task_id}",
+                details=f"Dead-lettered {len(dependents)} dependent task(s): {', '.join(map(str, dependents))}"
+            )
+
+    def record_lease_lost(self, task_id: int):
+        """Record that a task's outcome was dropped because its lease was lost.
+
+        Args:
+            task_id: Task ID
+        """
+        self.audit_logger.log(
+            'system',
+            'task_lease_lost',
+            target=f"task_{task_id}",
+            details=f"Worker {self.worker_id} no longer holds the lease"
+        )
 
     def execute_task(self, task_data: dict) -> bool:
-        """Execute a task (placeholder for actual task logic).
+        """Execute a task with the handler registered for its type.
+
+        With 'task_isolation' set to 'subprocess' the handler runs in a child
+        process (see execute_isolated); otherwise it runs in this process.
+
+        For a cacheable task the result cache is consulted first: on a hit
+        the cached outputs are copied to the task's output directory and the
+        handler does not run; on a miss the outputs of a successful run are
+        added to the cache.
 
         Args:
             task_data: Task data dictionary
 
         Returns:
             True if successful, False otherwise
+
+        Raises:
+            LookupError: If no handler is registered for the task's type
+            TaskExecutionError: If an isolated task did not succeed
+        """
+        cache_key = None
+        if task_data.get('cacheable') and self.result_cache.max_bytes() > 0:
+            cache_key = self.result_cache.key(task_data)
+            output_dir = TaskContext(self.config, task_data['id']).output_dir
+            if self.result_cache.fetch(cache_key, task_data['id'], output_dir):
+                self.queue_manager.mark_cache_hit(task_data['id'])
+                return True
+
+        if self.config.get_config_value('task_isolation', 'none') == 'subprocess':
+            success = self.execute_isolated(task_data)
+        else:
+            success = self.run_handler(task_data)
+
+        if success and cache_key:
+            self.result_cache.store(cache_key, task_data['id'], task_data['type'], output_dir)
+        return success
+
+    def run_handler(self, task_data: dict) -> bool:
+        """Run a task's handler in this process.
+
+        The handler module is imported the first time a task of its type
+        runs in this process (see task_handlers).
+
+        Args:
+            task_data: Task data dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        handler = self.handlers.get(task_data['type'])
+        context = TaskContext(self.config, task_data['id'], task_data['params'])
+        success = False
+        try:
+            success = handler(task_data, context) is not False
+        finally:
+            context.close(success)
+        return success
+
+    def execute_isolated(self, task_data: dict) -> bool:
+        """Run a task's handler in a child process with resource limits.
+
+        The child gets its own session, so a hung task is killed together
+        with anything it started once 'task_timeout_seconds' passes. It runs
+        under RLIMIT_AS ('task_memory_limit_mb') and RLIMIT_CPU
+        ('task_cpu_limit_seconds'); 0 disables a limit. Its stdout and stderr
+        go to stdout.log and stderr.log in research/outputs/<task_id>/.
+
+        Args:
+            task_data: Task data dictionary
+
+        Returns:
+            True if the task succeeded
+
+        Raises:
+            TaskExecutionError: If the task failed, was killed or timed out;
+                the message includes the child's resource usage
+        """
+        timeout = float(self.config.get_config_value('task_timeout_seconds', '3600'))
+        memory_limit_mb = int(self.config.get_config_value('task_memory_limit_mb', '0'))
+        cpu_limit_seconds = int(self.config.get_config_value('task_cpu_limit_seconds', '0'))
+
+        output_dir = TaskContext(self.config, task_data['id']).make_output_dir()
+        command = [
+            sys.executable, str(Path(__file__).resolve()), '--run-task',
+            f"--base-path={self.config.base_path}",
+            f"--memory-limit-mb={memory_limit_mb}",
+            f"--cpu-limit-seconds={cpu_limit_seconds}"
+        ]
+
+        started = time.monotonic()
+        with open(output_dir / 'stdout.log', 'wb') as stdout, open(output_dir / 'stderr.log', 'wb') as stderr:
+            child = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=stdout,
+                stderr=stderr,
+                start_new_session=True
+            )
+            try:
+                child.stdin.write(json.dumps(task_data).encode())
+                child.stdin.close()
+            except BrokenPipeError:
+                # The child died before reading its task; reported below
+                pass
+            usage, timed_out = _wait_for_child(child, timeout)
+
+        if child.returncode == CHILD_SUCCESS and not timed_out:
+            return True
+
+        elapsed = time.monotonic() - started
+        summary = (
+            f"wall {elapsed:.1f}s, cpu {usage.ru_utime + usage.ru_stime:.1f}s, "
+            f"max rss {usage.ru_maxrss / 1024:.0f} MB"
+        )
+
+        if timed_out:
+            outcome = f"Timed out after {timeout:g}s"
+        elif child.returncode < 0:
+            outcome = f"Killed by {signal.Signals(-child.returncode).name}"
+        elif child.returncode == CHILD_TASK_FAILED:
+            outcome = "Task reported failure"
+        elif child.returncode == CHILD_HANDLER_ERROR:
+            outcome = _last_line(output_dir / 'stderr.log') or "Handler raised an exception"
+        else:
+            outcome = f"Exited with code {child.returncode}"
+
+        raise TaskExecutionError(f"{outcome} ({summary}); output in {output_dir}")
+
+    def work_versions(self) -> list:
+        """Read the data_version of research.db and system.db.
+
+        PRAGMA data_version only changes when a different connection commits,
+        so this processor's own claims and status updates do not move it.
+        Checking it reads the WAL index in shared memory, which keeps idle
+        polling cheap enough for sub-second wakeup after 'task create'.
+
+        Returns:
+            List of data_version values, compared by wait_for_work
+        """
+        return [
+            self.config.connection(path).execute("PRAGMA data_version").fetchone()[0]
+            for path in (self.config.research_db, self.config.system_db)
+        ]
+
+    def wait_for_work(self, baseline: list, timeout: float, poll_interval: float):
+        """Sleep until another process commits to research.db or system.db.
+
+        The baseline must be read before the queue was last found empty, so
+        a task created in between wakes the processor at once.
+
+        Args:
+            baseline: work_versions() from before the last drain of the queue
+            timeout: Maximum time to wait in seconds
+            poll_interval: Time between data_version checks in seconds
         """
-        # This is a placeholder. In a real implementation, this would:
-        # 1. Execute task-specific logic based on task type
-        # 2. Run analysis scripts
-        # 3. Generate outputs
-        # 4. Record findings in research.db
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.work_versions() != baseline:
+                return
+            if self.stopping.wait(poll_interval):
+                return
 
-        # For now, just simulate successful execution
-        return True
+    def run(self, poll_interval: float = 1.0):
+        """Run task processor continuously.
+
+        Drains the queue, then waits for new tasks (or a mode change) instead
+        of exiting. SIGTERM lets running tasks finish, writes out buffered
+        audit entries and stops the loop.
+
+        Args:
+            poll_interval: Time between wakeup checks in seconds
+        """
+        print(f"Task processor daemon starting (worker: {self.worker_id})")
+        self.audit_logger.log('system', 'task_processor_started', details=self.worker_id)
+
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stopping.set())
+
+        try:
+            while not self.stopping.is_set():
+                # Commits from here on wake the wait below
+                baseline = self.work_versions()
+                try:
+                    # Skip blocked runs so lockdown does not log on every wakeup
+                    if self.state_manager.can_process_tasks():
+                        count = self.process_pending_tasks()
+                        if count > 0:
+                            print(f"Processed {count} task(s)")
+                    self.update_heartbeat()
+                except Exception as e:
+                    self.audit_logger.log(
+                        'system',
+                        'task_processor_error',
+                        details=str(e)
+                    )
+                    print(f"Error during task processing: {e}", file=sys.stderr)
+
+                # Wake up for the next scheduled retry instead of polling for it
+                timeout = self.IDLE_RESCAN_SECONDS
+                retry_in = self.queue_manager.seconds_until_next_retry()
+                if retry_in is not None:
+                    timeout = min(timeout, max(retry_in, poll_interval))
+                self.wait_for_work(baseline, timeout, poll_interval)
+
+        except KeyboardInterrupt:
+            pass
+
+        print("Task processor daemon stopping")
+        self.audit_logger.log('system', 'task_processor_stopped', details=self.worker_id)
+        self.audit_logger.flush()
+
+
+# Processor instance of a process-pool worker (see _init_worker)
+_worker_processor = None
+
+
+def _wait_for_child(child: subprocess.Popen, timeout: float) -> tuple:
+    """Wait for an isolated task child, killing it at the timeout.
+
+    Uses wait4() so the child's own resource usage is available even when
+    several children run at once (RUSAGE_CHILDREN would mix them).
+
+    Args:
+        child: Child process
+        timeout: Wall-clock limit in seconds
+
+    Returns:
+        Tuple of (resource usage, whether the child was killed for timing out)
+    """
+    deadline = time.monotonic() + timeout
+    timed_out = False
+    delay = 0.001
+
+    while True:
+        pid, status, usage = os.wait4(child.pid, os.WNOHANG)
+        if pid:
+            child.returncode = os.waitstatus_to_exitcode(status)
+            return usage, timed_out
+
+        if not timed_out and time.monotonic() >= deadline:
+            # Kill the whole session, including anything the task started
+            os.killpg(child.pid, signal.SIGKILL)
+            timed_out = True
+
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+
+
+def _last_line(path: Path) -> str:
+    """Get the last non-empty line of a log file.
+
+    Args:
+        path: Log file path
+
+    Returns:
+        Last line, or an empty string
+    """
+    lines = path.read_text(errors='replace').strip().splitlines()
+    return lines[-1] if lines else ''
+
+
+def run_isolated_task(base_path: str, memory_limit_mb: int, cpu_limit_seconds: int) -> int:
+    """Run one task in an isolated child (task_processor.py --run-task).
+
+    The task data is read as JSON from stdin. Limits are applied before the
+    handler is imported, so they cover the handler's imports too.
+
+    Args:
+        base_path: Institute base path
+        memory_limit_mb: Address space limit in MB (0 for none)
+        cpu_limit_seconds: CPU time limit in seconds (0 for none)
+
+    Returns:
+        Exit code (CHILD_SUCCESS, CHILD_TASK_FAILED or CHILD_HANDLER_ERROR)
+    """
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_limit_seconds:
+        # SIGXCPU at the soft limit, SIGKILL one second later
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit_seconds, cpu_limit_seconds + 1))
+
+    try:
+        task_data = json.load(sys.stdin)
+        config = Config(base_path)
+        handler = HandlerRegistry(config).get(task_data['type'])
+        context = TaskContext(config, task_data['id'], task_data['params'])
+        success = False
+        try:
+            success = handler(task_data, context) is not False
+        finally:
+            context.close(success)
+    except BaseException:
+        traceback.print_exc()
+        return CHILD_HANDLER_ERROR
+
+    return CHILD_SUCCESS if success else CHILD_TASK_FAILED
+
+
+def _init_worker(base_path: str):
+    """Set up a process-pool worker.
+
+    Args:
+        base_path: Institute base path of the coordinating processor
+    """
+    global _worker_processor
+    _worker_processor = TaskProcessor(Config(base_path))
+
+
+def _execute_in_worker(task_data: dict) -> bool:
+    """Execute a task inside a process-pool worker.
+
+    Args:
+        task_data: Task data dictionary
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return _worker_processor.execute_task(task_data)
 
 
 def main():
     """Main entry point for task processor."""
     # Parse command-line arguments
     base_path = None
+    daemon = False
+    poll_interval = 1.0
+    run_task = False
+    memory_limit_mb = 0
+    cpu_limit_seconds = 0
+
     for arg in sys.argv[1:]:
         if arg.startswith('--base-path='):
             base_path = arg.split('=', 1)[1]
+        elif arg == '--daemon':
+            daemon = True
+        elif arg.startswith('--poll-interval='):
+            poll_interval = float(arg.split('=', 1)[1])
+        elif arg == '--run-task':
+            run_task = True
+        elif arg.startswith('--memory-limit-mb='):
+            memory_limit_mb = int(arg.split('=', 1)[1])
+        elif arg.startswith('--cpu-limit-seconds='):
+            cpu_limit_seconds = int(arg.split('=', 1)[1])
+
+    if run_task:
+        # Isolated child started by execute_isolated
+        sys.exit(run_isolated_task(base_path, memory_limit_mb, cpu_limit_seconds))
 
     # Initialize and run
     config = Config(base_path)
     processor = TaskProcessor(config)
 
+    if daemon:
+        try:
+            processor.run(poll_interval)
+        except Exception as e:
+            print(f"Fatal error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     try:
         count = processor.process_pending_tasks()
         if count > 0:
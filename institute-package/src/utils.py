@@ -1,10 +1,12 @@
 """Utility functions for the Institute system."""
 import hashlib
+import json
 import os
 import pwd
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 
 def get_current_user() -> str:
@@ -57,6 +59,47 @@ def parse_timestamp(timestamp_str: str) -> datetime:
     return datetime.fromisoformat(timestamp_str)
 
 
+def sqlite_utc_timestamp(text: str) -> str:
+    """Normalize an ISO 8601 date or timestamp for comparison in SQLite.
+
+    SQLite stores times as 'YYYY-MM-DD HH:MM:SS' in UTC and does not
+    understand every form datetime.fromisoformat() accepts (e.g. 20261017
+    or UTC offsets). Times without an offset are taken to be UTC.
+
+    Args:
+        text: ISO 8601 date or timestamp
+
+    Returns:
+        UTC timestamp as 'YYYY-MM-DD HH:MM:SS'
+
+    Raises:
+        ValueError: If the text is not an ISO 8601 date or timestamp
+    """
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def parse_duration(text: str) -> timedelta:
+    """Parse a duration such as '30d', '12h', '45m' or '2w'.
+
+    Args:
+        text: Whole number followed by m (minutes), h, d or w
+
+    Returns:
+        Parsed duration
+
+    Raises:
+        ValueError: If the duration is malformed
+    """
+    units = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+    number, unit = text[:-1], text[-1:]
+    if unit not in units or not number.isdigit():
+        raise ValueError(f"Invalid duration (expected e.g. 30d, 12h, 45m or 2w): {text}")
+    return timedelta(**{units[unit]: int(number)})
+
+
 def acquire_lock(lock_file: Path) -> bool:
     """Acquire a file lock.
 
@@ -147,3 +190,30 @@ def ensure_parent_dir(file_path: Path):
         file_path: Path to file
     """
     file_path.parent.mkdir(parents=True, exist_ok=True)
+
+
+def iter_jsonl(path: str) -> Iterator[dict]:
+    """Stream objects from a JSON Lines file.
+
+    Args:
+        path: Path to the file, or '-' for standard input
+
+    Yields:
+        One parsed object per non-blank line
+
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    f = sys.stdin if path == '-' else open(path, 'r')
+    try:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON: {e}")
+    finally:
+        if f is not sys.stdin:
+            f.close()
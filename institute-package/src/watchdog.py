@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 """Watchdog daemon for the Institute system."""
-import sqlite3
 import sys
 import time
 from datetime import datetime
@@ -36,14 +35,11 @@ class Watchdog:
 
     def update_heartbeat(self):
         """Update watchdog heartbeat in system.db."""
-        conn = sqlite3.connect(str(self.config.system_db))
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR REPLACE INTO heartbeats (component, last_beat, status) VALUES (?, datetime('now'), 'OK')",
-            ('watchdog',)
-        )
-        conn.commit()
-        conn.close()
+        with self.config.transaction(self.config.system_db) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO heartbeats (component, last_beat, status) VALUES (?, datetime('now'), 'OK')",
+                ('watchdog',)
+            )
 
     def check_disk_usage(self) -> list:
         """Check disk usage and create alerts if needed.
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Test script for sandbox mode."""
+import os
+import subprocess
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add the src directory to the path
@@ -13,6 +16,8 @@ import queue_manager
 import state_manager
 import audit_logger
 import lockdown
+import task_processor
+import task_archiver
 
 def test_initialization():
     """Test database initialization."""
@@ -37,6 +42,27 @@ def test_initialization():
         print(f"  {status} {db_name}.db")
 
     all_ok = all(results.values())
+
+    # A profile override is stored for the install, not just this Config
+    db_init.DatabaseInitializer(cfg, schema_dir=schema_dir, profile={'cache_size': -32000}).initialize_all()
+    other = config.Config('./sandbox-institute')
+    profile = db_init.DatabaseInitializer(other).get_profile(other.research_db)
+    other.set_config_value('sqlite_cache_size', str(config.Config.SQLITE_PROFILE['cache_size']))
+    override_ok = profile['cache_size'] == -32000
+    print(f"{'✓' if override_ok else '✗'} SQLite profile override seen by a second Config")
+
+    # A warm config snapshot picks up a change committed by another process
+    assert cfg.get_config_value('max_workers') == '1', "Unexpected max_workers"
+    result = subprocess.run([
+        sys.executable, '-c',
+        "import sys; sys.path.insert(0, 'institute-package/src'); import config;"
+        "config.Config('./sandbox-institute').set_config_value('max_workers', '3')"
+    ], capture_output=True, text=True)
+    snapshot_ok = result.returncode == 0 and cfg.get_config_value('max_workers') == '3'
+    cfg.set_config_value('max_workers', '1')
+    print(f"{'✓' if snapshot_ok else '✗'} Config snapshot reloaded after 'config set' in another process")
+
+    all_ok = all_ok and override_ok and snapshot_ok
     print(f"\nResult: {'PASS' if all_ok else 'FAIL'}\n")
     return all_ok
 
@@ -65,6 +91,19 @@ def test_state_manager():
     assert mode == 'NORMAL', f"Expected NORMAL, got {mode}"
     print("✓ Mode changed back to NORMAL")
 
+    # The cached mode follows a lockdown entered through another connection
+    import sqlite3
+    assert sm.can_process_tasks(), "Tasks blocked in NORMAL mode"
+    other = sqlite3.connect(str(cfg.system_db))
+    other.execute("INSERT INTO system_mode (mode, reason) VALUES ('LOCKDOWN', 'Lockdown from another process')")
+    other.commit()
+    assert not sm.can_process_tasks(), "Cached mode still allows tasks during lockdown"
+    other.execute("INSERT INTO system_mode (mode, reason) VALUES ('NORMAL', 'Lockdown lifted')")
+    other.commit()
+    other.close()
+    assert sm.can_process_tasks(), "Cached mode still blocks tasks after lockdown"
+    print("✓ Cached mode follows changes made by another connection")
+
     print(f"\nResult: PASS\n")
     return True
 
@@ -91,13 +130,196 @@ def test_audit_logger():
     status = "✓" if integrity_ok else "✗"
     print(f"{status} Audit log integrity check")
 
-    print(f"\nResult: {'PASS' if integrity_ok else 'FAIL'}\n")
-    return integrity_ok
+    group_commit_ok = test_audit_group_commit(cfg)
+
+    all_ok = integrity_ok and group_commit_ok
+    print(f"\nResult: {'PASS' if all_ok else 'FAIL'}\n")
+    return all_ok
+
+def test_audit_group_commit(cfg):
+    """Test the flush triggers of a group-commit audit logger."""
+    import subprocess
+    import threading
+    import time
+
+    def written(target):
+        conn = cfg.connection(cfg.audit_db)
+        return conn.execute("SELECT COUNT(*) FROM log WHERE target = ?", (target,)).fetchone()[0]
+
+    buffered = audit_logger.AuditLogger(cfg, group_commit=True, flush_size=3, flush_interval=0.2)
+
+    # Batch size: the third entry writes all three
+    buffered.log('system', 'group_commit_test', 'gc_batch')
+    buffered.log('system', 'group_commit_test', 'gc_batch')
+    before = written('gc_batch')
+    buffered.log('system', 'group_commit_test', 'gc_batch')
+    batch_ok = before == 0 and written('gc_batch') == 3
+    print(f"{'✓' if batch_ok else '✗'} Buffer flushed at flush_size entries")
+
+    # Interval: a lone entry is written by the timer
+    buffered.log('system', 'group_commit_test', 'gc_timer')
+    before = written('gc_timer')
+    time.sleep(0.5)
+    timer_ok = before == 0 and written('gc_timer') == 1
+    print(f"{'✓' if timer_ok else '✗'} Buffer flushed after flush_interval")
+
+    # Critical actions are written at once, with what is buffered before them
+    slow = audit_logger.AuditLogger(cfg, group_commit=True, flush_size=100, flush_interval=60)
+    slow.log('system', 'group_commit_test', 'gc_critical')
+    slow.log('system', 'role_violation', 'gc_critical')
+    critical_ok = written('gc_critical') == 2
+    print(f"{'✓' if critical_ok else '✗'} Critical action flushed immediately")
+
+    # Process exit: atexit writes what is still buffered
+    script = (
+        "import sys; sys.path.insert(0, 'institute-package/src');"
+        "import config, audit_logger;"
+        "al = audit_logger.AuditLogger(config.Config('./sandbox-institute'), group_commit=True,"
+        " flush_size=100, flush_interval=60);"
+        "al.log('system', 'group_commit_test', 'gc_atexit')"
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True)
+    atexit_ok = result.returncode == 0 and written('gc_atexit') == 1
+    print(f"{'✓' if atexit_ok else '✗'} Buffer flushed at process exit")
+
+    # The exit hook does not keep flushed loggers alive
+    import gc
+    import weakref
+    released = audit_logger.AuditLogger(cfg, group_commit=True, flush_size=1)
+    released.log('system', 'group_commit_test', 'gc_released')
+    released_ref = weakref.ref(released)
+    del released
+    gc.collect()
+    release_ok = released_ref() is None and written('gc_released') == 1
+    print(f"{'✓' if release_ok else '✗'} Flushed logger released, not held by the exit hook")
+
+    # Batches from two loggers interleave without forking the chain
+    loggers = [
+        audit_logger.AuditLogger(cfg, group_commit=True, flush_size=7, flush_interval=0.05)
+        for _ in range(2)
+    ]
+
+    def write_entries(logger, n):
+        for i in range(50):
+            logger.log('system', 'group_commit_test', 'gc_mixed', f"logger {n} entry {i}")
+
+    threads = [threading.Thread(target=write_entries, args=(logger, n)) for n, logger in enumerate(loggers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for logger in loggers:
+        logger.flush()
+
+    mixed_ok = written('gc_mixed') == 100 and buffered.verify_integrity(full=True)
+    print(f"{'✓' if mixed_ok else '✗'} Interleaved batches from two loggers keep a valid chain")
+
+    return batch_ok and timer_ok and critical_ok and atexit_ok and release_ok and mixed_ok
+
+def test_audit_chain():
+    """Test hash-chained audit log verification."""
+    print("=" * 50)
+    print("Test 4: Audit Hash Chain")
+    print("=" * 50)
+
+    cfg = config.Config('./sandbox-institute')
+    al = audit_logger.AuditLogger(cfg)
+
+    al.log('system', 'chain_test', 'entry_1')
+    al.log('system', 'chain_test', 'entry_2')
+
+    # First call walks the chain and records a checkpoint
+    assert al.verify_integrity(), "Incremental verification failed"
+    assert al.verify_integrity(full=True), "Full verification failed"
+    print("\n✓ Incremental and full verification pass")
+
+    # Tamper with an entry behind the checkpoint
+    conn = cfg.connection(cfg.audit_db)
+    entry_id, details = conn.execute(
+        "SELECT id, details FROM log WHERE target = 'entry_1'"
+    ).fetchone()
+    conn.execute("UPDATE log SET details = 'tampered' WHERE id = ?", (entry_id,))
+    conn.commit()
+
+    tamper_detected = not al.verify_integrity(full=True)
+    scrub_detected = not al.verify_integrity()
+
+    # With a small scrub batch the entry is reached within a few calls
+    al.SCRUB_BATCH = 5
+    entry_count = conn.execute("SELECT COUNT(*) FROM log").fetchone()[0]
+    calls = 0
+    while calls <= entry_count // al.SCRUB_BATCH + 1 and al.verify_integrity():
+        calls += 1
+    scrub_detected = scrub_detected and calls <= entry_count // al.SCRUB_BATCH + 1
+
+    # Editing the checkpointed entry itself is caught on the next call
+    checkpoint_id = conn.execute("SELECT last_id FROM verification_checkpoint").fetchone()[0]
+    checkpoint_details = conn.execute("SELECT details FROM log WHERE id = ?", (checkpoint_id,)).fetchone()[0]
+    conn.execute("UPDATE log SET details = ? WHERE id = ?", (details, entry_id))
+    conn.execute("UPDATE log SET details = 'tampered' WHERE id = ?", (checkpoint_id,))
+    conn.commit()
+    al.SCRUB_BATCH = 0
+    checkpoint_detected = not al.verify_integrity()
+    del al.SCRUB_BATCH
+
+    # Restore the entries so later tests see a valid chain
+    conn.execute("UPDATE log SET details = ? WHERE id = ?", (checkpoint_details, checkpoint_id))
+    conn.commit()
+
+    status = "✓" if tamper_detected else "✗"
+    print(f"{status} Full verification detects tampered entry")
+    status = "✓" if scrub_detected else "✗"
+    print(f"{status} Incremental verification detects entry edited behind the checkpoint")
+    status = "✓" if checkpoint_detected else "✗"
+    print(f"{status} Incremental verification detects edited checkpoint entry")
+    tamper_detected = tamper_detected and scrub_detected and checkpoint_detected
+
+    parallel_ok = test_audit_parallel_verify(cfg)
+
+    all_ok = tamper_detected and parallel_ok
+    print(f"\nResult: {'PASS' if all_ok else 'FAIL'}\n")
+    return all_ok
+
+def test_audit_parallel_verify(cfg):
+    """Test that parallel verification agrees with serial verification."""
+    al = audit_logger.AuditLogger(cfg)
+    # Use the process pool however small the log is
+    al.PARALLEL_MIN_ENTRIES = 0
+    workers = 2
+
+    for i in range(40):
+        al.log('system', 'parallel_test', f"entry_{i}")
+
+    conn = cfg.connection(cfg.audit_db)
+    min_id, max_id = conn.execute("SELECT MIN(id), MAX(id) FROM log").fetchone()
+    ranges = audit_logger.id_ranges(min_id, max_id, workers * al.RANGES_PER_WORKER)
+
+    valid_ok = al.find_first_invalid(workers) is None and al.find_first_invalid(1) is None
+    print(f"{'✓' if valid_ok else '✗'} Parallel and serial verification accept a valid chain")
+
+    # Entries on both sides of a range boundary
+    boundary_ok = len(ranges) > 1
+    for entry_id in (ranges[1][0], ranges[0][1]):
+        details = conn.execute("SELECT details FROM log WHERE id = ?", (entry_id,)).fetchone()[0]
+        conn.execute("UPDATE log SET details = 'tampered' WHERE id = ?", (entry_id,))
+        conn.commit()
+
+        serial_id = al.find_first_invalid(1)
+        parallel_id = al.find_first_invalid(workers)
+
+        conn.execute("UPDATE log SET details = ? WHERE id = ?", (details, entry_id))
+        conn.commit()
+
+        boundary_ok = boundary_ok and serial_id == parallel_id == entry_id
+
+    print(f"{'✓' if boundary_ok else '✗'} Parallel verification finds tampering at range boundaries")
+
+    return valid_ok and boundary_ok
 
 def test_task_queue():
     """Test task queue."""
     print("=" * 50)
-    print("Test 4: Task Queue Manager")
+    print("Test 5: Task Queue Manager")
     print("=" * 50)
 
     cfg = config.Config('./sandbox-institute')
@@ -115,7 +337,7 @@ def test_task_queue():
     al.log('researcher', 'task_created', f'task_{task2_id}', 'Test task 2')
 
     # List tasks
-    tasks = qm.list_tasks()
+    tasks = list(qm.list_tasks())
     print(f"\n✓ Listed {len(tasks)} tasks")
 
     # Get task status
@@ -128,13 +350,382 @@ def test_task_queue():
     assert task_status['status'] == 'completed', "Task status not updated"
     print(f"✓ Updated task {task1_id} to completed")
 
+    # Queue files in the old flat layout are moved into ID shards
+    legacy_file = cfg.queues_research_failed / "1234.json"
+    legacy_file.write_text('{}')
+    assert qm.move_task(1234, 'failed', 'pending'), "Flat-layout file not moved"
+    (cfg.queues_research_completed / "2345.json").write_text('{}')
+    assert qm.migrate_queue_layout() == 1, "Flat-layout file not migrated"
+    assert not (cfg.queues_research_completed / "2345.json").exists(), "Flat-layout file left behind"
+    assert qm.find_task_file(2345, 'completed') == cfg.queues_research_completed / "2" / "2345.json", "Not migrated to shard"
+    assert qm.find_task_file(1234, 'pending') == cfg.queues_research_pending / "1" / "1234.json", "Shard not used"
+    qm.find_task_file(1234, 'pending').unlink()
+    qm.find_task_file(2345, 'completed').unlink()
+    print("✓ Queue files sharded by task ID")
+
+    print(f"\nResult: PASS\n")
+    return True
+
+def test_task_claim():
+    """Test atomic task claiming from research.db."""
+    print("=" * 50)
+    print("Test 6: Task Claim")
+    print("=" * 50)
+
+    cfg = config.Config('./sandbox-institute')
+    qm = queue_manager.QueueManager(cfg)
+
+    # Drain whatever earlier tests left pending
+    while qm.claim_next_task('drain', 60) is not None:
+        pass
+
+    first_id = qm.create_task("Claim Task 1")
+    second_id = qm.create_task("Claim Task 2")
+
+    claimed = qm.claim_next_task('worker-a', 60)
+    assert claimed['id'] == first_id, f"Expected task {first_id}, got {claimed['id']}"
+    assert qm.get_task_status(first_id)['status'] == 'processing', "Claimed task not processing"
+    print(f"\n✓ Claimed oldest pending task {first_id}")
+
+    claimed = qm.claim_next_task('worker-a', 60)
+    assert claimed['id'] == second_id, f"Expected task {second_id}, got {claimed['id']}"
+    assert qm.claim_next_task('worker-b', 60) is None, "Claimed a task twice"
+    print("✓ Each task claimed exactly once")
+
+    # Simulate worker-a dying: its expired lease is taken over by worker-b
+    with cfg.transaction(cfg.research_db) as conn:
+        conn.execute(
+            "UPDATE tasks SET lease_expires_at = datetime('now', '-1 seconds') WHERE id = ?",
+            (first_id,)
+        )
+    claimed = qm.claim_next_task('worker-b', 60)
+    assert claimed['id'] == first_id, "Expired lease not reclaimed"
+    assert claimed['reclaimed_from'] == 'worker-a', "Reclaim not attributed to the old worker"
+    assert not qm.update_task_status(first_id, 'completed', worker_id='worker-a'), \
+        "Stale worker overwrote a reclaimed task"
+    assert qm.update_task_status(first_id, 'completed', worker_id='worker-b'), \
+        "Lease holder could not complete its task"
+    print("✓ Expired lease reclaimed and stale worker fenced out")
+
+    # Highest priority first, FIFO within a priority
+    low_id = qm.create_task("Low", priority=0)
+    high_id = qm.create_task("High", priority=5)
+    assert qm.claim_next_task('worker-a', 60)['id'] == high_id, "Priority not honored"
+    print("✓ Highest-priority task claimed first")
+
+    # Waiting raises priority up to task_aging_max_boost (5): an aged
+    # backlog overtakes newer work, but not urgent work
+    backlog = [low_id, *qm.create_tasks({'name': f"Backlog {i}"} for i in range(3))]
+    with cfg.transaction(cfg.research_db) as conn:
+        conn.executemany(
+            "UPDATE tasks SET created_at = datetime('now', '-2 days') WHERE id = ?",
+            [(task_id,) for task_id in backlog]
+        )
+    normal_id = qm.create_task("Normal", priority=3)
+    urgent_id = qm.create_task("Urgent", priority=9)
+    claimed = [qm.claim_next_task('worker-a', 60)['id'] for _ in range(len(backlog) + 2)]
+    assert claimed[0] == urgent_id, "Urgent task waited behind the aged backlog"
+    assert claimed[1:-1] == backlog, "Aged task starved"
+    assert claimed[-1] == normal_id, "Newer task overtook the aged backlog"
+    print("✓ Urgent task beats an aged backlog, which beats newer work")
+
+    # A failed attempt is retried after its backoff, then dead-lettered
+    retry_id = qm.create_task("Flaky", max_attempts=2)
+    assert qm.claim_next_task('worker-a', 60)['id'] == retry_id, "Flaky task not claimed"
+    outcome = qm.fail_task(retry_id, "transient error", 'worker-a')
+    assert not outcome['dead_lettered'] and outcome['next_attempt_at'], "Retry not scheduled"
+    assert qm.claim_next_task('worker-a', 60) is None, "Retry claimed before its backoff"
+
+    with cfg.transaction(cfg.research_db) as conn:
+        conn.execute(
+            "UPDATE tasks SET next_attempt_at = datetime('now', '-1 seconds') WHERE id = ?",
+            (retry_id,)
+        )
+    claimed = qm.claim_next_task('worker-a', 60)
+    assert claimed['id'] == retry_id and claimed['attempts'] == 2, "Due retry not claimed"
+    assert qm.fail_task(retry_id, "still failing", 'worker-a')['dead_lettered'], "Task not dead-lettered"
+    assert [d['task_id'] for d in qm.list_dead_letters()] == [retry_id], "Dead letter not listed"
+    print("✓ Failed task retried after backoff, then dead-lettered")
+
+    assert qm.requeue_task(retry_id) == [retry_id], "Dead-lettered task not requeued"
+    assert qm.claim_next_task('worker-a', 60)['id'] == retry_id, "Requeued task not claimable"
+    qm.update_task_status(retry_id, 'completed', worker_id='worker-a')
+    assert qm.get_task_status(retry_id)['error_message'] is None, "Error of a failed attempt kept"
+    print("✓ Dead-lettered task requeued")
+
+    # A pipeline submitted in one import: prepare -> (analyze a, analyze b) -> summarize
+    prep_id, a_id, b_id, summary_id = qm.create_tasks([
+        {'name': 'Prepare', 'key': 'prep'},
+        {'name': 'Analyze A', 'key': 'a', 'depends_on': ['prep']},
+        {'name': 'Analyze B', 'key': 'b', 'depends_on': ['prep']},
+        {'name': 'Summarize', 'depends_on': ['a', 'b']}
+    ])
+    assert qm.claim_next_task('worker-a', 60)['id'] == prep_id, "Root task not claimed"
+    assert qm.claim_next_task('worker-a', 60) is None, "Dependent task claimed too early"
+    qm.update_task_status(prep_id, 'completed', worker_id='worker-a')
+
+    branches = {qm.claim_next_task('worker-a', 60)['id'], qm.claim_next_task('worker-b', 60)['id']}
+    assert branches == {a_id, b_id}, "Independent branches not released together"
+    qm.update_task_status(a_id, 'completed', worker_id='worker-a')
+    assert qm.claim_next_task('worker-a', 60) is None, "Join released before both parents"
+    qm.update_task_status(b_id, 'completed', worker_id='worker-b')
+    assert qm.claim_next_task('worker-a', 60)['id'] == summary_id, "Join not released"
+    print("✓ Dependent tasks released as their parents complete")
+
+    for bad_batch in ([{'name': 'X', 'key': 'x', 'depends_on': ['y']},
+                       {'name': 'Y', 'key': 'y', 'depends_on': ['x']}],
+                      [{'name': 'Orphan', 'depends_on': [10 ** 9]}]):
+        try:
+            qm.create_tasks(bad_batch)
+            print("✗ Invalid dependencies accepted")
+            return False
+        except ValueError:
+            pass
+    print("✓ Dependency cycles and unknown parents rejected")
+
+    parent_id = qm.create_task("Parent", max_attempts=1)
+    child_id = qm.create_task("Child", depends_on=[parent_id])
+    assert qm.claim_next_task('worker-a', 60)['id'] == parent_id, "Parent not claimed"
+    outcome = qm.fail_task(parent_id, "broken", 'worker-a')
+    assert outcome['dependents_failed'] == [child_id], "Dependent not failed with its parent"
+    assert qm.get_task_status(child_id)['dead_lettered'], "Dependent not dead-lettered"
+    print("✓ Dependents of a dead-lettered task fail with it")
+
+    try:
+        qm.requeue_task(child_id)
+        print("✗ Dependent requeued while its parent is dead-lettered")
+        return False
+    except ValueError:
+        pass
+    assert qm.requeue_task(parent_id) == [parent_id, child_id], "Dependent not requeued with its parent"
+    child = qm.get_task_status(child_id)
+    assert child['status'] == 'pending' and child['waiting_on'] == 1, f"Dependent not waiting: {child}"
+    assert qm.claim_next_task('worker-a', 60)['id'] == parent_id, "Requeued parent not claimed"
+    qm.update_task_status(parent_id, 'completed', worker_id='worker-a')
+    assert qm.claim_next_task('worker-a', 60)['id'] == child_id, "Requeued dependent not released"
+    qm.update_task_status(child_id, 'completed', worker_id='worker-a')
+    print("✓ Requeued task brings back its dependents")
+
+    print(f"\nResult: PASS\n")
+    return True
+
+def test_bulk_create():
+    """Test bulk task creation."""
+    print("=" * 50)
+    print("Test 7: Bulk Task Creation")
+    print("=" * 50)
+
+    cfg = config.Config('./sandbox-institute')
+    qm = queue_manager.QueueManager(cfg)
+
+    task_ids = qm.create_tasks({'name': f"Sweep {i}", 'description': f"p={i}"} for i in range(100))
+    assert len(task_ids) == 100, f"Expected 100 tasks, got {len(task_ids)}"
+    assert qm.get_task_status(task_ids[-1])['name'] == "Sweep 99", "Task IDs not contiguous"
+    print(f"\n✓ Created tasks {task_ids[0]}-{task_ids[-1]} in one transaction")
+
+    # Listing pages continue from the last task of the previous page
+    first_page = [t['id'] for t in qm.list_tasks(limit=60, page_size=25)]
+    next_page = [t['id'] for t in qm.list_tasks(limit=60, after_id=first_page[-1])]
+    assert first_page + next_page[:40] == list(task_ids)[::-1], "Task listing pages out of order"
+    print("✓ Task listing paged newest first")
+
+    # A bad entry rolls back the whole batch
+    try:
+        qm.create_tasks([{'name': 'Valid'}, {'description': 'No name'}])
+        print("✗ Invalid batch accepted")
+        return False
+    except ValueError:
+        pass
+    assert qm.get_task_status(task_ids[-1] + 1) is None, "Partial batch was committed"
+    print("✓ Invalid batch rejected without creating tasks")
+
+    # Admission control: per-user pending limit, then the submission rate
+    cfg.current_user = 'sweeper'
+    try:
+        cfg.set_config_value('task_max_pending_per_user', '3')
+        qm.create_tasks({'name': f"Limited {i}"} for i in range(2))
+        try:
+            qm.create_tasks({'name': f"Over {i}"} for i in range(2))
+            print("✗ Batch over the per-user limit accepted")
+            return False
+        except queue_manager.QueueFullError as e:
+            assert e.retry_after > 0, "No retry hint"
+        qm.create_task("Last allowed")
+        try:
+            qm.create_task("One too many")
+            print("✗ Task over the per-user limit accepted")
+            return False
+        except queue_manager.QueueFullError:
+            pass
+        print("✓ Per-user pending limit enforced")
+
+        cfg.set_config_value('task_max_pending_per_user', '0')
+        cfg.set_config_value('task_submit_rate', '0.5')
+        cfg.set_config_value('task_submit_burst', '2')
+        qm.create_tasks({'name': f"Burst {i}"} for i in range(2))
+        try:
+            qm.create_task("Too fast")
+            print("✗ Submission over the rate limit accepted")
+            return False
+        except queue_manager.QueueFullError as e:
+            assert e.retry_after == 2, f"Unexpected retry hint: {e.retry_after}"
+            assert "queue full, retry after 2 seconds" in str(e), str(e)
+        print("✓ Submission rate limited by token bucket")
+    finally:
+        cfg.set_config_value('task_max_pending_per_user', '100000')
+        cfg.set_config_value('task_submit_rate', '0')
+        cfg.current_user = None
+
+    print(f"\nResult: PASS\n")
+    return True
+
+def test_task_handlers():
+    """Test task-type handler loading and execution."""
+    print("=" * 50)
+    print("Test 8: Task Handlers")
+    print("=" * 50)
+
+    cfg = config.Config('./sandbox-institute')
+    qm = queue_manager.QueueManager(cfg)
+    processor = task_processor.TaskProcessor(cfg)
+
+    # A handler module under research/scripts, loaded by type name
+    (cfg.research_scripts_dir / 'square.py').write_text(
+        "def handle(task_data, context):\n"
+        "    out = context.make_output_dir() / 'result.txt'\n"
+        "    out.write_text(str(context.params['n'] ** 2))\n"
+    )
+
+    task_id = qm.create_task("Square", task_type='square', params={'n': 7})
+    task = qm.get_task_status(task_id)
+    assert task['type'] == 'square' and task['params'] == {'n': 7}, "Type/params not stored"
+
+    assert processor.execute_task(task), "Handler reported failure"
+    result = (cfg.research_outputs_dir / str(task_id) / 'result.txt').read_text()
+    assert result == '49', f"Unexpected handler output: {result}"
+    print(f"\n✓ Script handler ran task {task_id}")
+
+    assert processor.handlers.get('square') is processor.handlers.get('square'), "Handler not cached"
+    print("✓ Handler loaded once and cached")
+
+    try:
+        processor.execute_task({'id': 0, 'type': 'no_such_type', 'params': {}})
+        print("✗ Unknown task type executed")
+        return False
+    except LookupError:
+        print("✓ Unknown task type rejected")
+
+    try:
+        qm.create_task("Bad", task_type='../escape')
+        print("✗ Invalid task type accepted")
+        return False
+    except ValueError:
+        print("✓ Invalid task type name rejected")
+
+    # Findings are written in batches and read back a page at a time
+    (cfg.research_scripts_dir / 'many_findings.py').write_text(
+        "def handle(task_data, context):\n"
+        "    context.findings.extend(f'value {i}' for i in range(2500))\n"
+    )
+    task_id = qm.create_task("Many findings", task_type='many_findings')
+    assert processor.execute_task(qm.get_task_status(task_id)), "Findings task failed"
+    assert qm.count_findings(task_id) == 2500, "Findings not all written"
+    page = qm.get_findings(task_id, limit=1000)
+    page = qm.get_findings(task_id, limit=1000, after_id=page[-1]['id'])
+    assert page[0]['content'] == 'value 1000' and len(page) == 1000, "Findings page out of order"
+    print(f"✓ 2500 findings written in batches and paged")
+
+    # Findings of failed attempts are not repeated by the retries
+    (cfg.research_scripts_dir / 'flaky_findings.py').write_text(
+        "def handle(task_data, context):\n"
+        "    context.findings.extend(['a', 'b', 'c'])\n"
+        "    if task_data['attempts'] < 3:\n"
+        "        raise RuntimeError('transient')\n"
+    )
+    cfg.set_config_value('task_retry_base_seconds', '0')
+    try:
+        task_id = qm.create_task("Flaky findings", task_type='flaky_findings', priority=100, max_attempts=3)
+        for _ in range(3):
+            task = qm.claim_next_task('worker-a', 60)
+            assert task['id'] == task_id, "Retry not claimed"
+            try:
+                processor.execute_task(task)
+            except RuntimeError as e:
+                qm.fail_task(task_id, str(e), 'worker-a')
+        qm.update_task_status(task_id, 'completed', worker_id='worker-a')
+    finally:
+        cfg.set_config_value('task_retry_base_seconds', '60')
+    assert qm.count_findings(task_id) == 3, f"Expected 3 findings, got {qm.count_findings(task_id)}"
+    print("✓ Findings of failed attempts not repeated by retries")
+
+    # Result cache: identical type, params and inputs reuse earlier outputs
+    (cfg.research_data_dir / 'values.csv').write_text("1,2,3")
+    (cfg.research_scripts_dir / 'count_values.py').write_text(
+        "runs = 0\n"
+        "def handle(task_data, context):\n"
+        "    global runs\n"
+        "    runs += 1\n"
+        "    values = (context.config.research_data_dir / context.params['inputs'][0]).read_text()\n"
+        "    (context.make_output_dir() / 'count.txt').write_text(str(len(values.split(','))))\n"
+        "    context.findings.add({'count': len(values.split(','))})\n"
+    )
+    params = {'inputs': ['values.csv']}
+
+    def run_cached():
+        task_id = qm.create_task("Count", task_type='count_values', params=params, cacheable=True)
+        assert processor.execute_task(qm.get_task_status(task_id)), "Cacheable task failed"
+        count = (cfg.research_outputs_dir / str(task_id) / 'count.txt').read_text()
+        return task_id, count, sys.modules['institute_task_handlers.count_values'].runs
+
+    first_id, count, runs = run_cached()
+    assert (count, runs) == ('3', 1), "Cacheable task did not run"
+    second_id, count, runs = run_cached()
+    assert (count, runs) == ('3', 1), "Identical task was recomputed"
+    assert qm.get_task_status(second_id)['cache_hit'], "Cache hit not recorded"
+    assert not qm.get_task_status(first_id)['cache_hit'], "Miss recorded as a hit"
+    assert [f['content'] for f in qm.get_findings(second_id)] == ['{"count": 3}'], \
+        "Findings not copied on a cache hit"
+    print("✓ Identical task served from the result cache")
+
+    (cfg.research_data_dir / 'values.csv').write_text("1,2,3,4")
+    _, count, runs = run_cached()
+    assert (count, runs) == ('4', 2), "Changed input served stale result"
+    print("✓ Changed input invalidates the cached result")
+
+    # Isolated execution: output captured, hung tasks killed at the timeout
+    (cfg.research_scripts_dir / 'chatty.py').write_text(
+        "import time\n"
+        "def handle(task_data, context):\n"
+        "    print('hello from', context.task_id)\n"
+        "    time.sleep(context.params.get('sleep', 0))\n"
+    )
+    cfg.set_config_value('task_isolation', 'subprocess')
+    cfg.set_config_value('task_timeout_seconds', '1')
+    try:
+        task_id = qm.create_task("Chatty", task_type='chatty')
+        assert processor.execute_task(qm.get_task_status(task_id)), "Isolated task failed"
+        stdout = (cfg.research_outputs_dir / str(task_id) / 'stdout.log').read_text()
+        assert stdout == f"hello from {task_id}\n", f"Unexpected stdout: {stdout!r}"
+        print("✓ Isolated task ran with captured stdout")
+
+        task_id = qm.create_task("Hung", task_type='chatty', params={'sleep': 30})
+        try:
+            processor.execute_task(qm.get_task_status(task_id))
+            print("✗ Hung task not killed")
+            return False
+        except task_processor.TaskExecutionError as e:
+            assert str(e).startswith("Timed out after 1s"), f"Unexpected error: {e}"
+            print(f"✓ Hung task killed: {e}")
+    finally:
+        cfg.set_config_value('task_isolation', 'none')
+
     print(f"\nResult: PASS\n")
     return True
 
 def test_lockdown():
     """Test lockdown manager."""
     print("=" * 50)
-    print("Test 5: Lockdown Manager")
+    print("Test 9: Lockdown Manager")
     print("=" * 50)
 
     cfg = config.Config('./sandbox-institute')
@@ -145,6 +736,54 @@ def test_lockdown():
     status = lm.get_lockdown_status()
     print(f"\nInitial mode: {status['mode']}")
 
+    # Counters kept by triggers agree with a full count
+    conn = cfg.connection(cfg.research_db)
+    counted = dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+    assert {k: v for k, v in status['task_counts'].items() if v} == counted, "Task counters out of step"
+
+    conn = cfg.connection(cfg.management_db)
+    with cfg.transaction(cfg.management_db) as tx:
+        tx.execute("INSERT INTO escalations (code, level, message) VALUES ('TEST_A', 'L1', 'a'), ('TEST_B', 'L2', 'b')")
+        tx.execute("UPDATE escalations SET state = 'ACKNOWLEDGED', level = 'L3' WHERE code = 'TEST_A'")
+        tx.execute("DELETE FROM escalations WHERE code = 'TEST_B'")
+    counted = dict(conn.execute("SELECT state, COUNT(*) FROM escalations GROUP BY state").fetchall())
+    assert lm.get_lockdown_status()['escalation_counts'] == counted, "Escalation counters out of step"
+    with cfg.transaction(cfg.management_db) as tx:
+        tx.execute("DELETE FROM escalations WHERE code = 'TEST_A'")
+    print("✓ Task and escalation counters match full counts")
+
+    # A researcher session has no management or audit database attached
+    import sqlite3
+    with cfg.read_session('researcher') as session:
+        hidden = []
+        for table in ('management.config', 'audit.log'):
+            try:
+                session.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchall()
+            except sqlite3.OperationalError:
+                hidden.append(table)
+    assert hidden == ['management.config', 'audit.log'], f"Researcher session can read {hidden}"
+    print("✓ Researcher read session cannot see management.db or audit.db")
+
+    # Reads in one session see one snapshot while another connection writes
+    qm = queue_manager.QueueManager(cfg)
+    with cfg.read_session() as session:
+        mode = session.execute("SELECT mode FROM system.system_mode ORDER BY id DESC LIMIT 1").fetchone()[0]
+        depths = qm.get_queue_depths(session)
+        task_id = qm.create_task("Written during a read session")
+        sm.set_mode('ALERT', 'Written during a read session')
+        assert session.execute(
+            "SELECT mode FROM system.system_mode ORDER BY id DESC LIMIT 1"
+        ).fetchone()[0] == mode, "Mode changed within the session"
+        assert qm.get_queue_depths(session) == depths, "Queue depths changed within the session"
+    with cfg.read_session() as session:
+        assert session.execute(
+            "SELECT mode FROM system.system_mode ORDER BY id DESC LIMIT 1"
+        ).fetchone()[0] == 'ALERT', "New session missed the mode change"
+        assert qm.get_queue_depths(session)['pending'] == depths['pending'] + 1, "New session missed the task"
+    sm.set_mode('NORMAL', 'Read session test done')
+    qm.update_task_status(task_id, 'completed')
+    print("✓ Read session sees one snapshot across databases during concurrent writes")
+
     # Trigger lockdown
     lm.trigger_lockdown("Testing lockdown functionality")
     mode, _, _ = sm.get_mode()
@@ -167,7 +806,7 @@ def test_lockdown():
 def test_cli_researcher():
     """Test CLI as researcher."""
     print("=" * 50)
-    print("Test 6: CLI - Researcher Commands")
+    print("Test 10: CLI - Researcher Commands")
     print("=" * 50)
 
     import subprocess
@@ -203,6 +842,53 @@ def test_cli_researcher():
         print(f"✗ Task list failed: {result.stderr}")
         return False
 
+    def task_list(*options):
+        result = subprocess.run([
+            'python3', './institute-package/src/cli.py',
+            '--role=researcher',
+            '--base-path=./sandbox-institute',
+            'task', 'list', *options
+        ], capture_output=True, text=True)
+        ids = [int(line.split()[0]) for line in result.stdout.splitlines() if line.split()[0].isdigit()]
+        return result, ids
+
+    # --since accepts any ISO 8601 form and compares in UTC
+    cfg = config.Config('./sandbox-institute')
+    created_at = cfg.connection(cfg.research_db).execute(
+        "SELECT created_at FROM tasks WHERE name = 'CLI Test Task'"
+    ).fetchone()[0]
+    created = datetime.fromisoformat(created_at)
+    hour_before = created - timedelta(hours=1)
+    for since in (hour_before.strftime('%Y%m%dT%H%M%S'),
+                  (hour_before + timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%S+02:00')):
+        result, ids = task_list('--since', since)
+        if result.returncode != 0 or not ids:
+            print(f"✗ task list --since {since} found no tasks: {result.stdout}{result.stderr}")
+            return False
+    result, ids = task_list('--since', (created + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ'))
+    if result.returncode != 0 or ids:
+        print(f"✗ task list --since in the future listed tasks: {ids}")
+        return False
+    result, _ = task_list('--since', 'yesterday')
+    if result.returncode == 0 or '--since' not in result.stderr:
+        print("✗ task list accepted --since yesterday")
+        return False
+    print("✓ task list --since normalizes dates and UTC offsets")
+
+    # --limit and --after-id page through the whole list
+    _, all_ids = task_list()
+    paged, after = [], []
+    while True:
+        result, ids = task_list('--limit', '50', *after)
+        paged += ids
+        if '--after-id' not in result.stdout:
+            break
+        after = ['--after-id', result.stdout.split('--after-id')[1].split()[0]]
+    if paged != all_ids or len(all_ids) <= 50:
+        print(f"✗ Paging with --limit/--after-id returned {paged}, expected {all_ids}")
+        return False
+    print(f"✓ task list pages through {len(all_ids)} tasks with --limit and --after-id")
+
     # Test role enforcement (should fail)
     result = subprocess.run([
         'python3', './institute-package/src/cli.py',
@@ -223,7 +909,7 @@ def test_cli_researcher():
 def test_cli_director():
     """Test CLI as director."""
     print("=" * 50)
-    print("Test 7: CLI - Director Commands")
+    print("Test 11: CLI - Director Commands")
     print("=" * 50)
 
     import subprocess
@@ -274,6 +960,305 @@ def test_cli_director():
     print(f"\nResult: PASS\n")
     return True
 
+def test_task_archive():
+    """Test archiving old tasks into monthly archive databases."""
+    print("=" * 50)
+    print("Test 12: Task Archive")
+    print("=" * 50)
+
+    cfg = config.Config('./sandbox-institute')
+    qm = queue_manager.QueueManager(cfg)
+    archiver = task_archiver.TaskArchiver(cfg)
+
+    # An old finished task with findings and a queue file, and an old
+    # parent whose dependent has not run yet
+    old_id = qm.create_task("Old analysis")
+    parent_id = qm.create_task("Old parent")
+    child_id = qm.create_task("Pending child", depends_on=[parent_id])
+    for task_id in (old_id, parent_id):
+        qm.update_task_status(task_id, 'completed')
+    with cfg.transaction(cfg.research_db) as conn:
+        conn.executemany("INSERT INTO findings (task_id, content) VALUES (?, ?)", [(old_id, 'a'), (old_id, 'b')])
+        conn.execute("UPDATE tasks SET updated_at = datetime('now', '-40 days') WHERE id IN (?, ?)",
+                     (old_id, parent_id))
+    old_file = qm.task_file(old_id, 'completed')
+    old_file.parent.mkdir(exist_ok=True)
+    old_file.write_text('{"name": "Old analysis"}')
+    completed = qm.get_queue_depths()['completed']
+
+    archived = archiver.archive_tasks(timedelta(days=30))
+    assert sum(archived.values()) == 1, f"Expected one task archived, got {archived}"
+    assert qm.get_queue_depths()['completed'] == completed - 1, "Counters not updated on archive"
+    assert not qm.task_file(old_id, 'completed').exists(), "Queue file left behind"
+    print(f"\n✓ Archived task {old_id} into {cfg.archive_db(list(archived)[0]).name}")
+
+    task = qm.get_task_status(old_id)
+    assert task['archived'] and task['name'] == "Old analysis", "Archived task not found"
+    assert [f['content'] for f in qm.get_findings(old_id)] == ['a', 'b'], "Findings not archived"
+    archive_conn = cfg.connection(cfg.archive_db(task['created_at'][:7]))
+    assert archive_conn.execute("SELECT content FROM queue_files WHERE task_id = ?", (old_id,)).fetchone(), \
+        "Queue file contents not archived"
+    print("✓ Archived task, findings and queue file readable from the archive")
+
+    assert not qm.get_task_status(parent_id)['archived'], "Parent of a pending task archived"
+    assert qm.get_task_status(child_id)['depends_on'] == [parent_id], "Dependency edge lost"
+    assert archiver.archive_tasks(timedelta(days=30)) == {}, "Second run archived again"
+    print("✓ Parent of a pending task kept in research.db")
+
+    # Archived parents: a completed one is satisfied, a failed one is refused
+    failed_id = qm.create_task("Old failure")
+    with cfg.transaction(cfg.research_db) as conn:
+        conn.execute(
+            """UPDATE tasks SET status = 'failed', error_message = 'boom', updated_at = datetime('now', '-40 days')
+               WHERE id = ?""",
+            (failed_id,)
+        )
+    assert sum(archiver.archive_tasks(timedelta(days=30)).values()) == 1, "Failed task not archived"
+    dependent_id = qm.create_task("After archived parent", depends_on=[old_id])
+    assert qm.get_task_status(dependent_id)['waiting_on'] == 0, "Archived completed parent counted as unfinished"
+    try:
+        qm.create_task("After archived failure", depends_on=[failed_id])
+        refused = False
+    except ValueError as e:
+        refused = f"failed task {failed_id}" in str(e)
+    assert refused, "Dependency on an archived failed task accepted"
+    qm.update_task_status(dependent_id, 'completed')
+    print("✓ Dependencies on archived tasks resolved through the archives")
+
+    # A dead-lettered parent and its dead-lettered dependent stay, so the
+    # parent can still be retried with the dependent
+    dead_parent = qm.create_task("Dead parent")
+    dead_child = qm.create_task("Dead child", depends_on=[dead_parent])
+    with cfg.transaction(cfg.research_db, immediate=True) as conn:
+        qm._dead_letter(conn, dead_parent, 'boom')
+        conn.execute("UPDATE tasks SET updated_at = datetime('now', '-40 days') WHERE id IN (?, ?)",
+                     (dead_parent, dead_child))
+    archiver.archive_tasks(timedelta(days=30))
+    assert not qm.get_task_status(dead_parent)['archived'], "Dead-lettered parent archived"
+    assert not qm.get_task_status(dead_child)['archived'], "Dead-lettered dependent archived"
+    try:
+        qm.requeue_task(dead_child)
+        redirected = False
+    except ValueError as e:
+        redirected = "requeue that task instead" in str(e)
+    assert redirected, "Dependent requeued without its parent"
+    assert qm.requeue_task(dead_parent) == [dead_parent, dead_child], "Dead-lettered subtree not requeued"
+    for task_id in (dead_parent, dead_child):
+        qm.update_task_status(task_id, 'completed')
+    print("✓ Dead-lettered subtree kept in research.db and retried after archiving")
+
+    # A queue file that cannot be removed does not abort the committed run
+    stuck_id = qm.create_task("Stuck queue file")
+    qm.update_task_status(stuck_id, 'completed')
+    with cfg.transaction(cfg.research_db) as conn:
+        conn.execute("UPDATE tasks SET updated_at = datetime('now', '-40 days') WHERE id = ?", (stuck_id,))
+    stuck_file = qm.task_file(stuck_id, 'completed')
+    stuck_file.parent.mkdir(exist_ok=True)
+    stuck_file.write_text('{}')
+    stuck_file.parent.chmod(0o555)
+    try:
+        archived = archiver.archive_tasks(timedelta(days=30))
+    finally:
+        stuck_file.parent.chmod(0o755)
+    assert sum(archived.values()) == 1 and qm.get_task_status(stuck_id)['archived'], "Archive run aborted"
+    if os.geteuid() != 0:
+        assert stuck_file.exists(), "Read-only shard not read-only"
+        logged = audit_logger.AuditLogger(cfg).get_recent_logs(1)[0]
+        assert logged[2] == 'archive_queue_files_left', f"Leftover file not reported: {logged}"
+    stuck_file.unlink(missing_ok=True)
+    print("✓ Undeletable queue file reported without aborting the archive run")
+
+    # New shards are group-writable so every role can move files into them
+    shard_file = qm.task_file(987654, 'failed')
+    qm.write_task_file(987654, {})
+    assert qm.move_task(987654, 'pending', 'failed'), "Queue file not moved"
+    shard_mode = shard_file.parent.stat().st_mode
+    shard_file.unlink()
+    assert shard_mode & 0o020, f"Shard not group-writable: {oct(shard_mode)}"
+    print("✓ New queue shards are group-writable")
+
+    print(f"\nResult: PASS\n")
+    return True
+
+def test_task_processor():
+    """Test the task processor's worker pool."""
+    print("=" * 50)
+    print("Test 13: Task Processor")
+    print("=" * 50)
+
+    cfg = config.Config('./sandbox-institute')
+    qm = queue_manager.QueueManager(cfg)
+    processor = task_processor.TaskProcessor(cfg)
+
+    # Drain whatever earlier tests left pending
+    while qm.claim_next_task('drain', 60) is not None:
+        pass
+
+    # A worker process that dies costs an attempt only of the task it ran
+    (cfg.research_scripts_dir / 'crash.py').write_text(
+        "import os, time\n"
+        "def handle(task_data, context):\n"
+        "    if 'runs' in context.params:\n"
+        "        with open(context.params['runs'], 'a') as f:\n"
+        "            f.write(f'{context.task_id}\\n')\n"
+        "    if context.params.get('crash'):\n"
+        "        time.sleep(context.params.get('delay', 0))\n"
+        "        os._exit(1)\n"
+        "    time.sleep(context.params.get('sleep', 0.2))\n"
+    )
+    crash_id = qm.create_task("Crash", task_type='crash', params={'crash': True}, priority=50, max_attempts=2)
+    other_ids = [qm.create_task(f"Survivor {i}", task_type='crash', priority=50) for i in range(6)]
+    cfg.set_config_value('max_workers', '2')
+    cfg.set_config_value('task_pool_mode', 'process')
+    try:
+        processed = processor.process_pending_tasks()
+    finally:
+        cfg.set_config_value('max_workers', '1')
+
+    crashed = qm.get_task_status(crash_id)
+    assert crashed['status'] == 'failed' and crashed['attempts'] == 1, f"Crash not charged once: {crashed}"
+    assert crashed['error_message'] == 'Worker process died', crashed['error_message']
+    for task_id in other_ids:
+        task = qm.get_task_status(task_id)
+        assert task['status'] == 'completed' and task['attempts'] == 1, f"Task {task_id} charged: {task}"
+    assert processed == len(other_ids), f"{processed} task(s) processed"
+    print(f"\n✓ Worker crash failed task {crash_id} only; pool rebuilt for the rest")
+
+    # The crashing task is the last suspect rerun: it runs alone, and the
+    # tasks still pending are not claimed next to it
+    runs_file = cfg.base_path / 'crash-runs.txt'
+    runs_file.unlink(missing_ok=True)
+    runs = {'runs': str(runs_file)}
+    first_id = qm.create_task("Suspect", task_type='crash', params=runs, priority=60)
+    crash_id = qm.create_task("Crash", task_type='crash', params={**runs, 'crash': True, 'delay': 0.1},
+                              priority=59, max_attempts=2)
+    pending_ids = [qm.create_task(f"Pending {i}", task_type='crash', params=runs, priority=50) for i in range(3)]
+    cfg.set_config_value('max_workers', '2')
+    try:
+        processor.process_pending_tasks()
+    finally:
+        cfg.set_config_value('max_workers', '1')
+
+    run_ids = [int(line) for line in runs_file.read_text().split()]
+    runs_file.unlink()
+    crashed = qm.get_task_status(crash_id)
+    assert crashed['status'] == 'failed' and crashed['attempts'] == 1, f"Crash not charged once: {crashed}"
+    assert qm.get_task_status(first_id)['status'] == 'completed', "Suspect not rerun"
+    for task_id in pending_ids:
+        assert run_ids.count(task_id) == 1, f"Task {task_id} ran {run_ids.count(task_id)} time(s): {run_ids}"
+        assert qm.get_task_status(task_id)['status'] == 'completed', f"Task {task_id} not completed"
+    print(f"✓ Last suspect {crash_id} reran alone; pending tasks ran once")
+
+    daemon_ok = test_processor_daemon(cfg, processor)
+    concurrent_ok = test_concurrent_processors(cfg)
+
+    all_ok = daemon_ok and concurrent_ok
+    print(f"\nResult: {'PASS' if all_ok else 'FAIL'}\n")
+    return all_ok
+
+def test_processor_daemon(cfg, processor):
+    """Test the task processor daemon's wakeup and shutdown."""
+    import signal
+    import sqlite3
+    import subprocess
+    import time
+
+    # A task created after the last empty claim still wakes the wait
+    baseline = processor.work_versions()
+    assert processor.process_pending_tasks() == 0, "Queue not empty"
+    other = sqlite3.connect(str(cfg.research_db))
+    other.execute("INSERT INTO tasks (name) VALUES ('Wakeup probe')")
+    other.commit()
+    probe_id = other.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+    other.execute("DELETE FROM tasks WHERE id = ?", (probe_id,))
+    other.commit()
+    other.close()
+    started = time.monotonic()
+    processor.wait_for_work(baseline, 5, 0.05)
+    wakeup_ok = time.monotonic() - started < 1
+    print(f"{'✓' if wakeup_ok else '✗'} Commit between the last claim and the wait wakes the processor")
+
+    # The daemon picks up a task created by another process, and SIGTERM stops it
+    daemon = subprocess.Popen([
+        sys.executable, './institute-package/src/task_processor.py',
+        '--base-path=./sandbox-institute', '--daemon', '--poll-interval=0.1'
+    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        time.sleep(1)
+        qm = queue_manager.QueueManager(cfg)
+        task_id = qm.create_task("Daemon wakeup")
+        deadline = time.monotonic() + 5
+        while qm.get_task_status(task_id)['status'] != 'completed' and time.monotonic() < deadline:
+            time.sleep(0.05)
+        daemon_ok = qm.get_task_status(task_id)['status'] == 'completed'
+        print(f"{'✓' if daemon_ok else '✗'} Daemon ran task {task_id} created by another process")
+
+        daemon.send_signal(signal.SIGTERM)
+        stdout, _ = daemon.communicate(timeout=10)
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+            daemon.wait()
+    stop_ok = daemon.returncode == 0 and "daemon stopping" in stdout
+    print(f"{'✓' if stop_ok else '✗'} SIGTERM stopped the daemon")
+
+    return wakeup_ok and daemon_ok and stop_ok
+
+def test_concurrent_processors(cfg):
+    """Test two processors draining one queue under short leases."""
+    import signal
+    import time
+
+    qm = queue_manager.QueueManager(cfg)
+    runs_file = cfg.base_path / 'lease-runs.txt'
+    runs_file.unlink(missing_ok=True)
+    runs = {'runs': str(runs_file)}
+
+    # The slow task outlives its lease several times over
+    cfg.set_config_value('task_lease_seconds', '2')
+    slow_id = qm.create_task("Outlives its lease", task_type='crash', params={**runs, 'sleep': 5}, priority=50)
+    quick_ids = [qm.create_task(f"Quick {i}", task_type='crash', params=runs, priority=40) for i in range(8)]
+    task_ids = [slow_id] + quick_ids
+
+    daemons = [subprocess.Popen([
+        sys.executable, './institute-package/src/task_processor.py',
+        '--base-path=./sandbox-institute', '--daemon', '--poll-interval=0.1'
+    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) for _ in range(2)]
+    try:
+        # Once the first lease would have run out, a new task wakes the idle
+        # processor, which reclaims expired leases before taking new work
+        time.sleep(4)
+        task_ids.append(qm.create_task("Wake idle processor", task_type='crash', params=runs, priority=40))
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline and any(
+                qm.get_task_status(task_id)['status'] != 'completed' for task_id in task_ids):
+            time.sleep(0.1)
+        for daemon in daemons:
+            daemon.send_signal(signal.SIGTERM)
+        for daemon in daemons:
+            daemon.communicate(timeout=10)
+    finally:
+        cfg.set_config_value('task_lease_seconds', '900')
+        for daemon in daemons:
+            if daemon.poll() is None:
+                daemon.kill()
+                daemon.wait()
+
+    run_ids = [int(line) for line in runs_file.read_text().split()]
+    runs_file.unlink()
+    statuses = [qm.get_task_status(task_id) for task_id in task_ids]
+    drained_ok = all(task['status'] == 'completed' and task['attempts'] == 1 for task in statuses)
+    print(f"{'✓' if drained_ok else '✗'} Two processors drained the queue, each task claimed once")
+
+    conn = cfg.connection(cfg.audit_db)
+    reclaimed = conn.execute(
+        "SELECT COUNT(*) FROM log WHERE action = 'task_lease_reclaimed' AND target = ?", (f"task_{slow_id}",)
+    ).fetchone()[0]
+    once_ok = reclaimed == 0 and sorted(run_ids) == sorted(task_ids)
+    print(f"{'✓' if once_ok else '✗'} Renewed lease kept task {slow_id} from being reclaimed; every task ran once")
+
+    return drained_ok and once_ok
+
 def main():
     """Run all tests."""
     print("\n")
@@ -287,10 +1272,16 @@ def main():
     results.append(("Database Initialization", test_initialization()))
     results.append(("State Manager", test_state_manager()))
     results.append(("Audit Logger", test_audit_logger()))
+    results.append(("Audit Hash Chain", test_audit_chain()))
     results.append(("Task Queue Manager", test_task_queue()))
+    results.append(("Task Claim", test_task_claim()))
+    results.append(("Bulk Task Creation", test_bulk_create()))
+    results.append(("Task Handlers", test_task_handlers()))
     results.append(("Lockdown Manager", test_lockdown()))
     results.append(("CLI - Researcher", test_cli_researcher()))
     results.append(("CLI - Director", test_cli_director()))
+    results.append(("Task Archive", test_task_archive()))
+    results.append(("Task Processor", test_task_processor()))
 
     # Summary
     print("=" * 50)